@@ -12,7 +12,7 @@ logging.basicConfig(level=logging.INFO, format="%(levelname)s  %(name)s  %(messa
 _env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(dotenv_path=_env_path)
 
-from app.routers import cities, predictions, recommendations, advisory, report, user, city_explore, places, translations
+from app.routers import cities, predictions, recommendations, advisory, report, user, city_explore, places, translations, aqi, admin, districts
 
 app = FastAPI(
     title="शहर AI API",
@@ -46,6 +46,9 @@ app.include_router(user.router, prefix="/api/user", tags=["User"])
 app.include_router(city_explore.router, prefix="/api/city-explore", tags=["City Explore"])
 app.include_router(places.router, prefix="/api", tags=["Places"])
 app.include_router(translations.router, prefix="/api/translations", tags=["Translations"])
+app.include_router(aqi.router, prefix="/api/aqi", tags=["AQI"])
+app.include_router(districts.router, prefix="/api/districts", tags=["Districts"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 
 
 logger = logging.getLogger(__name__)
@@ -58,6 +61,14 @@ def _warm_dataset_caches() -> None:
         logger.info("Skipping startup cache warming; set WARM_STARTUP_CACHE=true to enable.")
         return
 
+    try:
+        from app.services.dataset_warmup import warm_datasets
+
+        logger.info("Loading evidence datasets in parallel…")
+        warm_datasets()
+    except Exception as exc:
+        logger.error("Evidence dataset warm-up failed: %s", exc, exc_info=True)
+
     try:
         from app.services.pdf_evidence_service import warm_pdf_evidence_cache
 
@@ -76,6 +87,54 @@ def _warm_dataset_caches() -> None:
     except Exception as exc:
         logger.error("City description cache warming failed: %s", exc, exc_info=True)
 
+    try:
+        from app.services.district_evidence import ensure_district_evidence
+
+        if ensure_district_evidence():
+            logger.info("District evidence store rebuilt.")
+    except Exception as exc:
+        logger.error("District evidence build failed: %s", exc, exc_info=True)
+
+
+@app.on_event("startup")
+def _resolve_living_cost() -> None:
+    try:
+        from app.services.living_cost_service import warm_living_cost
+
+        warm_living_cost()
+    except Exception as exc:
+        logger.error("Living cost dataset load failed: %s", exc, exc_info=True)
+
+
+@app.on_event("startup")
+async def _start_background_jobs() -> None:
+    from app.services.aqi_forecast import start_forecast_job
+    from app.services.dataset_watcher import start_dataset_watcher
+    from app.services.openaq_service import load_snapshot, start_grid_job, start_snapshot_job
+
+    try:
+        load_snapshot()
+    except Exception as exc:
+        logger.error("AQI snapshot restore failed: %s", exc, exc_info=True)
+    start_snapshot_job()
+    start_grid_job()
+    start_forecast_job()
+    start_dataset_watcher()
+
+
+@app.on_event("shutdown")
+async def _stop_background_jobs() -> None:
+    from app.services.aqi_forecast import stop_forecast_job
+    from app.services.dataset_watcher import stop_dataset_watcher
+    from app.services.live_enrichment import shutdown_executor
+    from app.services.openaq_service import stop_grid_job, stop_snapshot_job
+
+    await stop_forecast_job()
+    await stop_grid_job()
+    await stop_snapshot_job()
+    stop_dataset_watcher()
+    shutdown_executor()
+
 
 @app.get("/")
 async def root():
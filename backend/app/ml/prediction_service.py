@@ -22,6 +22,8 @@ from typing import List, Dict, Any, Tuple, Optional
 from haversine import haversine, Unit
 
 from app.services.city_data import get_all_cities, get_city_by_name
+from app.services.aqi_forecast import ensure_forecasts, peek_forecast
+from app.services.aqi_history import get_aqi_baseline, get_aqi_baselines
 from app.services.openaq_service import get_current_aqi_batch
 from app.services.living_cost_service import get_affordability_score, get_living_cost
 
@@ -163,6 +165,7 @@ def _blend_aqi(
     live_aqi: Optional[int],
     historical_aqi: float,
     historical_avg: float,
+    live_source: str = "openaq_live",
 ) -> Tuple[float, str]:
     """
     Compute effective AQI for scoring by blending live and historical data.
@@ -180,7 +183,7 @@ def _blend_aqi(
         effective = (
             LIVE_AQI_WEIGHT * live_aqi + HISTORICAL_AQI_WEIGHT * historical_avg
         ) / total_weight
-        return round(effective, 1), "openaq_live"
+        return round(effective, 1), live_source
     return historical_aqi, "historical_only"
 
 
@@ -195,6 +198,7 @@ def predict_city_suitability(
     distance_km: float,
     earning_members: int = 1,
     live_aqi: Optional[int] = None,
+    aqi_baseline: Optional[Tuple[float, str]] = None,
 ) -> float:
     """
     ML Model: City Suitability Prediction
@@ -208,15 +212,19 @@ def predict_city_suitability(
       - AQI trend:                           5%
       - Edu / Community / Connectivity:     10%
 
+    `aqi_baseline` is the (historical average, trend) pair from the AQI
+    history store; it is looked up when not supplied.
+
     Output: Suitability score (0-100)
     """
     score = 0.0
+    historical_avg, aqi_trend = aqi_baseline or get_aqi_baseline(city_data)
 
     # Derive effective target AQI
     effective_target_aqi, _ = _blend_aqi(
         live_aqi,
         city_data["current_aqi"],
-        city_data.get("avg_aqi_5yr", city_data["current_aqi"]),
+        historical_avg,
     )
     current_effective_aqi = float(current_city_data["current_aqi"])
 
@@ -255,7 +263,7 @@ def predict_city_suitability(
 
     # 6. AQI Trend Bonus (5% weight)
     trend_scores = {"improving": 5, "stable": 3, "worsening": 0}
-    score += trend_scores.get(city_data.get("aqi_trend", "stable"), 2)
+    score += trend_scores.get(aqi_trend, 2)
 
     # 7. Education / Community / Connectivity Composite (10% weight)
     # Heuristic until dedicated dataset is provided:
@@ -313,11 +321,15 @@ async def get_top_recommendations(
     elderly: int,
     health_conditions: List[str],
     earning_members: int = 1,
-    top_n: int = 5
+    top_n: int = 5,
+    use_forecast: bool = False,
 ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Main recommendation engine (async).
     Returns top N city recommendations with scores.
+
+    With use_forecast=True, a city's 24 h forecast mean AQI replaces its
+    single live reading in the blend whenever a forecast is available.
     """
     current_city_data = get_city_by_name(current_city)
     if not current_city_data:
@@ -374,6 +386,9 @@ async def get_top_recommendations(
         len(all_names_to_fetch),
     )
     live_aqi_map = await get_current_aqi_batch(all_names_to_fetch)
+    if use_forecast:
+        await asyncio.to_thread(ensure_forecasts)
+    baselines = await asyncio.to_thread(get_aqi_baselines, [city for city, _ in candidates])
 
     # Update current city AQI if live data is available
     current_live = live_aqi_map.get(current_city)
@@ -390,13 +405,21 @@ async def get_top_recommendations(
     for city, distance_km in candidates:
         city_live = live_aqi_map.get(city["city_name"])
         live_aqi_val: Optional[int] = city_live["aqi_estimate"] if city_live else None
+        historical_avg, aqi_trend = baselines[city["city_name"]]
+        forecast = peek_forecast(city["city_name"])
+        forecast_aqi: Optional[int] = forecast["mean_aqi_24h"] if forecast else None
+        use_city_forecast = use_forecast and forecast_aqi is not None
+        signal_aqi = forecast_aqi if use_city_forecast else live_aqi_val
 
         # Effective AQI for improvement calculation
         effective_target_aqi, data_source = _blend_aqi(
-            live_aqi_val,
+            signal_aqi,
             city["current_aqi"],
-            city.get("avg_aqi_5yr", city["current_aqi"]),
+            historical_avg,
+            city_live.get("data_source", "openaq_live") if city_live else "openaq_live",
         )
+        if use_city_forecast:
+            data_source = "aqi_forecast"
 
         # Calculate suitability score
         suitability_score = predict_city_suitability(
@@ -409,7 +432,8 @@ async def get_top_recommendations(
             health_sensitivity,
             distance_km,
             earning_members=earning_members,
-            live_aqi=live_aqi_val,
+            live_aqi=signal_aqi,
+            aqi_baseline=(historical_avg, aqi_trend),
         )
 
         # AQI improvement uses effective (blended) AQI
@@ -447,10 +471,11 @@ async def get_top_recommendations(
             "current_aqi": current_aqi_display,    # user's source city AQI
             "target_aqi": int(round(effective_target_aqi)),
             "healthcare_score": city.get("healthcare_score", 70),
-            "aqi_trend": city.get("aqi_trend", "stable"),
+            "aqi_trend": aqi_trend,
             # --- New real-time fields ---
             "live_aqi": live_aqi_val,
-            "historical_avg_aqi": city.get("avg_aqi_5yr"),
+            "historical_avg_aqi": historical_avg,
+            "forecast_aqi_24h": forecast_aqi,
             "aqi_data_source": data_source,
         })
 
@@ -82,7 +82,7 @@ class CityRecommendation(BaseModel):
     # --- Real-time AQI fields (new) ---
     live_aqi: Optional[int] = None          # Live PM2.5-based AQI from OpenAQ
     historical_avg_aqi: Optional[float] = None  # 5-year historical average AQI
-    aqi_data_source: str = "historical_only"    # "openaq_live" | "historical_only"
+    aqi_data_source: str = "historical_only"    # "openaq_live" | "waqi_live" | "multi_provider" | "aqi_forecast" | "historical_only"
 
 
 class MigrationReadinessReport(BaseModel):
@@ -96,3 +96,115 @@ class MigrationReadinessReport(BaseModel):
     top_recommendations: List[CityRecommendation]
     ai_advisory: str
     generated_at: str
+
+
+# Response models for city description
+class CrimeRate(BaseModel):
+    security_score: int
+    description: str
+    key_factors: List[str] = []
+    sources: List[str] = []
+
+
+class Education(BaseModel):
+    score: int
+    highlights: List[str]
+    description: str
+    key_factors: List[str] = []
+    sources: List[str] = []
+
+
+class Communities(BaseModel):
+    demographics: str
+    description: str = ""
+    highlights: List[str]
+    key_factors: List[str] = []
+    sources: List[str] = []
+
+
+class Connectivity(BaseModel):
+    nearest_metro: str
+    distance_km: float
+    transport_options: str
+    description: str
+    key_factors: List[str] = []
+    sources: List[str] = []
+
+
+class Hospitals(BaseModel):
+    score: int
+    facilities: List[str]
+    description: str
+    key_factors: List[str] = []
+    sources: List[str] = []
+
+
+class Geography(BaseModel):
+    terrain: str
+    climate: str
+    elevation_m: float = 0
+    features: List[str]
+    description: str
+    key_factors: List[str] = []
+    sources: List[str] = []
+
+
+class CityDescriptionResponse(BaseModel):
+    city_name: str
+    state: str
+    generated: bool
+    crime_rate: CrimeRate
+    education: Education
+    communities: Communities
+    connectivity: Connectivity
+    hospitals: Hospitals
+    geography: Geography
+
+
+class DistrictEducation(BaseModel):
+    schools: int
+    urban_schools: int
+    minority_schools: int
+    pre_primary_schools: int
+    approachable_schools: int
+    total_teachers: int
+    female_teachers: int
+    trained_teachers: int
+    postgraduate_teachers: int
+    urban_pct: float
+    trained_pct: float
+    female_teacher_pct: float
+    teachers_per_school: float
+
+
+class DistrictFacility(BaseModel):
+    name: str
+    medicine: str = ""
+    beds: int = 0
+    specialties: str = ""
+
+
+class DistrictHospitals(BaseModel):
+    total: int
+    allopathic: int
+    emergency: int
+    accredited: int
+    average_beds: Optional[float] = None
+    top_facilities: List[DistrictFacility] = []
+
+
+class DistrictCommunities(BaseModel):
+    literacy: Optional[float] = None
+    social_enrollment_estimate: int = 0
+    minority_enrollment_estimate: int = 0
+    religion: Optional[str] = None
+
+
+class DistrictEvidenceResponse(BaseModel):
+    lgd_code: Optional[int] = None
+    state: str
+    district: str
+    education: Optional[DistrictEducation] = None
+    hospitals: Optional[DistrictHospitals] = None
+    communities: Optional[DistrictCommunities] = None
+    sources: List[str] = []
@@ -0,0 +1,46 @@
+"""
+Operator endpoints: dataset reload status, manual rebuilds and loader metrics.
+
+Every route requires an X-Admin-Token header matching the ADMIN_TOKEN
+environment variable; without ADMIN_TOKEN set the endpoints are disabled.
+"""
+
+import hmac
+import os
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.services.dataset_watcher import get_watcher
+from app.services.single_flight import loader_stats
+
+
+def _require_admin(x_admin_token: str = Header(default="")) -> None:
+    expected = os.getenv("ADMIN_TOKEN", "")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not hmac.compare_digest(x_admin_token.encode("utf-8"), expected.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(_require_admin)])
+
+
+@router.get("/datasets")
+async def get_dataset_status() -> Dict[str, Any]:
+    """Watcher state, the running rebuild's progress and recent rebuilds."""
+    return get_watcher().status()
+
+
+@router.post("/datasets/rebuild", status_code=202)
+async def rebuild_datasets() -> Dict[str, Any]:
+    """Reload every dataset in the background; the old data serves until the swap."""
+    watcher = get_watcher()
+    started = watcher.trigger(reason="manual")
+    return {"started": started, **watcher.status()}
+
+
+@router.get("/loaders")
+async def get_loader_stats() -> Dict[str, Any]:
+    """Per-dataset load counts, load times and waiter counts of the single-flight loaders."""
+    return loader_stats()
@@ -0,0 +1,59 @@
+"""
+AQI lookups for arbitrary coordinates, served from the all-India grid.
+"""
+
+import logging
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.routers.cities import get_aqi_category
+from app.services.aqi_grid import cell_centre, cell_index, get_grid
+from app.services.openaq_service import (
+    _CACHE_TTL_SECONDS,
+    pm25_to_aqi,
+    refresh_grid,
+    schedule_grid_refresh,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/at")
+async def get_aqi_at(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+) -> Dict[str, Any]:
+    """Interpolated live AQI for any coordinate in India (0.1° grid cell)."""
+    cell = cell_index(lat, lon)
+    if cell is None:
+        raise HTTPException(status_code=404, detail="Coordinates are outside the India AQI grid")
+
+    grid = get_grid()
+    if grid is None:
+        try:
+            await refresh_grid()
+        except Exception as exc:
+            logger.error("AQI grid refresh failed: %s", exc)
+        grid = get_grid()
+        if grid is None:
+            raise HTTPException(status_code=503, detail="AQI grid is not available yet")
+    elif grid.age() > _CACHE_TTL_SECONDS:
+        # Serve the current surface; rebuild in the background
+        schedule_grid_refresh()
+
+    pm25 = grid.value_at(lat, lon)
+    aqi = pm25_to_aqi(pm25) if pm25 is not None else None
+    cell_lat, cell_lon = cell_centre(*cell)
+    return {
+        "lat": lat,
+        "lon": lon,
+        "cell": {"lat": cell_lat, "lon": cell_lon},
+        "pm25": round(pm25, 2) if pm25 is not None else None,
+        "aqi_estimate": aqi,
+        "category": get_aqi_category(aqi) if aqi is not None else None,
+        "built_at": grid.built_at,
+        "data_source": "openaq_grid" if aqi is not None else "no_coverage",
+    }
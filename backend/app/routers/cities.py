@@ -3,81 +3,26 @@ Cities API Router - Provides city data and AQI information.
 Updated to serve real-time AQI from OpenAQ when available.
 """
 
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+import time
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Dict, Any, Literal, Optional
+from fastapi.responses import Response, StreamingResponse
 
+from app.models.schemas import CityDescriptionResponse
 from app.services.city_data import get_all_cities, get_city_by_name, get_city_names, get_professions
-from app.services.city_description import generate_city_description
+from app.services.city_description import (
+    generate_city_description_json,
+    generate_city_description_stream,
+)
+from app.services.aqi_forecast import get_forecast, peek_forecast
+from app.services.aqi_history import get_aqi_baseline, get_aqi_baselines, get_history_store
 from app.services.openaq_service import get_current_aqi_batch, get_current_aqi
 
 logger = logging.getLogger(__name__)
 
 
-# Response models for city description
-class CrimeRate(BaseModel):
-    security_score: int
-    description: str
-    key_factors: List[str] = []
-    sources: List[str] = []
-
-
-class Education(BaseModel):
-    score: int
-    highlights: List[str]
-    description: str
-    key_factors: List[str] = []
-    sources: List[str] = []
-
-
-class Communities(BaseModel):
-    demographics: str
-    description: str = ""
-    highlights: List[str]
-    key_factors: List[str] = []
-    sources: List[str] = []
-
-
-class Connectivity(BaseModel):
-    nearest_metro: str
-    distance_km: float
-    transport_options: str
-    description: str
-    key_factors: List[str] = []
-    sources: List[str] = []
-
-
-class Hospitals(BaseModel):
-    score: int
-    facilities: List[str]
-    description: str
-    key_factors: List[str] = []
-    sources: List[str] = []
-
-
-class Geography(BaseModel):
-    terrain: str
-    climate: str
-    elevation_m: float = 0
-    features: List[str]
-    description: str
-    key_factors: List[str] = []
-    sources: List[str] = []
-
-
-class CityDescriptionResponse(BaseModel):
-    city_name: str
-    state: str
-    generated: bool
-    crime_rate: CrimeRate
-    education: Education
-    communities: Communities
-    connectivity: Connectivity
-    hospitals: Hospitals
-    geography: Geography
-
-
 router = APIRouter()
 
 
@@ -93,24 +38,26 @@ async def list_cities() -> List[Dict[str, Any]]:
     except Exception as exc:
         logger.warning("Failed to batch-fetch live AQI: %s", exc)
         live_aqi_map = {}
+    baselines = await asyncio.to_thread(get_aqi_baselines, cities)
 
     results = []
     for city in cities:
         live_data = live_aqi_map.get(city["city_name"])
         live_aqi: Optional[int] = live_data["aqi_estimate"] if live_data else None
+        avg_aqi_5yr, aqi_trend = baselines[city["city_name"]]
 
         results.append({
             "city_name": city["city_name"],
             "state": city["state"],
             "current_aqi": live_aqi if live_aqi is not None else city["current_aqi"],
-            "avg_aqi_5yr": city["avg_aqi_5yr"],
-            "aqi_trend": city["aqi_trend"],
+            "avg_aqi_5yr": avg_aqi_5yr,
+            "aqi_trend": aqi_trend,
             "avg_rent": city["avg_rent"],
             "job_score": city["job_score"],
             "healthcare_score": city["healthcare_score"],
             # Real-time metadata
             "live_aqi": live_aqi,
-            "aqi_data_source": "openaq_live" if live_aqi is not None else "historical_only",
+            "aqi_data_source": live_data.get("data_source", "openaq_live") if live_data else "historical_only",
         })
     return results
 
@@ -127,13 +74,13 @@ async def list_professions() -> List[str]:
     return get_professions()
 
 
-@router.get("/description/{city_name}")
+@router.get("/description/{city_name}", response_model=CityDescriptionResponse)
 def get_city_description(
     city_name: str,
     has_children: bool = False,
     has_elderly: bool = False,
     language: str = "en",
-) -> CityDescriptionResponse:
+) -> Response:
     """
     Get comprehensive AI-generated description for a city.
     
@@ -149,12 +96,15 @@ def get_city_description(
     - city_name: Name of the city
     - has_children: Whether the family has children (emphasizes education/safety)
     - has_elderly: Whether the family has elderly members (emphasizes healthcare)
+
+    The body is spliced from pre-serialized section fragments, already
+    validated against CityDescriptionResponse, so it is returned as-is.
     """
     city = get_city_by_name(city_name)
     if not city:
         raise HTTPException(status_code=404, detail=f"City not found: {city_name}")
     
-    description_data = generate_city_description(
+    body = generate_city_description_json(
         city_name=city["city_name"],
         state=city["state"],
         has_children=has_children,
@@ -162,7 +112,42 @@ def get_city_description(
         language=language,
     )
     
-    return CityDescriptionResponse(**description_data)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/description/{city_name}/stream")
+def stream_city_description(
+    city_name: str,
+    has_children: bool = False,
+    has_elderly: bool = False,
+    language: str = "en",
+) -> StreamingResponse:
+    """
+    Streaming variant of /description/{city_name}, as server-sent events.
+
+    Events:
+    - meta: {"city_name", "state", "generated"}
+    - section: {"name", "data"} — every cached section immediately, then the
+      live hospitals, geography and connectivity sections as they complete,
+      replacing the cached ones
+    - done: {}
+    """
+    city = get_city_by_name(city_name)
+    if not city:
+        raise HTTPException(status_code=404, detail=f"City not found: {city_name}")
+
+    events = generate_city_description_stream(
+        city_name=city["city_name"],
+        state=city["state"],
+        has_children=has_children,
+        has_elderly=has_elderly,
+        language=language,
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{city_name}")
@@ -175,8 +160,13 @@ async def get_city(city_name: str) -> Dict[str, Any]:
 
 
 @router.get("/{city_name}/aqi")
-async def get_city_aqi(city_name: str) -> Dict[str, Any]:
-    """Get AQI data for a specific city (enriched with live OpenAQ AQI)"""
+async def get_city_aqi(city_name: str, use_forecast: bool = False) -> Dict[str, Any]:
+    """
+    Get AQI data for a specific city (enriched with live OpenAQ AQI).
+
+    With use_forecast=true the 24 h forecast mean is reported as the current
+    AQI instead of the single live reading, when a forecast is available.
+    """
     city = get_city_by_name(city_name)
     if not city:
         raise HTTPException(status_code=404, detail=f"City not found: {city_name}")
@@ -189,15 +179,55 @@ async def get_city_aqi(city_name: str) -> Dict[str, Any]:
 
     live_aqi: Optional[int] = live_data["aqi_estimate"] if live_data else None
     effective_aqi = live_aqi if live_aqi is not None else city["current_aqi"]
+    data_source = live_data.get("data_source", "openaq_live") if live_data else "historical_only"
+    avg_aqi_5yr, aqi_trend = await asyncio.to_thread(get_aqi_baseline, city)
+
+    # Only a forecast request may wait for the first build (off the event
+    # loop); otherwise report whatever the background job has produced.
+    if use_forecast:
+        forecast = await asyncio.to_thread(get_forecast, city["city_name"])
+    else:
+        forecast = peek_forecast(city["city_name"])
+    if use_forecast and forecast:
+        effective_aqi = forecast["mean_aqi_24h"]
+        data_source = "aqi_forecast"
 
     return {
         "city_name": city["city_name"],
         "current_aqi": effective_aqi,
-        "avg_aqi_5yr": city["avg_aqi_5yr"],
-        "aqi_trend": city["aqi_trend"],
+        "avg_aqi_5yr": avg_aqi_5yr,
+        "aqi_trend": aqi_trend,
         "category": get_aqi_category(effective_aqi),
         "live_aqi": live_aqi,
-        "aqi_data_source": "openaq_live" if live_aqi is not None else "historical_only",
+        "aqi_data_source": data_source,
+        "forecast": {
+            "mean_aqi_24h": forecast["mean_aqi_24h"],
+            "mean_aqi_72h": forecast["mean_aqi_72h"],
+            "generated_at": forecast["generated_at"],
+            "hourly": forecast["hourly"],
+        } if forecast else None,
+    }
+
+
+@router.get("/{city_name}/aqi/history")
+async def get_city_aqi_history(
+    city_name: str,
+    resolution: Literal["hourly", "daily", "monthly"] = "daily",
+    days: int = Query(default=30, ge=1, le=3660),
+) -> Dict[str, Any]:
+    """Get recorded AQI history for a city, aggregated at the requested resolution."""
+    city = get_city_by_name(city_name)
+    if not city:
+        raise HTTPException(status_code=404, detail=f"City not found: {city_name}")
+
+    end = int(time.time()) + 1
+    series = await asyncio.to_thread(
+        lambda: get_history_store().query(city["city_name"], end - days * 86400, end, resolution)
+    )
+    return {
+        "city_name": city["city_name"],
+        "resolution": resolution,
+        "series": series,
     }
 
 
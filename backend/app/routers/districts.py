@@ -0,0 +1,42 @@
+"""
+District evidence for any district in the loaded datasets.
+
+Bodies are precomputed by app.services.district_evidence and already
+validated against DistrictEvidenceResponse, so each request is one indexed
+SQLite read returned as-is.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
+
+from app.models.schemas import DistrictEvidenceResponse
+from app.services.district_evidence import get_store
+
+router = APIRouter()
+
+
+def _evidence_response(body: Optional[bytes], missing: str) -> Response:
+    if body is None:
+        if not get_store().is_built():
+            raise HTTPException(status_code=503, detail="District evidence has not been built yet")
+        raise HTTPException(status_code=404, detail=missing)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/evidence", response_model=DistrictEvidenceResponse)
+def find_district_evidence(
+    state: str = Query(..., min_length=1),
+    district: str = Query(..., min_length=1),
+) -> Response:
+    """Education, hospital and community evidence for a district, by name."""
+    body = get_store().by_name(state, district)
+    return _evidence_response(body, f"No evidence for district '{district}' in '{state}'")
+
+
+@router.get("/{lgd_code}/evidence", response_model=DistrictEvidenceResponse)
+def get_district_evidence(lgd_code: int) -> Response:
+    """Education, hospital and community evidence for a district, by LGD district code."""
+    body = get_store().by_lgd_code(lgd_code)
+    return _evidence_response(body, f"No evidence for LGD district code {lgd_code}")
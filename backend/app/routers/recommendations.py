@@ -27,6 +27,7 @@ class RecommendationRequest(BaseModel):
     children: int = 0
     elderly: int = 0
     health_conditions: List[str] = ["None"]
+    use_forecast: bool = False  # score on the 24 h AQI forecast instead of the live reading
     user_id: Optional[str] = None  # Firebase Auth User ID
 
 
@@ -47,6 +48,7 @@ class CityRecommendation(BaseModel):
     # --- Real-time AQI fields ---
     live_aqi: Optional[int] = None
     historical_avg_aqi: Optional[float] = None
+    forecast_aqi_24h: Optional[int] = None
     aqi_data_source: str = "historical_only"
 
 
@@ -73,6 +75,7 @@ async def get_recommendations(request: RecommendationRequest) -> RecommendationR
             elderly=request.elderly,
             health_conditions=request.health_conditions,
             earning_members=request.earning_members,
+            use_forecast=request.use_forecast,
         )
 
         # Step 2: Use Firestore instead of Supabase
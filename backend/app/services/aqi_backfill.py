@@ -0,0 +1,250 @@
+"""
+Bulk historical AQI backfill for शहर AI.
+
+Ingests OpenAQ archive dumps (one CSV or CSV.gz per station-day, columns
+`location_id, sensors_id, location, datetime, lat, lon, parameter, units,
+value`) from local files into the AQI history store.
+
+Pipeline:
+  1. Files are spread over a process pool; each worker streams its file in
+     fixed-size pandas chunks, keeps PM2.5 rows, maps each station to the
+     nearest registry city within 25 km (vectorized haversine per unique
+     station coordinate) and reduces the chunk to hourly
+     (city, hour) → count / sum / min / max / AQI-sum buckets.
+  2. The parent merges each file's buckets into the store's rollups in one
+     transaction and records the file as ingested, so re-runs skip it.
+
+Memory is bounded by the chunk size per worker plus a small window of
+in-flight files; raw readings are never held in full.
+
+Usage (from backend/):
+    python -m app.services.aqi_backfill /data/openaq-archive --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.aqi_engine import sub_index
+from app.services.aqi_history import AQIHistoryStore, get_history_store
+from app.services.aqi_spatial import IDW_MAX_DISTANCE_KM, haversine_matrix
+
+logger = logging.getLogger(__name__)
+
+CHUNK_ROWS = 250_000
+MAX_PM25 = 1000.0  # readings above this are sensor faults
+IN_FLIGHT_PER_WORKER = 4
+
+_USECOLS = ["datetime", "lat", "lon", "parameter", "value"]
+_DTYPES: Dict[Hashable, str] = {"lat": "float64", "lon": "float64", "parameter": "category", "value": "float64"}
+
+
+class FileResult(NamedTuple):
+    source: str
+    rows_read: int
+    rows_used: int
+    buckets: List[Tuple[str, int, int, float, float, float, float]]
+    error: Optional[str] = None
+
+
+def discover_files(paths: Iterable[str | Path]) -> List[Path]:
+    """Expand directories into their *.csv / *.csv.gz files, sorted for stable runs."""
+    files: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(p for p in path.rglob("*") if p.name.endswith((".csv", ".csv.gz")))
+        elif path.is_file():
+            files.append(path)
+    return sorted(files)
+
+
+def source_key(path: Path) -> str:
+    """Identity of an archive file for idempotent re-runs."""
+    return f"{path.resolve()}:{path.stat().st_size}"
+
+
+def _registry() -> Tuple[List[str], np.ndarray, np.ndarray]:
+    from app.services.openaq_service import _CITY_COORDS
+
+    names = list(_CITY_COORDS)
+    lats = np.array([coords[0] for coords in _CITY_COORDS.values()])
+    lons = np.array([coords[1] for coords in _CITY_COORDS.values()])
+    return names, lats, lons
+
+
+def _nearest_city(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    city_lats: np.ndarray,
+    city_lons: np.ndarray,
+) -> np.ndarray:
+    """Index of the nearest registry city per point, or -1 if none within range."""
+    distances = haversine_matrix(lats, lons, city_lats, city_lons)
+    nearest = distances.argmin(axis=1)
+    return np.where(distances[np.arange(len(lats)), nearest] <= IDW_MAX_DISTANCE_KM, nearest, -1)
+
+
+def _iter_chunks(path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    yield from pd.read_csv(
+        path,
+        usecols=_USECOLS,
+        dtype=_DTYPES,
+        chunksize=chunk_rows,
+        compression="infer",
+    )
+
+
+def aggregate_file(path: str | Path, chunk_rows: int = CHUNK_ROWS) -> FileResult:
+    """Reduce one archive file to hourly per-city buckets (runs in a worker)."""
+    path = Path(path)
+    names, city_lats, city_lons = _registry()
+    source = source_key(path)
+    rows_read = 0
+    partials: List[pd.DataFrame] = []
+    try:
+        for chunk in _iter_chunks(path, chunk_rows):
+            rows_read += len(chunk)
+            chunk = chunk.loc[
+                (chunk["parameter"] == "pm25") & (chunk["value"] > 0) & (chunk["value"] <= MAX_PM25)
+            ]
+            if chunk.empty:
+                continue
+
+            # Map each distinct station coordinate once (hashed as lat + i·lon),
+            # then broadcast back to the rows
+            inverse, coords = pd.factorize(
+                chunk["lat"].to_numpy() + 1j * chunk["lon"].to_numpy()
+            )
+            station_city = _nearest_city(np.real(coords), np.imag(coords), city_lats, city_lons)
+            city_idx = station_city[inverse]
+            keep = city_idx >= 0
+            if not keep.any():
+                continue
+
+            chunk = chunk.loc[keep]
+            values = chunk["value"].to_numpy()
+            stamps = pd.to_datetime(chunk["datetime"], utc=True, format="ISO8601").dt.tz_localize(None)
+            hours = stamps.to_numpy().astype("datetime64[s]").astype(np.int64) // 3600 * 3600
+            frame = pd.DataFrame({
+                "city": city_idx[keep],
+                "bucket": hours,
+                "pm25": values,
+                "aqi": sub_index(values, "pm25", "us_epa"),
+            })
+            partials.append(pd.DataFrame(
+                frame.groupby(["city", "bucket"], sort=False).agg(
+                    count=("pm25", "size"),
+                    pm25_sum=("pm25", "sum"),
+                    pm25_min=("pm25", "min"),
+                    pm25_max=("pm25", "max"),
+                    aqi_sum=("aqi", "sum"),
+                )
+            ))
+    except Exception as exc:  # malformed file: report, don't kill the run
+        return FileResult(source, rows_read, 0, [], error=f"{type(exc).__name__}: {exc}")
+
+    if not partials:
+        return FileResult(source, rows_read, 0, [])
+
+    combined = pd.concat(partials).groupby(level=["city", "bucket"], sort=False).agg(
+        {"count": "sum", "pm25_sum": "sum", "pm25_min": "min", "pm25_max": "max", "aqi_sum": "sum"}
+    )
+    buckets = [
+        (
+            names[city], int(bucket), int(count),
+            float(pm25_sum), float(pm25_min), float(pm25_max), float(aqi_sum),
+        )
+        for (city, bucket), count, pm25_sum, pm25_min, pm25_max, aqi_sum in zip(
+            combined.index,
+            combined["count"], combined["pm25_sum"], combined["pm25_min"],
+            combined["pm25_max"], combined["aqi_sum"],
+        )
+    ]
+    return FileResult(source, rows_read, int(combined["count"].to_numpy(dtype=np.int64).sum()), buckets)
+
+
+def backfill(
+    paths: Iterable[str | Path],
+    store: Optional[AQIHistoryStore] = None,
+    workers: Optional[int] = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Dict[str, int]:
+    """
+    Ingest every archive file under *paths* into *store*.
+
+    Already-ingested files are skipped. With workers=1 files are processed
+    in-process (useful for tests and small runs). Returns run counters.
+    """
+    store = store or get_history_store()
+    workers = workers or os.cpu_count() or 1
+    files = [path for path in discover_files(paths) if not store.is_ingested(source_key(path))]
+    totals = {"files": len(files), "ingested": 0, "failed": 0, "rows_read": 0, "rows_used": 0}
+    started = time.monotonic()
+
+    def _apply(result: FileResult) -> None:
+        totals["rows_read"] += result.rows_read
+        if result.error:
+            totals["failed"] += 1
+            logger.warning("Skipping %s: %s", result.source, result.error)
+            return
+        totals["rows_used"] += result.rows_used
+        if store.merge_hourly_rollups(result.source, result.buckets, source_rows=result.rows_read):
+            totals["ingested"] += 1
+        done = totals["ingested"] + totals["failed"]
+        if done % 500 == 0:
+            logger.info("Backfill: %d/%d files, %d rows (%.0fs)",
+                        done, len(files), totals["rows_read"], time.monotonic() - started)
+
+    if workers <= 1:
+        for path in files:
+            _apply(aggregate_file(path, chunk_rows))
+    else:
+        # Bounded submission window: never more than a few files per worker in flight
+        remaining = iter(files)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight: set[Future] = set()
+            while True:
+                while len(in_flight) < workers * IN_FLIGHT_PER_WORKER:
+                    path = next(remaining, None)
+                    if path is None:
+                        break
+                    in_flight.add(pool.submit(aggregate_file, path, chunk_rows))
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _apply(future.result())
+
+    logger.info(
+        "Backfill finished: %d files ingested, %d failed, %d/%d PM2.5 rows used in %.1fs",
+        totals["ingested"], totals["failed"], totals["rows_used"], totals["rows_read"],
+        time.monotonic() - started,
+    )
+    return totals
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill AQI history from OpenAQ archive dumps.")
+    parser.add_argument("paths", nargs="+", help="archive files or directories (*.csv, *.csv.gz)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--db", default=None, help="history database (default: AQI_HISTORY_PATH or dataset_cache)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s  %(name)s  %(message)s")
+    store = AQIHistoryStore(args.db) if args.db else get_history_store()
+    totals = backfill(args.paths, store=store, workers=args.workers, chunk_rows=args.chunk_rows)
+    print(totals)
+
+
+if __name__ == "__main__":
+    main()
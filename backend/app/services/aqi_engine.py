@@ -0,0 +1,237 @@
+"""
+Vectorized multi-pollutant AQI engine for शहर AI.
+
+Computes pollutant sub-indices over NumPy arrays using `searchsorted` on
+breakpoint tables, for two scales:
+
+  - "us_epa":     US EPA AQI (PM2.5/PM10 in µg/m³, NO2/O3/SO2 in ppb, CO in ppm)
+  - "in_naqi":    Indian CPCB National AQI (CO in mg/m³, all others in µg/m³)
+
+Concentrations must be in the native units of the selected scale (see
+`UNITS`). Each sub-index is linearly interpolated inside its breakpoint
+segment; values above the top segment are capped at 500 and negative values
+map to 0. Missing readings are passed as NaN and ignored when picking the
+dominant pollutant.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Mapping, NamedTuple, Sequence
+
+import numpy as np
+
+POLLUTANTS = ("pm25", "pm10", "no2", "o3", "so2", "co")
+SCALES = ("us_epa", "in_naqi")
+
+AQI_CAP = 500
+
+UNITS: Dict[str, Dict[str, str]] = {
+    "us_epa": {"pm25": "µg/m³", "pm10": "µg/m³", "no2": "ppb", "o3": "ppb", "so2": "ppb", "co": "ppm"},
+    "in_naqi": {"pm25": "µg/m³", "pm10": "µg/m³", "no2": "µg/m³", "o3": "µg/m³", "so2": "µg/m³", "co": "mg/m³"},
+}
+
+# (concentration_low, concentration_high, index_low, index_high) per segment
+_BREAKPOINTS: Dict[str, Dict[str, Sequence[tuple]]] = {
+    "us_epa": {
+        "pm25": [
+            (0.0, 12.0, 0, 50),
+            (12.1, 35.4, 51, 100),
+            (35.5, 55.4, 101, 150),
+            (55.5, 150.4, 151, 200),
+            (150.5, 250.4, 201, 300),
+            (250.5, 350.4, 301, 400),
+            (350.5, 500.4, 401, 500),
+        ],
+        "pm10": [
+            (0, 54, 0, 50),
+            (55, 154, 51, 100),
+            (155, 254, 101, 150),
+            (255, 354, 151, 200),
+            (355, 424, 201, 300),
+            (425, 504, 301, 400),
+            (505, 604, 401, 500),
+        ],
+        "no2": [
+            (0, 53, 0, 50),
+            (54, 100, 51, 100),
+            (101, 360, 101, 150),
+            (361, 649, 151, 200),
+            (650, 1249, 201, 300),
+            (1250, 1649, 301, 400),
+            (1650, 2049, 401, 500),
+        ],
+        "o3": [  # 8-hour ozone
+            (0, 54, 0, 50),
+            (55, 70, 51, 100),
+            (71, 85, 101, 150),
+            (86, 105, 151, 200),
+            (106, 200, 201, 300),
+        ],
+        "so2": [
+            (0, 35, 0, 50),
+            (36, 75, 51, 100),
+            (76, 185, 101, 150),
+            (186, 304, 151, 200),
+            (305, 604, 201, 300),
+            (605, 804, 301, 400),
+            (805, 1004, 401, 500),
+        ],
+        "co": [
+            (0.0, 4.4, 0, 50),
+            (4.5, 9.4, 51, 100),
+            (9.5, 12.4, 101, 150),
+            (12.5, 15.4, 151, 200),
+            (15.5, 30.4, 201, 300),
+            (30.5, 40.4, 301, 400),
+            (40.5, 50.4, 401, 500),
+        ],
+    },
+    "in_naqi": {
+        "pm25": [
+            (0, 30, 0, 50),
+            (31, 60, 51, 100),
+            (61, 90, 101, 200),
+            (91, 120, 201, 300),
+            (121, 250, 301, 400),
+            (251, 380, 401, 500),
+        ],
+        "pm10": [
+            (0, 50, 0, 50),
+            (51, 100, 51, 100),
+            (101, 250, 101, 200),
+            (251, 350, 201, 300),
+            (351, 430, 301, 400),
+            (431, 510, 401, 500),
+        ],
+        "no2": [
+            (0, 40, 0, 50),
+            (41, 80, 51, 100),
+            (81, 180, 101, 200),
+            (181, 280, 201, 300),
+            (281, 400, 301, 400),
+            (401, 520, 401, 500),
+        ],
+        "o3": [
+            (0, 50, 0, 50),
+            (51, 100, 51, 100),
+            (101, 168, 101, 200),
+            (169, 208, 201, 300),
+            (209, 748, 301, 400),
+            (749, 1000, 401, 500),
+        ],
+        "so2": [
+            (0, 40, 0, 50),
+            (41, 80, 51, 100),
+            (81, 380, 101, 200),
+            (381, 800, 201, 300),
+            (801, 1600, 301, 400),
+            (1601, 2100, 401, 500),
+        ],
+        "co": [
+            (0.0, 1.0, 0, 50),
+            (1.1, 2.0, 51, 100),
+            (2.1, 10.0, 101, 200),
+            (10.1, 17.0, 201, 300),
+            (17.1, 34.0, 301, 400),
+            (34.1, 50.0, 401, 500),
+        ],
+    },
+}
+
+
+class _Table(NamedTuple):
+    c_lo: np.ndarray
+    c_hi: np.ndarray
+    i_lo: np.ndarray
+    i_hi: np.ndarray
+    slope: np.ndarray
+
+
+def _compile(segments: Sequence[tuple]) -> _Table:
+    arr = np.asarray(segments, dtype=np.float64)
+    slope = (arr[:, 3] - arr[:, 2]) / (arr[:, 1] - arr[:, 0])
+    return _Table(arr[:, 0], arr[:, 1], arr[:, 2], arr[:, 3], slope)
+
+
+_TABLES: Dict[str, Dict[str, _Table]] = {
+    scale: {pollutant: _compile(segments) for pollutant, segments in tables.items()}
+    for scale, tables in _BREAKPOINTS.items()
+}
+
+
+class AQIResult(NamedTuple):
+    aqi: np.ndarray  # float64, NaN where no pollutant was reported
+    dominant: np.ndarray  # object array of pollutant names (None where aqi is NaN)
+    sub_indices: Dict[str, np.ndarray]
+
+
+def _table(pollutant: str, scale: str) -> _Table:
+    if scale not in _TABLES:
+        raise ValueError(f"Unknown AQI scale: {scale}")
+    table = _TABLES[scale].get(pollutant)
+    if table is None:
+        raise ValueError(f"Pollutant {pollutant!r} is not supported on scale {scale!r}")
+    return table
+
+
+def sub_index(values, pollutant: str, scale: str = "us_epa") -> np.ndarray:
+    """
+    Sub-index for one pollutant over an array of concentrations.
+
+    The segment is chosen with `searchsorted` on the segment upper bounds, so
+    values in the small gaps between published segments (e.g. 12.05 µg/m³)
+    interpolate within the next segment instead of falling through.
+    """
+    table = _table(pollutant, scale)
+    conc = np.asarray(values, dtype=np.float64)
+    top = len(table.c_hi) - 1
+    idx = np.minimum(np.searchsorted(table.c_hi, conc, side="left"), top)
+
+    # NaN propagates through the arithmetic, so missing readings stay NaN
+    index = table.slope[idx] * (conc - table.c_lo[idx]) + table.i_lo[idx]
+    return np.clip(index, 0, AQI_CAP)
+
+
+def concentration_from_index(indices, pollutant: str, scale: str = "us_epa") -> np.ndarray:
+    """
+    Inverse of `sub_index`: concentration for each sub-index value.
+
+    Used for feeds that publish per-pollutant sub-indices rather than raw
+    concentrations. Indices are clipped to 0..AQI_CAP first.
+    """
+    table = _table(pollutant, scale)
+    index = np.clip(np.asarray(indices, dtype=np.float64), 0, AQI_CAP)
+    top = len(table.i_hi) - 1
+    idx = np.minimum(np.searchsorted(table.i_hi, index, side="left"), top)
+    return table.c_lo[idx] + (index - table.i_lo[idx]) / table.slope[idx]
+
+
+def compute_aqi(
+    concentrations: Mapping[str, object],
+    scale: str = "us_epa",
+) -> AQIResult:
+    """
+    Overall AQI and dominant pollutant for arrays of readings.
+
+    `concentrations` maps pollutant names to equally shaped arrays (NaN for
+    missing readings). The overall AQI is the maximum sub-index per element.
+    """
+    names = [name for name in POLLUTANTS if name in concentrations]
+    unknown = set(concentrations) - set(POLLUTANTS)
+    if unknown:
+        raise ValueError(f"Unsupported pollutants: {sorted(unknown)}")
+    if not names:
+        raise ValueError("At least one pollutant is required")
+
+    subs = {name: sub_index(concentrations[name], name, scale) for name in names}
+    # Sub-indices are >= 0, so -1 marks a missing reading
+    stacked = np.nan_to_num(np.stack(np.broadcast_arrays(*subs.values())), nan=-1.0)
+
+    winner = np.argmax(stacked, axis=0)
+    aqi = np.max(stacked, axis=0)
+    all_missing = aqi < 0
+    aqi[all_missing] = np.nan
+
+    dominant = np.asarray(names, dtype=object)[winner]
+    dominant[all_missing] = None
+    return AQIResult(aqi=aqi, dominant=dominant, sub_indices=subs)
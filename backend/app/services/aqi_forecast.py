@@ -0,0 +1,242 @@
+"""
+Short-horizon AQI forecasting for शहर AI.
+
+Forecasts hourly PM2.5 for the next 72 hours per city from the hourly
+rollups in the AQI history store, then converts each hour to US EPA AQI.
+
+Model (fit for all cities at once on a cities × hours matrix):
+  - Seasonal component: each city's hour-of-day profile over the last two
+    weeks (a seasonal-naive forecast averaged over days, robust to gaps).
+  - Level: simple exponential smoothing of the deseasonalised series,
+    skipping hours without readings.
+  - Forecast = level + profile[hour of day], clipped at 0.
+
+A background job refreshes all forecasts periodically; requests read the
+latest snapshot from memory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.aqi_engine import sub_index
+from app.services.aqi_history import AQIHistoryStore, get_history_store
+
+logger = logging.getLogger(__name__)
+
+FORECAST_HORIZON_HOURS = 72
+HISTORY_HOURS = 14 * 24
+SEASON_HOURS = 24
+SMOOTHING_ALPHA = 0.1
+MIN_HISTORY_HOURS = 48  # observed hours needed before a city gets a forecast
+REFRESH_INTERVAL_SECONDS = 900
+RETRY_AFTER_FAILURE_SECONDS = 60  # on-demand builds are not retried sooner than this
+
+_FORECASTS: Dict[str, Dict[str, Any]] = {}
+_GENERATED_AT: Optional[float] = None
+_FAILED_AT: Optional[float] = None
+_REFRESH_LOCK = threading.Lock()
+_JOB: Optional["asyncio.Task[None]"] = None
+
+
+def fit_forecasts(
+    history: np.ndarray,
+    start_hour: int,
+    horizon: int = FORECAST_HORIZON_HOURS,
+    alpha: float = SMOOTHING_ALPHA,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Forecast every row of *history* (cities × hours, NaN for gaps).
+
+    *start_hour* is the epoch hour (ts // 3600) of column 0. Returns
+    (forecast, residual_sigma) with shapes (cities, horizon) and (cities,).
+    """
+    n_cities, n_hours = history.shape
+    observed = ~np.isnan(history)
+    hod = (start_hour + np.arange(n_hours)) % SEASON_HOURS
+    season = (np.arange(SEASON_HOURS)[:, np.newaxis] == hod[np.newaxis, :]).astype(np.float64)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        city_mean = np.nansum(history, axis=1) / observed.sum(axis=1)
+    deviations = np.where(observed, history - city_mean[:, np.newaxis], 0.0)
+    counts = observed.astype(np.float64) @ season.T
+    profile = np.divide(
+        deviations @ season.T, counts, out=np.zeros((n_cities, SEASON_HOURS)), where=counts > 0
+    )
+
+    deseasonalised = history - profile[:, hod]
+    level = np.nan_to_num(city_mean)
+    sq_error = np.zeros(n_cities)
+    n_error = np.zeros(n_cities)
+    for column in deseasonalised.T:
+        ok = ~np.isnan(column)
+        error = np.where(ok, column - level, 0.0)
+        sq_error += error ** 2
+        n_error += ok
+        level = level + alpha * error
+
+    future_hod = (start_hour + n_hours + np.arange(horizon)) % SEASON_HOURS
+    forecast = np.clip(level[:, np.newaxis] + profile[:, future_hod], 0.0, None)
+    sigma = np.sqrt(np.divide(sq_error, n_error, out=np.zeros(n_cities), where=n_error > 0))
+    return forecast, sigma
+
+
+def _history_matrix(
+    rows: Iterable[Tuple[str, int, float]],
+    cities: List[str],
+    start_hour: int,
+    n_hours: int,
+) -> np.ndarray:
+    index = {city: i for i, city in enumerate(cities)}
+    matrix = np.full((len(cities), n_hours), np.nan)
+    for city, bucket, pm25 in rows:
+        column = bucket // 3600 - start_hour
+        if city in index and 0 <= column < n_hours:
+            matrix[index[city], column] = pm25
+    return matrix
+
+
+def build_forecasts(
+    cities: Iterable[str],
+    store: Optional[AQIHistoryStore] = None,
+    now: Optional[float] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Fit forecasts for *cities* from the last HISTORY_HOURS of hourly rollups."""
+    cities = list(cities)
+    store = store or get_history_store()
+    now = time.time() if now is None else now
+    end_hour = int(now) // 3600 + 1  # include the current (partial) hour
+    start_hour = end_hour - HISTORY_HOURS
+
+    rows = store.bucket_means(cities, start_hour * 3600, end_hour * 3600, "hourly")
+    history = _history_matrix(rows, cities, start_hour, HISTORY_HOURS)
+    forecast, sigma = fit_forecasts(history, start_hour)
+    aqi = sub_index(forecast, "pm25", "us_epa")
+
+    generated_at = datetime.fromtimestamp(now, tz=timezone.utc).isoformat()
+    first_ts = end_hour * 3600
+    observed_hours = (~np.isnan(history)).sum(axis=1)
+    forecasts: Dict[str, Dict[str, Any]] = {}
+    for i, city in enumerate(cities):
+        if observed_hours[i] < MIN_HISTORY_HOURS:
+            continue
+        forecasts[city.lower()] = {
+            "city": city,
+            "generated_at": generated_at,
+            "horizon_hours": FORECAST_HORIZON_HOURS,
+            "mean_aqi_24h": int(round(float(aqi[i, :24].mean()))),
+            "mean_aqi_72h": int(round(float(aqi[i].mean()))),
+            "pm25_sigma": round(float(sigma[i]), 2),
+            "observed_hours": int(observed_hours[i]),
+            "hourly": [
+                {
+                    "ts": first_ts + h * 3600,
+                    "pm25": round(float(forecast[i, h]), 2),
+                    "aqi": int(round(float(aqi[i, h]))),
+                }
+                for h in range(FORECAST_HORIZON_HOURS)
+            ],
+        }
+    return forecasts
+
+
+def _registry_cities() -> List[str]:
+    from app.services.city_data import get_city_names
+
+    return get_city_names()
+
+
+def refresh_forecasts(store: Optional[AQIHistoryStore] = None, now: Optional[float] = None) -> int:
+    """Rebuild all forecasts and swap them in; returns how many cities have one."""
+    global _FORECASTS, _GENERATED_AT
+    with _REFRESH_LOCK:
+        forecasts = build_forecasts(_registry_cities(), store=store, now=now)
+        _FORECASTS = forecasts
+        _GENERATED_AT = time.time() if now is None else now
+    logger.info("AQI forecasts refreshed for %d cities", len(forecasts))
+    return len(forecasts)
+
+
+def ensure_forecasts() -> bool:
+    """
+    Build the forecasts if the job has not run yet; True once they exist.
+
+    Blocking (reads the history store), so async callers run it in a
+    thread. A failed build is not retried for RETRY_AFTER_FAILURE_SECONDS.
+    """
+    global _FAILED_AT
+    if _GENERATED_AT is not None:
+        return True
+    if _FAILED_AT is not None and time.time() - _FAILED_AT < RETRY_AFTER_FAILURE_SECONDS:
+        return False
+    try:
+        refresh_forecasts()
+    except Exception as exc:
+        _FAILED_AT = time.time()
+        logger.warning("AQI forecast build failed: %s", exc)
+        return False
+    _FAILED_AT = None
+    return True
+
+
+def peek_forecast(city_name: str) -> Optional[Dict[str, Any]]:
+    """Cached forecast for *city_name*, or None until the forecasts have been built."""
+    return _FORECASTS.get(city_name.lower())
+
+
+def get_forecast(city_name: str) -> Optional[Dict[str, Any]]:
+    """Cached forecast for *city_name*; built on first use if the job has not run yet."""
+    if not ensure_forecasts():
+        return None
+    return peek_forecast(city_name)
+
+
+def clear_forecasts() -> None:
+    """Drop cached forecasts (useful for testing)."""
+    global _FORECASTS, _GENERATED_AT, _FAILED_AT
+    with _REFRESH_LOCK:
+        _FORECASTS = {}
+        _GENERATED_AT = None
+        _FAILED_AT = None
+
+
+# ---------------------------------------------------------------------------
+# Background refresh job
+# ---------------------------------------------------------------------------
+
+async def _run_forecast_job(interval: float) -> None:
+    while True:
+        try:
+            await asyncio.to_thread(refresh_forecasts)
+        except Exception as exc:
+            logger.error("AQI forecast refresh failed: %s", exc)
+        await asyncio.sleep(interval)
+
+
+def start_forecast_job() -> None:
+    """Start the periodic refresh (interval via AQI_FORECAST_INTERVAL_SECONDS)."""
+    global _JOB
+    if _JOB is not None and not _JOB.done():
+        return
+    interval = float(os.getenv("AQI_FORECAST_INTERVAL_SECONDS") or REFRESH_INTERVAL_SECONDS)
+    _JOB = asyncio.create_task(_run_forecast_job(interval))
+
+
+async def stop_forecast_job() -> None:
+    global _JOB
+    if _JOB is None:
+        return
+    _JOB.cancel()
+    try:
+        await _JOB
+    except asyncio.CancelledError:
+        pass
+    _JOB = None
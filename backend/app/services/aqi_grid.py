@@ -0,0 +1,190 @@
+"""
+Precomputed all-India AQI interpolation grid for शहर AI.
+
+Station PM2.5 readings from the bulk OpenAQ refresh are interpolated onto a
+regular 0.1° grid covering India by inverse-distance weighting. The grid is
+written as a float32 memory-mapped file (NaN where no station is in range)
+plus a small JSON metadata file, both replaced atomically on each rebuild.
+
+Lookups for an arbitrary coordinate are a single array index into the
+memory map, so `/api/aqi/at` costs the same for any lat/lon.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.services.aqi_spatial import idw
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).resolve().parent.parent.parent / "dataset_cache"
+DEFAULT_GRID_PATH = CACHE_DIR / "aqi_grid.f32"
+
+GRID_RES_DEG = 0.1
+LAT_MIN, LAT_MAX = 6.0, 37.5
+LON_MIN, LON_MAX = 68.0, 97.5
+N_LAT = int(round((LAT_MAX - LAT_MIN) / GRID_RES_DEG))
+N_LON = int(round((LON_MAX - LON_MIN) / GRID_RES_DEG))
+
+GRID_MAX_DISTANCE_KM = 75.0  # wider than the per-city radius so towns between stations are covered
+GRID_CHUNK_ROWS = 8  # latitude rows interpolated per IDW pass (bounds the distance matrix)
+_KM_PER_DEG_LAT = 110.5  # lower bound, so the latitude prefilter never drops a station in range
+
+
+def _meta_path(path: Path) -> Path:
+    return path.with_suffix(".json")
+
+
+def cell_index(lat: float, lon: float) -> Optional[Tuple[int, int]]:
+    """Row/column of the grid cell containing (lat, lon), or None outside the grid."""
+    if not (LAT_MIN <= lat <= LAT_MAX and LON_MIN <= lon <= LON_MAX):
+        return None
+    row = min(int((lat - LAT_MIN) / GRID_RES_DEG), N_LAT - 1)
+    col = min(int((lon - LON_MIN) / GRID_RES_DEG), N_LON - 1)
+    return row, col
+
+
+def cell_centre(row: int, col: int) -> Tuple[float, float]:
+    return (
+        round(LAT_MIN + (row + 0.5) * GRID_RES_DEG, 4),
+        round(LON_MIN + (col + 0.5) * GRID_RES_DEG, 4),
+    )
+
+
+class AQIGrid:
+    """Read-only view of a built grid file."""
+
+    def __init__(self, path: Path, meta: Dict[str, Any]) -> None:
+        self.path = path
+        self.meta = meta
+        self.pm25 = np.memmap(path, dtype=np.float32, mode="r", shape=(N_LAT, N_LON))
+
+    @property
+    def built_at(self) -> float:
+        return float(self.meta.get("built_at", 0.0))
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.built_at
+
+    def value_at(self, lat: float, lon: float) -> Optional[float]:
+        """Interpolated PM2.5 at (lat, lon); None outside the grid or without coverage."""
+        cell = cell_index(lat, lon)
+        if cell is None:
+            return None
+        value = float(self.pm25[cell])
+        return None if np.isnan(value) else value
+
+
+def build_grid(
+    station_lats: np.ndarray,
+    station_lons: np.ndarray,
+    pm25: np.ndarray,
+    path: Optional[Path] = None,
+    built_at: Optional[float] = None,
+) -> AQIGrid:
+    """
+    Interpolate station PM2.5 onto the grid and atomically replace the grid files.
+
+    Rows are processed in chunks of GRID_CHUNK_ROWS against only the stations
+    in the chunk's latitude band, so the cells × stations distance matrix
+    stays small regardless of station count.
+    """
+    path = Path(path or _grid_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    # Stations sorted by latitude so each row chunk only sees those within
+    # GRID_MAX_DISTANCE_KM north/south of it
+    order = np.argsort(station_lats)
+    station_lats = np.asarray(station_lats, dtype=np.float64)[order]
+    station_lons = np.asarray(station_lons, dtype=np.float64)[order]
+    pm25 = np.asarray(pm25, dtype=np.float64)[order]
+    lat_pad = GRID_MAX_DISTANCE_KM / _KM_PER_DEG_LAT
+
+    col_lons = LON_MIN + (np.arange(N_LON) + 0.5) * GRID_RES_DEG
+    grid = np.memmap(tmp_path, dtype=np.float32, mode="w+", shape=(N_LAT, N_LON))
+    for start in range(0, N_LAT, GRID_CHUNK_ROWS):
+        stop = min(start + GRID_CHUNK_ROWS, N_LAT)
+        row_lats = LAT_MIN + (np.arange(start, stop) + 0.5) * GRID_RES_DEG
+        lo, hi = np.searchsorted(station_lats, [row_lats[0] - lat_pad, row_lats[-1] + lat_pad])
+        if lo == hi:
+            grid[start:stop] = np.nan
+            continue
+        lats, lons = np.meshgrid(row_lats, col_lons, indexing="ij")
+        estimates, _ = idw(
+            lats.ravel(), lons.ravel(), station_lats[lo:hi], station_lons[lo:hi], pm25[lo:hi],
+            max_distance_km=GRID_MAX_DISTANCE_KM,
+        )
+        grid[start:stop] = estimates.reshape(stop - start, N_LON)
+    covered = int(np.count_nonzero(~np.isnan(grid)))
+    grid.flush()
+    del grid
+
+    meta = {
+        "built_at": time.time() if built_at is None else built_at,
+        "stations": int(len(pm25)),
+        "covered_cells": covered,
+        "shape": [N_LAT, N_LON],
+        "resolution_deg": GRID_RES_DEG,
+        "bounds": [LAT_MIN, LON_MIN, LAT_MAX, LON_MAX],
+    }
+    tmp_meta = tmp_path.with_suffix(".json.tmp")
+    tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp_path, path)
+    os.replace(tmp_meta, _meta_path(path))
+    logger.info("AQI grid rebuilt from %d stations (%d cells covered)", meta["stations"], covered)
+    return AQIGrid(path, meta)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide grid
+# ---------------------------------------------------------------------------
+
+_GRID: Optional[AQIGrid] = None
+_GRID_MTIME: Optional[int] = None
+_GRID_LOCK = threading.Lock()
+
+
+def _grid_path() -> Path:
+    return Path(os.getenv("AQI_GRID_PATH") or DEFAULT_GRID_PATH)
+
+
+def get_grid() -> Optional[AQIGrid]:
+    """
+    Return the current grid, or None if none has been built yet.
+
+    The memory map is reopened only when the metadata file changes, so
+    rebuilds by another worker process are picked up on the next lookup.
+    """
+    global _GRID, _GRID_MTIME
+    path = _grid_path()
+    meta_path = _meta_path(path)
+    try:
+        mtime = meta_path.stat().st_mtime_ns
+    except OSError:
+        return None
+    if _GRID is not None and _GRID_MTIME == mtime and _GRID.path == path:
+        return _GRID
+
+    with _GRID_LOCK:
+        if _GRID is None or _GRID_MTIME != mtime or _GRID.path != path:
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                if meta.get("shape") != [N_LAT, N_LON]:
+                    logger.warning("Ignoring AQI grid with unexpected shape %s", meta.get("shape"))
+                    return None
+                _GRID = AQIGrid(path, meta)
+                _GRID_MTIME = mtime
+            except (OSError, ValueError) as exc:
+                logger.warning("Failed to load AQI grid: %s", exc)
+                return None
+    return _GRID
@@ -0,0 +1,379 @@
+"""
+Local AQI time-series store for शहर AI.
+
+Every live reading returned by the OpenAQ service is appended to a small
+SQLite database (one row per city, station and timestamp). Hourly, daily and
+monthly rollups are maintained incrementally on insert as count/sum/min/max
+tuples, so they compose: rollups written by a bulk backfill and by live
+readings can be merged without re-reading raw rows.
+
+The rollups back:
+  - range queries at hourly/daily/monthly resolution,
+  - the multi-year average and trend that replace the static
+    `avg_aqi_5yr` / `aqi_trend` literals once enough history exists,
+  - rolling averages over the last N days.
+
+Summary lookups read a bounded window of monthly and hourly rollup rows
+through the primary-key index, so their cost does not grow with the amount
+of history. Whether a window holds enough history is judged by the number
+of distinct hours with readings, not the raw sample count: live readings
+arrive every few minutes, bulk backfills once an hour.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).resolve().parent.parent.parent / "dataset_cache"
+DEFAULT_DB_PATH = CACHE_DIR / "aqi_history.sqlite3"
+
+RESOLUTIONS = ("hourly", "daily", "monthly")
+
+SUMMARY_MONTHS = 60  # "5-year" average window
+TREND_MONTHS = 12  # compare the last 12 months against the 12 before
+TREND_THRESHOLD = 0.05  # ±5% change counts as improving / worsening
+MIN_SUMMARY_HOURS = 24 * 30  # ~one month of hours with readings before trusting the average
+MIN_TREND_HOURS = 24 * 30  # per comparison window
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    city TEXT NOT NULL,
+    station TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    pm25 REAL NOT NULL,
+    aqi REAL NOT NULL,
+    PRIMARY KEY (city, station, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ingested_sources (
+    source TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    ingested_at INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution TEXT NOT NULL,
+    city TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    pm25_sum REAL NOT NULL,
+    pm25_min REAL NOT NULL,
+    pm25_max REAL NOT NULL,
+    aqi_sum REAL NOT NULL,
+    PRIMARY KEY (resolution, city, bucket)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_ROLLUP = """
+INSERT INTO rollups (resolution, city, bucket, count, pm25_sum, pm25_min, pm25_max, aqi_sum)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (resolution, city, bucket) DO UPDATE SET
+    count = count + excluded.count,
+    pm25_sum = pm25_sum + excluded.pm25_sum,
+    pm25_min = MIN(pm25_min, excluded.pm25_min),
+    pm25_max = MAX(pm25_max, excluded.pm25_max),
+    aqi_sum = aqi_sum + excluded.aqi_sum
+"""
+
+
+class AQISummary(NamedTuple):
+    avg_aqi: Optional[float]
+    trend: Optional[str]
+    samples: int
+
+
+def _hour_bucket(ts: int) -> int:
+    return ts - ts % 3600
+
+
+def _day_bucket(ts: int) -> int:
+    return ts - ts % 86400
+
+
+def _month_bucket(ts: int) -> int:
+    moment = datetime.fromtimestamp(ts, tz=timezone.utc)
+    return int(datetime(moment.year, moment.month, 1, tzinfo=timezone.utc).timestamp())
+
+
+def _bucket_fns():
+    return (("hourly", _hour_bucket), ("daily", _day_bucket), ("monthly", _month_bucket))
+
+
+def _months_back(ts: int, months: int) -> int:
+    """Start of the month *months* before the month containing *ts*."""
+    moment = datetime.fromtimestamp(ts, tz=timezone.utc)
+    index = moment.year * 12 + (moment.month - 1) - months
+    return int(datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc).timestamp())
+
+
+def parse_timestamp(value: Any) -> int:
+    """Parse an OpenAQ timestamp into epoch seconds; falls back to now."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return int(time.time())
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return int(moment.timestamp())
+    return int(time.time())
+
+
+class AQIHistoryStore:
+    """Append-only PM2.5/AQI readings with incrementally maintained rollups."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, city: str, station: str, ts: int, pm25: float, aqi: float) -> bool:
+        """Record one reading. Duplicate (city, station, ts) rows are ignored."""
+        return self.append_many([(city, station, ts, pm25, aqi)]) == 1
+
+    def append_many(self, readings: Iterable[Tuple[str, str, int, float, float]]) -> int:
+        """Record many readings in one transaction; returns how many were new."""
+        inserted = 0
+        with self._lock, self._conn:
+            for city, station, ts, pm25, aqi in readings:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO readings (city, station, ts, pm25, aqi) VALUES (?, ?, ?, ?, ?)",
+                    (city, str(station), int(ts), float(pm25), float(aqi)),
+                )
+                if cursor.rowcount != 1:
+                    continue
+                inserted += 1
+                for resolution, bucket_fn in _bucket_fns():
+                    self._conn.execute(
+                        _UPSERT_ROLLUP,
+                        (resolution, city, bucket_fn(int(ts)), 1, float(pm25), float(pm25), float(pm25), float(aqi)),
+                    )
+        return inserted
+
+    def is_ingested(self, source: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM ingested_sources WHERE source = ?", (source,)
+            ).fetchone() is not None
+
+    def merge_hourly_rollups(
+        self,
+        source: str,
+        rows: Iterable[Tuple[str, int, int, float, float, float, float]],
+        source_rows: int = 0,
+    ) -> bool:
+        """
+        Merge pre-aggregated hourly buckets from a bulk source into the rollups.
+
+        *rows* are (city, hour_bucket, count, pm25_sum, pm25_min, pm25_max,
+        aqi_sum). Daily and monthly rollups are updated from the same tuples.
+        Raw readings are not stored. Each *source* is applied at most once;
+        returns False if it was already ingested.
+        """
+        with self._lock, self._conn:
+            if self._conn.execute(
+                "SELECT 1 FROM ingested_sources WHERE source = ?", (source,)
+            ).fetchone() is not None:
+                return False
+            self._conn.executemany(
+                _UPSERT_ROLLUP,
+                (
+                    (resolution, city, bucket_fn(int(bucket)), int(count), float(pm25_sum),
+                     float(pm25_min), float(pm25_max), float(aqi_sum))
+                    for city, bucket, count, pm25_sum, pm25_min, pm25_max, aqi_sum in rows
+                    for resolution, bucket_fn in _bucket_fns()
+                ),
+            )
+            self._conn.execute(
+                "INSERT INTO ingested_sources (source, rows, ingested_at) VALUES (?, ?, ?)",
+                (source, int(source_rows), int(time.time())),
+            )
+        return True
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        city: str,
+        start: int,
+        end: int,
+        resolution: str = "hourly",
+    ) -> List[Dict[str, Any]]:
+        """Return rollup buckets for *city* with start <= bucket < end."""
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT bucket, count, pm25_sum, pm25_min, pm25_max, aqi_sum FROM rollups "
+                "WHERE resolution = ? AND city = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+                (resolution, city, int(start), int(end)),
+            ).fetchall()
+        return [
+            {
+                "bucket": bucket,
+                "count": count,
+                "pm25_mean": round(pm25_sum / count, 2),
+                "pm25_min": pm25_min,
+                "pm25_max": pm25_max,
+                "aqi_mean": round(aqi_sum / count, 1),
+            }
+            for bucket, count, pm25_sum, pm25_min, pm25_max, aqi_sum in rows
+        ]
+
+    def bucket_means(
+        self,
+        cities: Iterable[str],
+        start: int,
+        end: int,
+        resolution: str = "hourly",
+    ) -> List[Tuple[str, int, float]]:
+        """(city, bucket, pm25_mean) rows for *cities* with start <= bucket < end."""
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        rows: List[Tuple[str, int, float]] = []
+        with self._lock:
+            for city in cities:
+                rows.extend(self._conn.execute(
+                    "SELECT city, bucket, pm25_sum / count FROM rollups "
+                    "WHERE resolution = ? AND city = ? AND bucket >= ? AND bucket < ?",
+                    (resolution, city, int(start), int(end)),
+                ))
+        return rows
+
+    def _window_totals(self, resolution: str, city: str, start: int, end: int) -> Tuple[int, float]:
+        with self._lock:
+            count, aqi_sum = self._conn.execute(
+                "SELECT COALESCE(SUM(count), 0), COALESCE(SUM(aqi_sum), 0.0) FROM rollups "
+                "WHERE resolution = ? AND city = ? AND bucket >= ? AND bucket < ?",
+                (resolution, city, int(start), int(end)),
+            ).fetchone()
+        return int(count), float(aqi_sum)
+
+    def _window_hours(self, city: str, start: int, end: int) -> int:
+        """Distinct hours with at least one reading (hourly rollup rows)."""
+        with self._lock:
+            (hours,) = self._conn.execute(
+                "SELECT COUNT(*) FROM rollups "
+                "WHERE resolution = 'hourly' AND city = ? AND bucket >= ? AND bucket < ?",
+                (city, int(start), int(end)),
+            ).fetchone()
+        return int(hours)
+
+    def rolling_average(self, city: str, days: int, now: Optional[int] = None) -> Optional[float]:
+        """Mean AQI over the last *days* days (daily rollups), or None without data."""
+        now = int(time.time()) if now is None else now
+        end = _day_bucket(now) + 86400
+        count, aqi_sum = self._window_totals("daily", city, end - days * 86400, end)
+        return round(aqi_sum / count, 1) if count else None
+
+    def summary(self, city: str, now: Optional[int] = None) -> AQISummary:
+        """Multi-year average AQI and trend from monthly rollups."""
+        now = int(time.time()) if now is None else now
+        end = _months_back(now, -1)  # start of next month
+        start = _months_back(end, SUMMARY_MONTHS)
+        count, aqi_sum = self._window_totals("monthly", city, start, end)
+        enough = count > 0 and self._window_hours(city, start, end) >= MIN_SUMMARY_HOURS
+        avg = round(aqi_sum / count, 1) if enough else None
+
+        recent_start = _months_back(end, TREND_MONTHS)
+        prior_start = _months_back(end, 2 * TREND_MONTHS)
+        recent_count, recent_sum = self._window_totals("monthly", city, recent_start, end)
+        prior_count, prior_sum = self._window_totals("monthly", city, prior_start, recent_start)
+        trend: Optional[str] = None
+        if (
+            recent_count > 0 and prior_count > 0
+            and self._window_hours(city, recent_start, end) >= MIN_TREND_HOURS
+            and self._window_hours(city, prior_start, recent_start) >= MIN_TREND_HOURS
+        ):
+            recent_mean = recent_sum / recent_count
+            prior_mean = prior_sum / prior_count
+            change = (recent_mean - prior_mean) / prior_mean if prior_mean else 0.0
+            if change <= -TREND_THRESHOLD:
+                trend = "improving"
+            elif change >= TREND_THRESHOLD:
+                trend = "worsening"
+            else:
+                trend = "stable"
+        return AQISummary(avg, trend, count)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide store
+# ---------------------------------------------------------------------------
+
+_STORE: Optional[AQIHistoryStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_history_store() -> AQIHistoryStore:
+    """Return the shared store (path overridable via AQI_HISTORY_PATH)."""
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = AQIHistoryStore(os.getenv("AQI_HISTORY_PATH") or DEFAULT_DB_PATH)
+    return _STORE
+
+
+def record_live_reading(result: Dict[str, Any]) -> None:
+    """Append a live AQI result (as returned by openaq_service) to the store."""
+    try:
+        get_history_store().append(
+            city=result["city"],
+            station=str(result.get("station_id") or "unknown"),
+            ts=parse_timestamp(result.get("timestamp")),
+            pm25=float(result["pm25"]),
+            aqi=float(result["aqi_estimate"]),
+        )
+    except Exception as exc:
+        logger.warning("Failed to record AQI reading for %s: %s", result.get("city"), exc)
+
+
+def get_aqi_baseline(city: Dict[str, Any]) -> Tuple[float, str]:
+    """
+    Return (avg_aqi_5yr, aqi_trend) for a registry city.
+
+    Values come from the recorded history once enough readings exist; the
+    static figures in city_data are used otherwise.
+    """
+    fallback_avg = city.get("avg_aqi_5yr", city["current_aqi"])
+    fallback_trend = city.get("aqi_trend", "stable")
+    try:
+        summary = get_history_store().summary(city["city_name"])
+    except Exception as exc:
+        logger.warning("AQI history unavailable for %s: %s", city["city_name"], exc)
+        return fallback_avg, fallback_trend
+    return (
+        summary.avg_aqi if summary.avg_aqi is not None else fallback_avg,
+        summary.trend or fallback_trend,
+    )
+
+
+def get_aqi_baselines(cities: Iterable[Dict[str, Any]]) -> Dict[str, Tuple[float, str]]:
+    """get_aqi_baseline() for several cities, by city name (one call to run off the event loop)."""
+    return {city["city_name"]: get_aqi_baseline(city) for city in cities}
@@ -0,0 +1,304 @@
+"""
+Live AQI providers and hedged multi-provider fetching for शहर AI.
+
+Providers:
+  - "openaq": OpenAQ v3 station measurements (see openaq_service)
+  - "waqi":   World Air Quality Index feed (aggregates CPCB stations),
+              enabled by WAQI_API_TOKEN; WAQI_BASE_URL points it at a stand-in
+
+Hedging: the primary (first configured) provider is queried first. If it has
+not answered within its recent p95 latency (clamped to HEDGE_MIN/MAX), or it
+answers without data, the backup is fired as well. A call cancelled because
+the backup won still records its elapsed time, as a lower bound, so slow
+calls are not left out of the p95. Whatever arrives within a
+short grace window after the first usable reading is merged, weighting each
+provider's PM2.5 by a quality score built from provider trust, reading age
+and station distance.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from app.services.aqi_engine import concentration_from_index, sub_index
+from app.services.aqi_history import parse_timestamp
+from app.services.aqi_spatial import haversine_matrix
+
+logger = logging.getLogger(__name__)
+
+WAQI_BASE_URL = "https://api.waqi.info"
+
+LATENCY_WINDOW = 200  # recent latencies kept per provider
+MIN_LATENCY_SAMPLES = 20  # below this the default hedge delay is used
+DEFAULT_HEDGE_DELAY_S = 1.0
+HEDGE_MIN_DELAY_S = 0.2
+HEDGE_MAX_DELAY_S = 3.0
+MERGE_GRACE_S = 0.25  # wait this long for a second reading once one has arrived
+
+FRESHNESS_HALF_LIFE_H = 3.0
+DISTANCE_SCALE_KM = 25.0
+UNKNOWN_DISTANCE_FACTOR = 0.8
+
+
+class AQIProvider(ABC):
+    """Base class: one live PM2.5 source."""
+
+    name = "base"
+    trust = 1.0  # relative weight of this source's readings
+
+    def __init__(self) -> None:
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def is_configured(self) -> bool:
+        return True
+
+    @abstractmethod
+    async def fetch(self, city_name: str, coords: Tuple[float, float]) -> Optional[Dict[str, Any]]:
+        """Latest reading near *coords* as a result dict, or None without data."""
+
+    def record_latency(self, seconds: float) -> None:
+        self._latencies.append(seconds)
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait on this provider before firing the backup."""
+        if len(self._latencies) < MIN_LATENCY_SAMPLES:
+            return DEFAULT_HEDGE_DELAY_S
+        p95 = float(np.percentile(np.fromiter(self._latencies, dtype=np.float64), 95))
+        return min(max(p95, HEDGE_MIN_DELAY_S), HEDGE_MAX_DELAY_S)
+
+
+class OpenAQProvider(AQIProvider):
+    name = "openaq"
+    trust = 1.0  # raw concentrations
+
+    def is_configured(self) -> bool:
+        from app.services import openaq_service
+
+        return bool(openaq_service._get_api_key())
+
+    async def fetch(self, city_name: str, coords: Tuple[float, float]) -> Optional[Dict[str, Any]]:
+        from app.services import openaq_service
+
+        api_key = openaq_service._get_api_key()
+        if not api_key:
+            return None
+        return await openaq_service._fetch_current_aqi(city_name, coords, api_key)
+
+
+class WAQIProvider(AQIProvider):
+    name = "waqi"
+    trust = 0.8  # PM2.5 is reconstructed from the published sub-index
+
+    def _token(self) -> Optional[str]:
+        return os.getenv("WAQI_API_TOKEN")
+
+    def is_configured(self) -> bool:
+        return bool(self._token())
+
+    async def fetch(self, city_name: str, coords: Tuple[float, float]) -> Optional[Dict[str, Any]]:
+        token = self._token()
+        if not token:
+            return None
+        lat, lon = coords
+        base_url = (os.getenv("WAQI_BASE_URL") or WAQI_BASE_URL).rstrip("/")
+        try:
+            async with httpx.AsyncClient(timeout=15.0) as client:
+                resp = await client.get(f"{base_url}/feed/geo:{lat};{lon}/", params={"token": token})
+        except httpx.RequestError as exc:
+            logger.error("Network error fetching WAQI data for city '%s': %s", city_name, exc)
+            return None
+        if resp.status_code != 200:
+            logger.warning("WAQI feed returned %d for city '%s'", resp.status_code, city_name)
+            return None
+
+        body = resp.json()
+        data = body.get("data") if isinstance(body, dict) and body.get("status") == "ok" else None
+        if not isinstance(data, dict):
+            logger.info("No WAQI feed for city: %s", city_name)
+            return None
+        pm25_index = ((data.get("iaqi") or {}).get("pm25") or {}).get("v")
+        if pm25_index is None or pm25_index <= 0:
+            logger.info("No WAQI PM2.5 reading for city: %s", city_name)
+            return None
+
+        pm25 = float(concentration_from_index(pm25_index, "pm25", "us_epa"))
+        geo = (data.get("city") or {}).get("geo") or []
+        return {
+            "city": city_name,
+            "pm25": round(pm25, 2),
+            "aqi_estimate": int(round(float(pm25_index))),
+            "timestamp": (data.get("time") or {}).get("iso", "unknown"),
+            "station_id": f"waqi:{data.get('idx')}",
+            "station_coords": tuple(geo[:2]) if len(geo) >= 2 else None,
+            "data_source": "waqi_live",
+        }
+
+
+_PROVIDERS: List[AQIProvider] = [OpenAQProvider(), WAQIProvider()]
+
+
+def get_providers() -> List[AQIProvider]:
+    """Configured providers in priority order (primary first)."""
+    return [provider for provider in _PROVIDERS if provider.is_configured()]
+
+
+# ---------------------------------------------------------------------------
+# Quality scoring and merge
+# ---------------------------------------------------------------------------
+
+def quality_score(
+    provider: AQIProvider,
+    result: Dict[str, Any],
+    coords: Tuple[float, float],
+    now: Optional[float] = None,
+) -> float:
+    """0..1 quality of one reading: provider trust × freshness × proximity."""
+    now = time.time() if now is None else now
+    timestamp = result.get("timestamp")
+    if isinstance(timestamp, str) and timestamp[:1].isdigit():
+        age_h = max(0.0, (now - parse_timestamp(timestamp)) / 3600.0)
+        freshness = 0.5 ** (age_h / FRESHNESS_HALF_LIFE_H)
+    else:
+        freshness = 0.5  # "embedded" / unknown timestamps
+
+    station = result.get("station_coords")
+    if station:
+        distance_km = float(
+            haversine_matrix(
+                np.array([coords[0]]), np.array([coords[1]]), np.array([station[0]]), np.array([station[1]])
+            )[0, 0]
+        )
+        proximity = math.exp(-distance_km / DISTANCE_SCALE_KM)
+    else:
+        proximity = UNKNOWN_DISTANCE_FACTOR
+    return round(provider.trust * freshness * proximity, 3)
+
+
+def merge_results(
+    city_name: str,
+    readings: List[Tuple[AQIProvider, Dict[str, Any]]],
+    coords: Tuple[float, float],
+) -> Optional[Dict[str, Any]]:
+    """Quality-weighted PM2.5 across providers; a single reading is passed through."""
+    if not readings:
+        return None
+    scored = [
+        (provider, result, quality_score(provider, result, coords))
+        for provider, result in readings
+    ]
+    if len(scored) == 1:
+        provider, result, quality = scored[0]
+        merged = dict(result)
+        merged.pop("station_coords", None)
+        merged["quality"] = quality
+        merged["providers"] = [provider.name]
+        return merged
+
+    weights = np.array([max(quality, 1e-6) for _, _, quality in scored])
+    values = np.array([result["pm25"] for _, result, _ in scored])
+    pm25 = float(weights @ values / weights.sum())
+    best = max(scored, key=lambda item: item[2])[1]
+    return {
+        "city": city_name,
+        "pm25": round(pm25, 2),
+        "aqi_estimate": int(round(float(sub_index(pm25, "pm25", "us_epa")))),
+        "timestamp": best.get("timestamp"),
+        "station_id": best.get("station_id"),
+        "data_source": "multi_provider",
+        "quality": round(float(weights.max()), 3),
+        "providers": [provider.name for provider, _, _ in scored],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Hedged fetch
+# ---------------------------------------------------------------------------
+
+async def _timed_fetch(
+    provider: AQIProvider,
+    city_name: str,
+    coords: Tuple[float, float],
+) -> Optional[Dict[str, Any]]:
+    started = time.monotonic()
+    try:
+        result = await provider.fetch(city_name, coords)
+    except asyncio.CancelledError:
+        provider.record_latency(time.monotonic() - started)  # at least this slow
+        raise
+    provider.record_latency(time.monotonic() - started)
+    return result
+
+
+async def fetch_hedged(
+    city_name: str,
+    coords: Tuple[float, float],
+    providers: Optional[List[AQIProvider]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Query *providers* with hedging and merge their readings.
+
+    The backup is only fired if the primary is slower than its hedge delay
+    or comes back without data, so in the common case this costs exactly one
+    provider call.
+    """
+    providers = get_providers() if providers is None else providers
+    if not providers:
+        return None
+    if len(providers) == 1:
+        result = await _timed_fetch(providers[0], city_name, coords)
+        return merge_results(city_name, [(providers[0], result)] if result is not None else [], coords)
+
+    primary, backups = providers[0], list(providers[1:])
+    tasks: Dict["asyncio.Task[Optional[Dict[str, Any]]]", AQIProvider] = {
+        asyncio.create_task(_timed_fetch(primary, city_name, coords)): primary
+    }
+    readings: List[Tuple[AQIProvider, Dict[str, Any]]] = []
+    pending = set(tasks)
+    deadline: Optional[float] = None
+    try:
+        timeout: Optional[float] = primary.hedge_delay() if backups else None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is not None:
+                    logger.warning("AQI provider %s failed: %s", tasks[task].name, task.exception())
+                    continue
+                result = task.result()
+                if result is not None:
+                    readings.append((tasks[task], result))
+
+            if readings and deadline is None:
+                deadline = time.monotonic() + MERGE_GRACE_S
+            elif not readings and backups and (not done or not pending):
+                # Primary is slow (timeout) or answered without data: hedge
+                backup = backups.pop(0)
+                task = asyncio.create_task(_timed_fetch(backup, city_name, coords))
+                tasks[task] = backup
+                pending.add(task)
+                logger.debug("Hedging %s with %s", city_name, backup.name)
+
+            if deadline is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+            else:
+                timeout = primary.hedge_delay() if backups else None
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return merge_results(city_name, readings, coords)
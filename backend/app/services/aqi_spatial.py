@@ -0,0 +1,66 @@
+"""
+Spatial helpers for station-based AQI estimates.
+
+All functions are vectorized over NumPy arrays: distances are computed as a
+targets × stations matrix and inverse-distance weighting (IDW) reduces it to
+one estimate per target in a single pass.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+IDW_POWER = 2.0
+IDW_MAX_DISTANCE_KM = 25.0  # same radius as the per-city OpenAQ search
+IDW_MIN_DISTANCE_KM = 1.0  # stations closer than this are weighted as if at 1 km
+
+
+def haversine_matrix(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray,
+) -> np.ndarray:
+    """Great-circle distances (km) between every point in set 1 and set 2."""
+    phi1 = np.radians(np.asarray(lat1, dtype=np.float64))[:, np.newaxis]
+    phi2 = np.radians(np.asarray(lat2, dtype=np.float64))[np.newaxis, :]
+    dphi = phi2 - phi1
+    dlam = (
+        np.radians(np.asarray(lon2, dtype=np.float64))[np.newaxis, :]
+        - np.radians(np.asarray(lon1, dtype=np.float64))[:, np.newaxis]
+    )
+    a = np.sin(dphi / 2.0) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlam / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def idw(
+    target_lat: np.ndarray,
+    target_lon: np.ndarray,
+    station_lat: np.ndarray,
+    station_lon: np.ndarray,
+    values: np.ndarray,
+    power: float = IDW_POWER,
+    max_distance_km: float = IDW_MAX_DISTANCE_KM,
+    min_distance_km: float = IDW_MIN_DISTANCE_KM,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Inverse-distance-weighted estimate of *values* at each target point.
+
+    Only stations within *max_distance_km* contribute. Returns
+    (estimates, station_counts); targets without any station in range get NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    distances = haversine_matrix(target_lat, target_lon, station_lat, station_lon)
+    in_range = distances <= max_distance_km
+    weights = np.where(in_range, np.maximum(distances, min_distance_km) ** -power, 0.0)
+
+    weight_sum = weights.sum(axis=1)
+    counts = in_range.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        estimates = (weights @ values) / weight_sum
+    estimates[counts == 0] = np.nan
+    return estimates, counts
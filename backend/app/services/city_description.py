@@ -5,9 +5,13 @@ For the current testing phase, the endpoint returns deterministic,
 dataset-backed descriptions instead of relying on prompt-only generation.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
 
-from app.services.city_evidence_service import build_city_description_from_local_evidence
+from app.services.city_evidence_service import (
+    build_city_description_from_local_evidence,
+    render_city_description,
+    stream_city_description,
+)
 
 
 def generate_city_description(
@@ -27,3 +31,41 @@ def generate_city_description(
         has_elderly=has_elderly,
         language=language,
     )
+
+
+def generate_city_description_json(
+    city_name: str,
+    state: str,
+    has_children: bool = False,
+    has_elderly: bool = False,
+    language: str = "en",
+) -> bytes:
+    """
+    Same description as generate_city_description, as a ready JSON body.
+    """
+    return render_city_description(
+        city_name=city_name,
+        state=state,
+        has_children=has_children,
+        has_elderly=has_elderly,
+        language=language,
+    )
+
+
+def generate_city_description_stream(
+    city_name: str,
+    state: str,
+    has_children: bool = False,
+    has_elderly: bool = False,
+    language: str = "en",
+) -> Iterator[bytes]:
+    """
+    Same description as server-sent events, one per section as it is ready.
+    """
+    return stream_city_description(
+        city_name=city_name,
+        state=state,
+        has_children=has_children,
+        has_elderly=has_elderly,
+        language=language,
+    )
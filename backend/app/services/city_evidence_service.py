@@ -8,31 +8,57 @@ endpoint.
 
 from __future__ import annotations
 
-import csv
 import json
 import logging
-import re
+import threading
 import time
-from copy import deepcopy
-from collections import defaultdict
-from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Set
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+from pydantic import ValidationError
 
 from dataset.geography_fetcher import GeographyFetcher
 from dataset.nabh_fetcher import NABHFetcher
-from app.services.city_data import get_all_cities, get_city_by_name, INDIAN_CITIES_DATA
+from app.services.city_data import get_all_cities, get_city_by_name
 from app.services.connectivity_ai_service import get_live_connectivity
+from app.services.description_fragments import (
+    DONE_EVENT,
+    SECTION_MODELS,
+    DescriptionFragments,
+    compose_description,
+    freeze_entry,
+    meta_event,
+    section_event,
+    serialize_section,
+)
+from app.services.evidence_index import RowIndex
+from app.services.hospital_table import HospitalTable, _summarize_list_text
+from app.services.live_enrichment import LiveEnrichment
 from app.services.pdf_evidence_service import (
+    _classify_pdf,
     get_crime_section_for_city,
     get_religion_snippet_for_district,
+    install_pdf_evidence,
+    staged_pdf_evidence,
+)
+from app.services.single_flight import SingleFlightLoader
+from app.services.udise_artifacts import (
+    _RELEVANT_STATE_NORMS,
+    UdiseAreas,
+    _normalize,
+    as_int_series,
+    get_udise_areas,
+    normalize_series,
 )
 
 logger = logging.getLogger(__name__)
 
 DATASET_DIR = Path(__file__).resolve().parent.parent.parent / "dataset"
 CACHE_DIR = Path(__file__).resolve().parent.parent.parent / "dataset_cache"
-CACHE_FILE = CACHE_DIR / "city_description_cache.json"
+SECTION_CACHE_DIR = CACHE_DIR / "city_descriptions"  # one <section>.json per section
+HOSPITAL_CHUNK_ROWS = 50_000
 _NABH_FETCHER = NABHFetcher()
 _GEOGRAPHY_FETCHER = GeographyFetcher()
 
@@ -158,40 +184,10 @@ CITY_MAPPING: Dict[str, Dict[str, List[str]]] = {
 }
 
 
-def _normalize(value: str | None) -> str:
-    if not value:
-        return ""
-    value = value.strip().lower()
-    value = value.replace("&", " and ")
-    value = re.sub(r"[^a-z0-9 ]+", " ", value)
-    value = re.sub(r"\s+", " ", value)
-    return value.strip()
-
-
-def _compute_relevant_state_norms() -> Set[str]:
-    """Pre-compute the set of normalised state names we actually need."""
-    return {_normalize(city.get("state")) for city in INDIAN_CITIES_DATA if city.get("state")}
-
-
-_RELEVANT_STATE_NORMS: Set[str] = _compute_relevant_state_norms()
-
-
 def _city_key(city_name: str) -> str:
     return _normalize(city_name.replace("(", " ").replace(")", " "))
 
 
-def _as_int(value: str | None) -> int:
-    if value is None:
-        return 0
-    value = value.strip()
-    if not value or value == "0":
-        return 0
-    try:
-        return int(float(value))
-    except ValueError:
-        return 0
-
-
 def _safe_div(numerator: float, denominator: float) -> float:
     if not denominator:
         return 0.0
@@ -202,283 +198,229 @@ def _format_pct(value: float) -> str:
     return f"{value:.1f}%"
 
 
-def _dataset_paths(pattern: str) -> List[Path]:
-    return sorted(DATASET_DIR.glob(pattern))
-
-
-def _dataset_signature() -> Dict[str, Dict[str, int]]:
+def _file_signature(paths: List[Path]) -> Dict[str, Dict[str, int]]:
     signature: Dict[str, Dict[str, int]] = {}
-    for path in sorted(DATASET_DIR.glob("*.csv")):
+    for path in sorted(paths):
         stat = path.stat()
         signature[path.name] = {
             "size": int(stat.st_size),
             "mtime_ns": int(stat.st_mtime_ns),
         }
-    for path in sorted(DATASET_DIR.glob("*.pdf")):
-        stat = path.stat()
-        signature[f"pdf:{path.name}"] = {
-            "size": int(stat.st_size),
-            "mtime_ns": int(stat.st_mtime_ns),
-        }
     return signature
 
 
-def _sum_numeric_columns(row: Dict[str, str], excluded: Iterable[str]) -> int:
-    excluded_set = set(excluded)
-    return sum(_as_int(value) for key, value in row.items() if key not in excluded_set)
-
+def _source_signatures() -> Dict[str, Dict[str, Dict[str, int]]]:
+    """Signature of each dataset source group a cached section can depend on."""
+    pdfs = sorted(DATASET_DIR.glob("*.pdf"))
+    areas = _udise_areas()
+    return {
+        # UDISE is served from its artifact, so it contributes the signature
+        # of the raw files the artifact was built from (present on disk or not)
+        "udise": dict(areas.sources) if areas is not None else {},
+        "census": _file_signature([path for path in [DATASET_DIR / "Census.csv"] if path.exists()]),
+        "hospitals": _file_signature([path for path in [DATASET_DIR / "hospital_directory.csv"] if path.exists()]),
+        "crime_pdfs": _file_signature([path for path in pdfs if _classify_pdf(path.name) == "crime"]),
+        "religion_pdfs": _file_signature([path for path in pdfs if _classify_pdf(path.name) == "religion"]),
+    }
 
-def _count_non_zero_parts(value: str | None) -> int:
-    if not value or value == "0":
-        return 0
-    parts = [part.strip() for part in re.split(r"[,;/|]", value) if part.strip() and part.strip() != "0"]
-    return len(parts)
 
+# ---------------------------------------------------------------------------
+# Loaded datasets
+# ---------------------------------------------------------------------------
+#
+# Every loaded dataset, index and the description cache live in one
+# single-flight loader, filled lazily by _dataset(): concurrent first calls
+# for a dataset share one load, and loads of different datasets do not wait
+# for each other. A reload builds a complete new generation off to the side
+# and installs it in one step (install_datasets), so a request sees either
+# the old generation or the new one, never a mix.
 
-def _summarize_list_text(value: str | None, limit: int = 5) -> str:
-    if not value or value == "0":
-        return ""
-    cleaned = value.replace("\\n", "\n")
-    parts = [part.strip() for part in re.split(r"[\n,;/|]+", cleaned) if part.strip() and part.strip() != "0"]
-    if not parts:
-        return ""
-    trimmed = parts[:limit]
-    suffix = "..." if len(parts) > limit else ""
-    return ", ".join(trimmed) + suffix
+_DATASETS = SingleFlightLoader("city_evidence")
+_STAGING = threading.local()  # .datasets: generation being built by this thread
 
 
-def _parse_beds(value: str | None) -> int:
-    beds = _as_int(value)
-    return beds if 0 <= beds <= 5000 else 0
+def _dataset(name: str, load: Callable[[], Any]) -> Any:
+    staged = getattr(_STAGING, "datasets", None)
+    if staged is not None:  # private to this thread, no locking needed
+        if name not in staged:
+            staged[name] = load()
+        return staged[name]
+    return _DATASETS.get(name, load)
 
 
-def _rank_hospital(row: Dict[str, Any], aliases: List[str]) -> tuple:
-    text_blob = " ".join(
-        [
-            row["hospital_name"],
-            row["district"],
-            row["town"],
-            row["subtown"],
-            row["location"],
-            row["specialties"],
-            row["accreditation"],
-        ]
-    )
-    alias_hit = any(alias and alias in text_blob for alias in aliases)
-    specialty_count = _count_non_zero_parts(row["specialties"])
-    facility_count = _count_non_zero_parts(row["facilities"])
-    accreditation_score = 1 if row["accreditation"] and row["accreditation"] != "0" else 0
-    emergency_score = 1 if row["emergency_services"] and row["emergency_services"] != "0" else 0
-    beds = row["total_beds"]
-    return (
-        1 if alias_hit else 0,
-        accreditation_score,
-        emergency_score,
-        specialty_count,
-        facility_count,
-        beds,
-        row["hospital_name"],
-    )
+_CENSUS_COLUMNS = {"District": "district", "State": "state", "Literacy": "literacy"}
 
 
-@lru_cache(maxsize=1)
-def _load_census_rows() -> List[Dict[str, Any]]:
+def _read_census_frame() -> pd.DataFrame:
+    """Relevant-state census districts: district, district_norm, state, state_norm, literacy."""
     t0 = time.time()
     path = DATASET_DIR / "Census.csv"
-    rows: List[Dict[str, Any]] = []
-    with open(path, encoding="utf-8-sig", newline="") as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            district = row.get("District", "").strip()
-            state = row.get("State", "").strip()
-            state_norm = _normalize(state)
-            if state_norm not in _RELEVANT_STATE_NORMS:
-                continue
-            literacy = row.get("Literacy", "").strip()
-            rows.append(
-                {
-                    "district": district,
-                    "district_norm": _normalize(district),
-                    "state": state,
-                    "state_norm": state_norm,
-                    "literacy": float(literacy) if literacy else 0.0,
-                }
-            )
-    logger.info("Census: kept %d rows (%.1fs)", len(rows), time.time() - t0)
-    return rows
+    raw = pd.read_csv(
+        path,
+        usecols=lambda column: column in _CENSUS_COLUMNS,
+        dtype=str,
+        keep_default_na=False,
+        encoding="utf-8-sig",
+    )
+    for column in _CENSUS_COLUMNS:
+        if column not in raw:
+            raw[column] = ""
+    state_norm = normalize_series(raw["State"].str.strip())
+    keep = state_norm.isin(_RELEVANT_STATE_NORMS).to_numpy()
+    raw = raw.loc[keep]
+    district = raw["District"].str.strip()
+    literacy = pd.Series(pd.to_numeric(raw["Literacy"].str.strip(), errors="coerce"), dtype=np.float64)
+    frame = pd.DataFrame(
+        {
+            "district": district,
+            "district_norm": normalize_series(district),
+            "state": raw["State"].str.strip(),
+            "state_norm": state_norm[keep],
+            "literacy": literacy.fillna(0.0),
+        }
+    ).reset_index(drop=True)
+    logger.info("Census: kept %d rows (%.1fs)", len(frame), time.time() - t0)
+    return frame
+
+
+def _load_census_frame() -> pd.DataFrame:
+    return _dataset("census", _read_census_frame)
+
+
+_HOSPITAL_TEXT_COLUMNS = {
+    "Hospital_Name": "hospital_name",
+    "State": "state",
+    "District": "district",
+    "Hospital_Care_Type": "care_type",
+    "Discipline_Systems_of_Medicine": "medicine",
+    "Specialties": "specialties",
+    "Facilities": "facilities",
+    "Accreditation": "accreditation",
+    "Emergency_Services": "emergency_services",
+    "Website": "website",
+}
+_HOSPITAL_NORM_COLUMNS = {"District": "district_norm", "Town": "town", "Subtown": "subtown", "Location": "location"}
 
 
-@lru_cache(maxsize=1)
-def _load_hospital_rows() -> List[Dict[str, Any]]:
+def _read_hospital_frame() -> pd.DataFrame:
+    """Relevant-state hospitals as one column per field (compact to ship between processes)."""
     t0 = time.time()
     path = DATASET_DIR / "hospital_directory.csv"
-    rows: List[Dict[str, Any]] = []
+    columns = sorted({*_HOSPITAL_TEXT_COLUMNS, *_HOSPITAL_NORM_COLUMNS, "Total_Num_Beds"})
+    frames: List[pd.DataFrame] = []
     skipped = 0
-    with open(path, encoding="utf-8-sig", newline="") as file:
-        reader = csv.DictReader(file)
-        for raw in reader:
-            state_norm = _normalize(raw.get("State"))
-            if state_norm not in _RELEVANT_STATE_NORMS:
-                skipped += 1
-                continue
-            rows.append(
+    for chunk in pd.read_csv(
+        path,
+        usecols=lambda column: column in columns,
+        dtype=str,
+        keep_default_na=False,
+        encoding="utf-8-sig",
+        chunksize=HOSPITAL_CHUNK_ROWS,
+    ):
+        for column in columns:
+            if column not in chunk:
+                chunk[column] = ""
+        state_norm = normalize_series(chunk["State"])
+        keep = state_norm.isin(_RELEVANT_STATE_NORMS).to_numpy()
+        skipped += int((~keep).sum())
+        chunk = chunk[keep]
+        beds = as_int_series(chunk["Total_Num_Beds"])
+        frames.append(
+            pd.DataFrame(
                 {
-                    "hospital_name": (raw.get("Hospital_Name") or "").strip(),
-                    "state": (raw.get("State") or "").strip(),
-                    "state_norm": state_norm,
-                    "district": (raw.get("District") or "").strip(),
-                    "district_norm": _normalize(raw.get("District")),
-                    "town": _normalize(raw.get("Town")),
-                    "subtown": _normalize(raw.get("Subtown")),
-                    "location": _normalize(raw.get("Location")),
-                    "care_type": (raw.get("Hospital_Care_Type") or "").strip(),
-                    "medicine": (raw.get("Discipline_Systems_of_Medicine") or "").strip(),
-                    "specialties": (raw.get("Specialties") or "").strip(),
-                    "facilities": (raw.get("Facilities") or "").strip(),
-                    "accreditation": (raw.get("Accreditation") or "").strip(),
-                    "total_beds": _parse_beds(raw.get("Total_Num_Beds")),
-                    "emergency_services": (raw.get("Emergency_Services") or "").strip(),
-                    "website": (raw.get("Website") or "").strip(),
+                    **{field: chunk[column].str.strip() for column, field in _HOSPITAL_TEXT_COLUMNS.items()},
+                    "state_norm": state_norm[keep],
+                    **{field: normalize_series(chunk[column]) for column, field in _HOSPITAL_NORM_COLUMNS.items()},
+                    "total_beds": beds.where((beds >= 0) & (beds <= 5000), 0),
                 }
             )
+        )
+    frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
     logger.info(
         "Hospitals: kept %d rows, skipped %d irrelevant-state rows (%.1fs)",
-        len(rows), skipped, time.time() - t0,
-    )
-    return rows
-
-
-@lru_cache(maxsize=1)
-def _load_udise_teacher_map() -> Dict[str, Dict[str, int]]:
-    t0 = time.time()
-    relevant = _relevant_pseudocodes()
-    teacher_map: Dict[str, Dict[str, int]] = {}
-    skipped = 0
-    for path in _dataset_paths("*_tch.csv"):
-        with open(path, encoding="utf-8-sig", newline="") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                pseudocode = row.get("pseudocode", "").strip()
-                if not pseudocode or pseudocode not in relevant:
-                    skipped += 1
-                    continue
-                teacher_map[pseudocode] = {
-                    "total_teachers": _as_int(row.get("total_tch")),
-                    "female_teachers": _as_int(row.get("female")),
-                    "trained_teachers": _as_int(row.get("trained_comp")),
-                    "postgraduate_teachers": _as_int(row.get("post_graduate_and_above")),
-                }
-    logger.info(
-        "UDISE teachers: kept %d rows, skipped %d (%.1fs)",
-        len(teacher_map), skipped, time.time() - t0,
+        len(frame), skipped, time.time() - t0,
     )
-    return teacher_map
+    return frame
 
 
-@lru_cache(maxsize=1)
-def _load_udise_enrollment_map() -> Dict[str, Dict[str, int]]:
-    t0 = time.time()
-    relevant = _relevant_pseudocodes()
-    enrollment_map: Dict[str, Dict[str, int]] = defaultdict(
-        lambda: {
-            "social_enrollment_estimate": 0,
-            "minority_enrollment_estimate": 0,
-            "row_count": 0,
-        }
-    )
-    skipped = 0
-    for path in _dataset_paths("*_enr1.csv"):
-        with open(path, encoding="utf-8-sig", newline="") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                pseudocode = row.get("pseudocode", "").strip()
-                if not pseudocode or pseudocode not in relevant:
-                    skipped += 1
-                    continue
-                total = _sum_numeric_columns(row, {"pseudocode", "item_group", "item_id"})
-                item_group = row.get("item_group", "").strip()
-                if item_group == "1":
-                    enrollment_map[pseudocode]["social_enrollment_estimate"] += total
-                elif item_group == "5":
-                    enrollment_map[pseudocode]["minority_enrollment_estimate"] += total
-                enrollment_map[pseudocode]["row_count"] += 1
-    logger.info(
-        "UDISE enrollment: kept %d pseudocodes, skipped %d rows (%.1fs)",
-        len(enrollment_map), skipped, time.time() - t0,
-    )
-    return dict(enrollment_map)
+def _hospital_table() -> HospitalTable:
+    """Hospital directory as columns, indexed by district and by alias in town/subtown/location."""
+    return _dataset("hospitals", lambda: HospitalTable(_read_hospital_frame(), aliases=_alias_norms()))
 
 
-@lru_cache(maxsize=1)
-def _load_udise_profile_rows() -> List[Dict[str, Any]]:
-    t0 = time.time()
-    rows_by_pseudocode: Dict[str, Dict[str, Any]] = {}
-    skipped = 0
-    for path in _dataset_paths("*_prof1.csv"):
-        with open(path, encoding="utf-8-sig", newline="") as file:
-            reader = csv.DictReader(file)
-            for raw in reader:
-                state_norm = _normalize(raw.get("state"))
-                if state_norm not in _RELEVANT_STATE_NORMS:
-                    skipped += 1
-                    continue
-                pseudocode = (raw.get("pseudocode") or "").strip()
-                if not pseudocode:
-                    continue
-                rows_by_pseudocode[pseudocode] = {
-                    "pseudocode": pseudocode,
-                    "state": (raw.get("state") or "").strip(),
-                    "state_norm": state_norm,
-                    "district": (raw.get("district") or "").strip(),
-                    "district_norm": _normalize(raw.get("district")),
-                    "block_norm": _normalize(raw.get("block")),
-                    "ulb_norm": _normalize(raw.get("lgd_urban_local_body_name")),
-                    "rural_urban": (raw.get("rural_urban") or "").strip(),
-                    "minority_school": (raw.get("minority_school") or "").strip(),
-                    "pre_primary": (raw.get("pre_primary") or "").strip(),
-                    "approachable_road": (raw.get("approachable_road") or "").strip(),
-                    "special_school_for_cwsn": (raw.get("special_school_for_cwsn") or "").strip(),
-                    "resi_school": (raw.get("resi_school") or "").strip(),
-                    "school_category": (raw.get("school_category") or "").strip(),
-                    "school_type": (raw.get("school_type") or "").strip(),
-                }
-    rows = list(rows_by_pseudocode.values())
-    logger.info(
-        "UDISE profile: kept %d rows, skipped %d irrelevant-state rows (%.1fs)",
-        len(rows), skipped, time.time() - t0,
-    )
-    return rows
+def _alias_norms() -> List[str]:
+    return sorted({_normalize(alias) for mapping in CITY_MAPPING.values() for alias in mapping["city_aliases"]})
 
 
-@lru_cache(maxsize=1)
-def _relevant_pseudocodes() -> frozenset:
-    """Pseudocodes that matched our relevant states in the profile file."""
-    return frozenset(row["pseudocode"] for row in _load_udise_profile_rows())
+def _udise_areas() -> UdiseAreas | None:
+    return _dataset("udise_areas", get_udise_areas)
 
 
-@lru_cache(maxsize=1)
-def _udise_profile_by_state() -> Dict[str, List[Dict[str, Any]]]:
-    """Index profile rows by state_norm for O(1) state-level lookups."""
-    index: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for row in _load_udise_profile_rows():
-        index[row["state_norm"]].append(row)
-    return dict(index)
+def _build_udise_index(areas: UdiseAreas | None) -> RowIndex:
+    return RowIndex(
+        areas.records() if areas is not None else [],
+        text=lambda row: f"{row['ulb_norm']}|{row['block_norm']}",
+        aliases=_alias_norms(),
+    )
 
 
-@lru_cache(maxsize=1)
-def _hospital_by_state() -> Dict[str, List[Dict[str, Any]]]:
-    """Index hospital rows by state_norm for O(1) state-level lookups."""
-    index: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for row in _load_hospital_rows():
-        index[row["state_norm"]].append(row)
-    return dict(index)
+def _udise_index() -> RowIndex:
+    """UDISE area aggregates indexed by district and by alias in ULB/block names."""
+    return _dataset("udise_index", lambda: _build_udise_index(_udise_areas()))
 
 
-@lru_cache(maxsize=1)
-def _udise_scope_summary() -> Dict[str, List[str]]:
-    states = sorted({row["state"] for row in _load_udise_profile_rows() if row["state"]})
-    districts = sorted({row["district"] for row in _load_udise_profile_rows() if row["district"]})
-    return {"states": states, "districts": districts}
+def build_datasets(
+    hospitals: pd.DataFrame | None = None,
+    census: pd.DataFrame | None = None,
+    udise_rebuilt: bool = False,
+) -> Dict[str, Any]:
+    """
+    A generation of datasets from frames read elsewhere (e.g. a process pool),
+    with their indexes built; install it with install_datasets().
+
+    Datasets not passed in are carried over from the current generation.
+    """
+    datasets: Dict[str, Any] = {}
+    if udise_rebuilt:
+        get_udise_areas.cache_clear()
+        areas = get_udise_areas()
+        datasets["udise_areas"] = areas
+        datasets["udise_index"] = _build_udise_index(areas)
+    if hospitals is not None:
+        datasets["hospitals"] = HospitalTable(hospitals, aliases=_alias_norms())
+    if census is not None:
+        datasets["census"] = census
+    return datasets
+
+
+def install_datasets(
+    datasets: Dict[str, Any],
+    rebuild_descriptions: bool = False,
+    pdf_records: Dict[str, List[Dict[str, Any]]] | None = None,
+) -> None:
+    """
+    Make *datasets* current, replacing only the names they contain.
+
+    With rebuild_descriptions, the description cache is rebuilt from the new
+    generation (only sections whose sources changed) before anything is
+    swapped in, so descriptions and datasets change together. *pdf_records*
+    (from pdf_evidence_service.parse_pdf_evidence) are staged and installed
+    alongside.
+    """
+    staged = {**_DATASETS.values(), **datasets}
+    if rebuild_descriptions:
+        staged.pop("descriptions", None)
+        _STAGING.datasets = staged
+        try:
+            with staged_pdf_evidence(pdf_records):
+                _description_fragments()
+                _udise_index()
+                _hospital_table()
+        finally:
+            _STAGING.datasets = None
+    if pdf_records is not None:
+        install_pdf_evidence(pdf_records)
+    _DATASETS.replace(staged)
 
 
 def _get_mapping(city_name: str, state: str) -> Dict[str, Any]:
@@ -496,56 +438,27 @@ def _get_mapping(city_name: str, state: str) -> Dict[str, Any]:
     }
 
 
-def _district_label(mapping: Dict[str, Any], rows: List[Dict[str, Any]]) -> str:
-    districts = sorted({row["district"] for row in rows if row.get("district")})
+def _district_label(mapping: Dict[str, Any], names: Iterable[str]) -> str:
+    districts = sorted({name for name in names if name})
     if districts:
         return ", ".join(districts[:2])
     return ", ".join(mapping["districts"]) or mapping["city_name"]
 
 
-def _match_profile_rows(mapping: Dict[str, Any]) -> List[Dict[str, Any]]:
-    district_rows: List[Dict[str, Any]] = []
-    alias_rows: List[Dict[str, Any]] = []
-    state_rows = _udise_profile_by_state().get(mapping["state_norm"], [])
-    for row in state_rows:
-        district_hit = row["district_norm"] in mapping["districts"]
-        alias_hit = any(
-            alias and (alias in row["ulb_norm"] or alias in row["block_norm"])
-            for alias in mapping["city_aliases"]
-        )
-        if district_hit:
-            district_rows.append(row)
-        elif alias_hit:
-            alias_rows.append(row)
-    return district_rows if district_rows else alias_rows
-
-
-def _match_hospital_rows(mapping: Dict[str, Any]) -> List[Dict[str, Any]]:
-    district_rows: List[Dict[str, Any]] = []
-    alias_rows: List[Dict[str, Any]] = []
-    state_rows = _hospital_by_state().get(mapping["state_norm"], [])
-    for row in state_rows:
-        district_hit = row["district_norm"] in mapping["districts"]
-        alias_hit = any(
-            alias and alias in " ".join([row["town"], row["subtown"], row["location"]])
-            for alias in mapping["city_aliases"]
-        )
-        if district_hit:
-            district_rows.append(row)
-        elif alias_hit:
-            alias_rows.append(row)
-    return district_rows if district_rows else alias_rows
+def _match_udise_areas(mapping: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return _udise_index().match(mapping["state_norm"], mapping["districts"], mapping["city_aliases"])
+
+
+def _match_hospital_ids(mapping: Dict[str, Any]) -> np.ndarray:
+    return _hospital_table().match(mapping["state_norm"], mapping["districts"], mapping["city_aliases"])
 
 
 def _build_education_section(city_name: str, state: str) -> Dict[str, Any]:
     mapping = _get_mapping(city_name, state)
-    profile_rows = _match_profile_rows(mapping)
-    teacher_map = _load_udise_teacher_map()
-    enrollment_map = _load_udise_enrollment_map()
+    area_rows = _match_udise_areas(mapping)
     city_record = get_city_by_name(city_name) or {}
-    udise_scope = _udise_scope_summary()
 
-    school_count = len(profile_rows)
+    school_count = sum(row["schools"] for row in area_rows)
     if not school_count:
         return {
             "score": 6,
@@ -569,37 +482,18 @@ def _build_education_section(city_name: str, state: str) -> Dict[str, Any]:
             ],
         }
 
-    total_teachers = 0
-    female_teachers = 0
-    trained_teachers = 0
-    postgraduate_teachers = 0
-    total_students = 0
-    minority_students = 0
-    urban_schools = 0
-    minority_schools = 0
-    pre_primary_schools = 0
-    approachable_schools = 0
-
-    for row in profile_rows:
-        pseudocode = row["pseudocode"]
-        teacher = teacher_map.get(pseudocode, {})
-        enrollment = enrollment_map.get(pseudocode, {})
-        total_teachers += teacher.get("total_teachers", 0)
-        female_teachers += teacher.get("female_teachers", 0)
-        trained_teachers += teacher.get("trained_teachers", 0)
-        postgraduate_teachers += teacher.get("postgraduate_teachers", 0)
-        total_students += enrollment.get("social_enrollment_estimate", 0)
-        minority_students += enrollment.get("minority_enrollment_estimate", 0)
-        urban_schools += 1 if row["rural_urban"] == "2" else 0
-        minority_schools += 1 if row["minority_school"] == "1" else 0
-        pre_primary_schools += 1 if row["pre_primary"] == "1" else 0
-        approachable_schools += 1 if row["approachable_road"] == "1" else 0
+    total_teachers = sum(row["total_teachers"] for row in area_rows)
+    female_teachers = sum(row["female_teachers"] for row in area_rows)
+    trained_teachers = sum(row["trained_teachers"] for row in area_rows)
+    urban_schools = sum(row["urban_schools"] for row in area_rows)
+    pre_primary_schools = sum(row["pre_primary_schools"] for row in area_rows)
+    approachable_schools = sum(row["approachable_schools"] for row in area_rows)
 
     urban_pct = _safe_div(urban_schools * 100, school_count)
     trained_pct = _safe_div(trained_teachers * 100, total_teachers)
     female_teacher_pct = _safe_div(female_teachers * 100, total_teachers)
     avg_teachers_per_school = _safe_div(total_teachers, school_count)
-    district_label = _district_label(mapping, profile_rows)
+    district_label = _district_label(mapping, [str(row.get("district") or "") for row in area_rows])
     education_score = round(city_record.get("profession_availability", {}).get("Education", 60) / 10)
 
     return {
@@ -630,11 +524,11 @@ def _build_education_section(city_name: str, state: str) -> Dict[str, Any]:
 
 def _build_hospitals_section(city_name: str, state: str) -> Dict[str, Any]:
     mapping = _get_mapping(city_name, state)
-    hospital_rows = _match_hospital_rows(mapping)
+    table = _hospital_table()
+    hospital_ids = _match_hospital_ids(mapping)
     city_record = get_city_by_name(city_name) or {}
-    district_label = _district_label(mapping, hospital_rows)
 
-    if not hospital_rows:
+    if not len(hospital_ids):
         fallback_score = round(city_record.get("healthcare_score", 60) / 10) or 6
         return {
             "score": max(1, min(10, fallback_score)),
@@ -660,27 +554,23 @@ def _build_hospitals_section(city_name: str, state: str) -> Dict[str, Any]:
             ],
         }
 
-    total_hospitals = len(hospital_rows)
-    allopathic_count = sum(1 for row in hospital_rows if "allopathic" in row["medicine"].lower())
-    emergency_count = sum(1 for row in hospital_rows if row["emergency_services"] and row["emergency_services"] != "0")
-    accredited_count = sum(1 for row in hospital_rows if row["accreditation"] and row["accreditation"] != "0")
-    known_beds_rows = [row for row in hospital_rows if row["total_beds"] > 0]
-    total_known_beds = sum(row["total_beds"] for row in known_beds_rows)
-    avg_beds = _safe_div(total_known_beds, len(known_beds_rows))
-    top_hospitals = sorted(
-        hospital_rows,
-        key=lambda row: _rank_hospital(row, mapping["city_aliases"]),
-        reverse=True,
-    )[:3]
+    stats = table.stats(hospital_ids)
+    total_hospitals = stats.total
+    allopathic_count = stats.allopathic
+    emergency_count = stats.emergency
+    accredited_count = stats.accredited
+    avg_beds = _safe_div(stats.known_beds_total, stats.known_beds_rows)
 
     facilities = []
-    for row in top_hospitals:
-        detail_parts = [row["hospital_name"]]
-        if row["medicine"] and row["medicine"] != "0":
-            detail_parts.append(row["medicine"])
-        if row["total_beds"] > 0:
-            detail_parts.append(f"{row['total_beds']} beds")
-        summarized_specialties = _summarize_list_text(row["specialties"])
+    for row_id in table.top(hospital_ids, mapping["city_aliases"], k=3):
+        medicine = table.medicine[row_id]
+        beds = int(table.beds[row_id])
+        detail_parts = [table.name[row_id]]
+        if medicine and medicine != "0":
+            detail_parts.append(medicine)
+        if beds > 0:
+            detail_parts.append(f"{beds} beds")
+        summarized_specialties = _summarize_list_text(table.specialties[row_id])
         if summarized_specialties:
             detail_parts.append(f"specialties: {summarized_specialties}")
         facilities.append(" - ".join([detail_parts[0], ", ".join(detail_parts[1:])]) if len(detail_parts) > 1 else detail_parts[0])
@@ -704,7 +594,7 @@ def _build_hospitals_section(city_name: str, state: str) -> Dict[str, Any]:
             f"{accredited_count:,} facilities carry formal accreditation, "
             "which is a reliable indicator of quality care."
         )
-    if known_beds_rows and avg_beds > 0:
+    if stats.known_beds_rows and avg_beds > 0:
         desc_parts.append(
             f"Among those reporting bed capacity, the average is {avg_beds:.0f} beds per facility."
         )
@@ -775,10 +665,8 @@ def _build_live_hospitals_section(city_name: str, state: str) -> Dict[str, Any]
     if lat is None or lon is None:
         return None
 
-    try:
-        rows = _NABH_FETCHER.fetch(city_name=city_name, state=state, lat=lat, lon=lon)
-    except Exception:
-        return None
+    # Fetch errors propagate, so the live cache retries this section soon
+    rows = _NABH_FETCHER.fetch(city_name=city_name, state=state, lat=lat, lon=lon)
 
     if not rows:
         return None
@@ -839,10 +727,7 @@ def _build_live_geography_section(city_name: str, state: str) -> Dict[str, Any]
     if lat is None or lon is None:
         return None
 
-    try:
-        rows = _GEOGRAPHY_FETCHER.fetch(city_name=city_name, state=state, lat=lat, lon=lon)
-    except Exception:
-        return None
+    rows = _GEOGRAPHY_FETCHER.fetch(city_name=city_name, state=state, lat=lat, lon=lon)
 
     if not rows:
         return None
@@ -929,15 +814,17 @@ def _build_live_geography_section(city_name: str, state: str) -> Dict[str, Any]
 
 def _build_communities_section(city_name: str, state: str) -> Dict[str, Any]:
     mapping = _get_mapping(city_name, state)
-    census_rows = [
-        row
-        for row in _load_census_rows()
-        if row["state_norm"] == mapping["state_norm"] and row["district_norm"] in mapping["districts"]
+    census = _load_census_frame()
+    census = census.loc[
+        (census["state_norm"] == mapping["state_norm"]) & census["district_norm"].isin(mapping["districts"])
     ]
-    profile_rows = _match_profile_rows(mapping)
-    district_label = _district_label(mapping, census_rows or profile_rows)
+    area_rows = _match_udise_areas(mapping)
+    census_names: List[str] = census["district"].tolist()
+    district_label = _district_label(
+        mapping, census_names or [str(row.get("district") or "") for row in area_rows]
+    )
 
-    if not census_rows:
+    if census.empty:
         religion_only = get_religion_snippet_for_district(state, mapping["districts"])
         if religion_only:
             return {
@@ -983,9 +870,9 @@ def _build_communities_section(city_name: str, state: str) -> Dict[str, Any]:
             ],
         }
 
-    literacy = sum(row["literacy"] for row in census_rows) / len(census_rows)
-    school_count = len(profile_rows)
-    urban_schools = sum(1 for row in profile_rows if row["rural_urban"] == "2")
+    literacy = float(census["literacy"].to_numpy(dtype=np.float64).mean())
+    school_count = sum(row["schools"] for row in area_rows)
+    urban_schools = sum(row["urban_schools"] for row in area_rows)
     urban_pct = _safe_div(urban_schools * 100, school_count) if school_count else 0.0
 
     religion_snip = get_religion_snippet_for_district(state, mapping["districts"])
@@ -1071,39 +958,44 @@ def _nearest_metro_for(city_name: str) -> str:
     return _NEAREST_METRO.get(key, city_name)
 
 
-def _build_generic_sections(city_name: str, state: str, has_children: bool, has_elderly: bool) -> Dict[str, Any]:
-    city_record = get_city_by_name(city_name) or {}
-    nearest_metro = {"city_name": "Pending AI connectivity", "distance_km": 0.0}
-    aqi = city_record.get("current_aqi")
-    avg_rent = city_record.get("avg_rent")
-
+def _family_note(has_children: bool, has_elderly: bool) -> str:
     family_notes = []
     if has_children:
         family_notes.append("family context includes children")
     if has_elderly:
         family_notes.append("family context includes elderly members")
-    family_note = ", ".join(family_notes) if family_notes else "general relocation context"
+    return ", ".join(family_notes) if family_notes else "general relocation context"
 
+
+def _build_generic_crime_section(city_name: str, has_children: bool, has_elderly: bool) -> Dict[str, Any]:
+    family_note = _family_note(has_children, has_elderly)
     children_sentence = " It's especially important for families with children to look at NCRB city rankings and local police helpline responsiveness." if has_children else ""
     elderly_sentence = " For families with elderly members, check the prevalence of hospitals with emergency services, which can be more critical than general crime rates." if has_elderly else ""
 
     return {
-        "crime_rate": {
-            "security_score": 6,
-            "description": (
-                f"{city_name} is a mid-sized to large Indian city where, like most urban centres, safety varies by neighbourhood. "
-                "We recommend checking the latest NCRB city-specific reports and speaking with existing residents or your future housing society "
-                f"for a clear picture of local safety.{children_sentence}{elderly_sentence}"
-            ),
-            "key_factors": [
-                "Visit the NCRB website for the latest city-level crime statistics.",
-                "Gated communities, housing societies, and well-lit areas generally offer better safety.",
-                f"Safety considerations for your family ({family_note}) should guide neighbourhood selection.",
-            ],
-            "sources": [
-                "National Crime Records Bureau (NCRB) — City-wise Crime in India",
-            ],
-        },
+        "security_score": 6,
+        "description": (
+            f"{city_name} is a mid-sized to large Indian city where, like most urban centres, safety varies by neighbourhood. "
+            "We recommend checking the latest NCRB city-specific reports and speaking with existing residents or your future housing society "
+            f"for a clear picture of local safety.{children_sentence}{elderly_sentence}"
+        ),
+        "key_factors": [
+            "Visit the NCRB website for the latest city-level crime statistics.",
+            "Gated communities, housing societies, and well-lit areas generally offer better safety.",
+            f"Safety considerations for your family ({family_note}) should guide neighbourhood selection.",
+        ],
+        "sources": [
+            "National Crime Records Bureau (NCRB) — City-wise Crime in India",
+        ],
+    }
+
+
+def _build_generic_sections(city_name: str, state: str) -> Dict[str, Any]:
+    city_record = get_city_by_name(city_name) or {}
+    aqi = city_record.get("current_aqi")
+    avg_rent = city_record.get("avg_rent")
+
+    return {
         "connectivity": {
             "nearest_metro": _nearest_metro_for(city_name),
             "distance_km": 0.0,
@@ -1149,117 +1041,214 @@ def _build_generic_sections(city_name: str, state: str, has_children: bool, has_
     }
 
 
-def _build_uncached_city_description(
+# Cache key per family context; only the crime section's text depends on it
+FAMILY_VARIANTS: Dict[tuple, str] = {
+    (False, False): "general",
+    (True, False): "children",
+    (False, True): "elderly",
+    (True, True): "children_elderly",
+}
+CACHE_VERSION = 3
+
+# Source groups (see _source_signatures) each cached section is built from.
+# A change to a group rebuilds only the sections listing it; sections with
+# no dataset dependency are rebuilt only when CACHE_VERSION changes.
+SECTION_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "crime_rate": ("crime_pdfs",),
+    "education": ("udise",),
+    "communities": ("udise", "census", "religion_pdfs"),
+    "connectivity": (),
+    "hospitals": ("hospitals",),
+    "geography": (),
+}
+_VARIANT_SECTIONS = ("crime_rate",)  # cached as {variant: section}
+
+
+def _build_crime_section(
     city_name: str,
     state: str,
-    has_children: bool = False,
-    has_elderly: bool = False,
+    district_norms: List[str],
+    has_children: bool,
+    has_elderly: bool,
 ) -> Dict[str, Any]:
-    generic_sections = _build_generic_sections(city_name, state, has_children, has_elderly)
-    family_notes: List[str] = []
-    if has_children:
-        family_notes.append("family context includes children")
-    if has_elderly:
-        family_notes.append("family context includes elderly members")
-    family_note = ", ".join(family_notes) if family_notes else "general relocation context"
+    family_note = _family_note(has_children, has_elderly)
+    crime_from_pdf = get_crime_section_for_city(city_name, state, district_norms, family_note)
+    return crime_from_pdf or _build_generic_crime_section(city_name, has_children, has_elderly)
+
+
+def _build_crime_variants(city_name: str, state: str) -> Dict[str, Dict[str, Any]]:
     mapping = _get_mapping(city_name, state)
-    crime_from_pdf = get_crime_section_for_city(
-        city_name, state, mapping["districts"], family_note
-    )
-    crime_rate = crime_from_pdf or generic_sections["crime_rate"]
     return {
-        "city_name": city_name,
-        "state": state,
-        "generated": True,
-        "crime_rate": crime_rate,
-        "education": _build_education_section(city_name, state),
-        "communities": _build_communities_section(city_name, state),
-        "connectivity": generic_sections["connectivity"],
-        "hospitals": _build_hospitals_section(city_name, state),
-        "geography": generic_sections["geography"],
+        variant: _build_crime_section(city_name, state, mapping["districts"], has_children, has_elderly)
+        for (has_children, has_elderly), variant in FAMILY_VARIANTS.items()
     }
 
 
-@lru_cache(maxsize=1)
-def _load_cached_city_descriptions() -> Dict[str, Dict[str, Any]]:
-    current_signature = _dataset_signature()
-    if CACHE_FILE.exists():
-        with open(CACHE_FILE, encoding="utf-8") as file:
+_SECTION_BUILDERS: Dict[str, Callable[[str, str], Any]] = {
+    "crime_rate": _build_crime_variants,
+    "education": _build_education_section,
+    "communities": _build_communities_section,
+    "connectivity": lambda city_name, state: _build_generic_sections(city_name, state)["connectivity"],
+    "hospitals": _build_hospitals_section,
+    "geography": lambda city_name, state: _build_generic_sections(city_name, state)["geography"],
+}
+
+
+def _entry_from_sections(sections: Dict[str, Any]) -> Dict[str, Any]:
+    """{"shared": ..., "variants": ...} cache entry from one city's built sections."""
+    return {
+        "shared": {name: data for name, data in sections.items() if name not in _VARIANT_SECTIONS},
+        "variants": {
+            variant: {name: sections[name][variant] for name in _VARIANT_SECTIONS}
+            for variant in FAMILY_VARIANTS.values()
+        },
+    }
+
+
+def _build_city_description_entry(city_name: str, state: str) -> Dict[str, Any]:
+    """All family variants of one city's description, built from scratch."""
+    return _entry_from_sections({name: build(city_name, state) for name, build in _SECTION_BUILDERS.items()})
+
+
+def _load_or_build_section(
+    name: str,
+    signatures: Dict[str, Dict[str, Dict[str, int]]],
+    cities: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """City key → cached data for one section, rebuilt only if its sources changed."""
+    path = SECTION_CACHE_DIR / f"{name}.json"
+    signature = {group: signatures[group] for group in SECTION_DEPENDENCIES[name]}
+    city_keys = {_city_key(city["city_name"]) for city in cities}
+    if path.exists():
+        with open(path, encoding="utf-8") as file:
             payload = json.load(file)
-        if payload.get("signature") == current_signature:
-            return payload.get("cities", {})
-
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    cities_payload: Dict[str, Dict[str, Any]] = {}
-    for city in get_all_cities():
-        description = _build_uncached_city_description(
-            city_name=city["city_name"],
-            state=city["state"],
-            has_children=False,
-            has_elderly=False,
-        )
-        cities_payload[_city_key(city["city_name"])] = description
+        if (
+            payload.get("version") == CACHE_VERSION
+            and payload.get("signature") == signature
+            and set(payload.get("cities", {})) == city_keys
+        ):
+            return payload["cities"]
 
-    with open(CACHE_FILE, "w", encoding="utf-8") as file:
+    t0 = time.time()
+    build = _SECTION_BUILDERS[name]
+    section_payload = {
+        _city_key(city["city_name"]): build(city["city_name"], city["state"])
+        for city in cities
+    }
+    SECTION_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
         json.dump(
             {
-                "signature": current_signature,
-                "cities": cities_payload,
+                "version": CACHE_VERSION,
+                "signature": signature,
+                "cities": section_payload,
             },
             file,
             ensure_ascii=True,
         )
-    return cities_payload
+    tmp_path.replace(path)
+    logger.info("Rebuilt cached %s section for %d cities (%.1fs)", name, len(section_payload), time.time() - t0)
+    return section_payload
+
+
+def _load_cached_city_descriptions() -> Dict[str, Dict[str, Any]]:
+    signatures = _source_signatures()
+    cities = get_all_cities()
+    sections = {name: _load_or_build_section(name, signatures, cities) for name in _SECTION_BUILDERS}
+    return {
+        key: _entry_from_sections({name: sections[name][key] for name in _SECTION_BUILDERS})
+        for key in (_city_key(city["city_name"]) for city in cities)
+    }
 
 
-def warm_city_description_cache() -> Dict[str, Dict[str, Any]]:
+def _description_fragments() -> Dict[str, DescriptionFragments]:
+    """Persisted descriptions as read-only, pre-serialized section fragments."""
+    return _dataset(
+        "descriptions",
+        lambda: {key: freeze_entry(entry) for key, entry in _load_cached_city_descriptions().items()},
+    )
+
+
+def warm_city_description_cache() -> Dict[str, DescriptionFragments]:
     """Build or load the persisted city description cache."""
-    return _load_cached_city_descriptions()
+    return _description_fragments()
 
 
-def _enrich_with_live_sections(result: Dict[str, Any], city_name: str, state: str, language: str = "en") -> None:
-    """Best-effort enrichment with live external data; never blocks on failure."""
-    import concurrent.futures
+def _fetch_live_connectivity(city_name: str, state: str, language: str) -> Dict[str, Any] | None:
+    city_record = get_city_by_name(city_name) or {}
+    lat = city_record.get("latitude")
+    lon = city_record.get("longitude")
+    if lat is None or lon is None:
+        return None
+    return get_live_connectivity(city_name, state, float(lat), float(lon), language=language)
 
-    def _fetch_hospitals():
-        return _build_live_hospitals_section(city_name, state)
 
-    def _fetch_geography():
-        return _build_live_geography_section(city_name, state)
+# App-wide, cached per city (hospitals, geography) or per (city, language)
+# (connectivity); see live_enrichment
+LIVE_SECTIONS = LiveEnrichment(
+    {
+        "hospitals": lambda city_name, state, language: _build_live_hospitals_section(city_name, state),
+        "geography": lambda city_name, state, language: _build_live_geography_section(city_name, state),
+        "connectivity": _fetch_live_connectivity,
+    },
+    language_independent=("hospitals", "geography"),
+)
 
-    def _fetch_connectivity():
-        city_record = get_city_by_name(city_name) or {}
-        lat = city_record.get("latitude")
-        lon = city_record.get("longitude")
-        if lat is None or lon is None:
-            return None
-        return get_live_connectivity(city_name, state, float(lat), float(lon), language=language)
 
-    _LIVE_TIMEOUT = 15
+def _cached_sections(city_name: str, state: str, has_children: bool, has_elderly: bool) -> Dict[str, bytes]:
+    """Section fragments for the family variant, by reference; safe to overlay."""
+    fragments = _description_fragments().get(_city_key(city_name))
+    if fragments is None:
+        fragments = freeze_entry(_build_city_description_entry(city_name, state))
+    return fragments.select(FAMILY_VARIANTS[(bool(has_children), bool(has_elderly))])
 
-    t0 = time.time()
-    pool = concurrent.futures.ThreadPoolExecutor(max_workers=3)
-    fut_hosp = pool.submit(_fetch_hospitals)
-    fut_geo = pool.submit(_fetch_geography)
-    fut_conn = pool.submit(_fetch_connectivity)
-
-    for label, fut, key in [
-        ("hospitals", fut_hosp, "hospitals"),
-        ("geography", fut_geo, "geography"),
-        ("connectivity", fut_conn, "connectivity"),
-    ]:
-        remaining = max(0.1, _LIVE_TIMEOUT - (time.time() - t0))
+
+def _live_fragments(city_name: str, state: str, language: str) -> Iterator[Tuple[str, bytes]]:
+    """Serialized live sections as they become ready; ill-fitting ones are dropped."""
+    for name, data in LIVE_SECTIONS.stream(city_name, state, language=language):
         try:
-            data = fut.result(timeout=remaining)
-            if data:
-                result[key] = data
-        except concurrent.futures.TimeoutError:
-            logger.warning("Live %s timed out for %s", label, city_name)
-            fut.cancel()
-        except Exception as exc:
-            logger.warning("Live %s failed for %s: %s", label, city_name, exc)
+            yield name, serialize_section(name, data)
+        except ValidationError as exc:
+            logger.warning("Live %s for %s does not fit the response model: %s", name, city_name, exc)
+
+
+def render_city_description(
+    city_name: str,
+    state: str,
+    has_children: bool = False,
+    has_elderly: bool = False,
+    language: str = "en",
+) -> bytes:
+    """
+    CityDescriptionResponse JSON body for one city and family variant.
 
-    pool.shutdown(wait=False, cancel_futures=True)
+    Cached section fragments are spliced in by reference; only the live
+    sections that replace them are serialized per request.
+    """
+    sections = _cached_sections(city_name, state, has_children, has_elderly)
+    sections.update(_live_fragments(city_name, state, language))
+    return compose_description(city_name, state, sections)
+
+
+def stream_city_description(
+    city_name: str,
+    state: str,
+    has_children: bool = False,
+    has_elderly: bool = False,
+    language: str = "en",
+) -> Iterator[bytes]:
+    """
+    The same description as SSE frames: every cached section at once, then
+    each live section as soon as its source finishes.
+    """
+    yield meta_event(city_name, state)
+    sections = _cached_sections(city_name, state, has_children, has_elderly)
+    for name in SECTION_MODELS:
+        yield section_event(name, sections[name])
+    for name, fragment in _live_fragments(city_name, state, language):
+        yield section_event(name, fragment)
+    yield DONE_EVENT
 
 
 def build_city_description_from_local_evidence(
@@ -1269,19 +1258,4 @@ def build_city_description_from_local_evidence(
     has_elderly: bool = False,
     language: str = "en",
 ) -> Dict[str, Any]:
-    cached = _load_cached_city_descriptions().get(_city_key(city_name))
-    if cached:
-        result = deepcopy(cached)
-        result["city_name"] = city_name
-        result["state"] = state
-        _enrich_with_live_sections(result, city_name, state, language=language)
-        return result
-
-    result = _build_uncached_city_description(
-        city_name=city_name,
-        state=state,
-        has_children=has_children,
-        has_elderly=has_elderly,
-    )
-    _enrich_with_live_sections(result, city_name, state, language=language)
-    return result
+    return json.loads(render_city_description(city_name, state, has_children, has_elderly, language))
@@ -0,0 +1,259 @@
+"""
+Parallel warm-up of the local evidence datasets for शहर AI.
+
+The dataset readers are CPU-bound CSV parsing, so at startup they are run in
+a process pool instead of one after another on first use:
+
+    udise_profile ──┬──► udise_teachers   ──┐
+                    └──► udise_enrollment ──┴──► UDISE area artifact
+    hospitals
+    census
+
+Teacher and enrolment reads need the profile's pseudocodes, so they start
+as soon as the profile read finishes; everything else starts immediately.
+Workers return column-oriented frames, not lists of row dicts, and the
+parent hands them to the lazy loaders in city_evidence_service. UDISE is
+only re-read when its artifact is missing or stale.
+
+Wall-clock warm-up is therefore roughly the longest dependency chain rather
+than the sum of all reads; a per-dataset timing report is logged.
+
+rebuild_datasets() reuses the same reads for a running server (see
+dataset_watcher): only changed files are re-read, and the new datasets and
+the descriptions built from them are swapped in together.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 4
+
+
+class WarmupTask(NamedTuple):
+    name: str
+    fn: Callable[..., Any]  # module-level, so it can be sent to a worker
+    deps: Tuple[str, ...] = ()
+    args: Optional[Callable[[Dict[str, Any]], Tuple[Any, ...]]] = None  # dep results → fn args (parent side)
+
+
+class TaskTiming(NamedTuple):
+    name: str
+    seconds: float
+    size: int  # rows / entries in the result
+
+
+def _result_size(result: Any) -> int:
+    try:
+        return len(result)
+    except TypeError:
+        return 0
+
+
+def _timed_call(fn: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def run_tasks(
+    tasks: List[WarmupTask],
+    workers: int = MAX_WORKERS,
+) -> Tuple[Dict[str, Any], Dict[str, TaskTiming]]:
+    """
+    Run *tasks* respecting their deps; each starts as soon as its deps are done.
+
+    With workers <= 1 everything runs in-process in dependency order. A task
+    whose dependency failed is skipped; failures are logged, not raised.
+    """
+    by_name = {task.name: task for task in tasks}
+    unknown = {dep for task in tasks for dep in task.deps} - set(by_name)
+    if unknown:
+        raise ValueError(f"unknown warm-up dependencies: {sorted(unknown)}")
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, TaskTiming] = {}
+    failed: set[str] = set()
+    waiting = list(tasks)
+
+    def _ready() -> List[WarmupTask]:
+        ready = [task for task in waiting if all(dep in results or dep in failed for dep in task.deps)]
+        for task in ready:
+            waiting.remove(task)
+        return ready
+
+    def _args(task: WarmupTask) -> Tuple[Any, ...]:
+        return task.args(results) if task.args is not None else ()
+
+    def _finish(task: WarmupTask, outcome: Callable[[], Tuple[Any, float]]) -> None:
+        try:
+            result, seconds = outcome()
+        except Exception as exc:
+            failed.add(task.name)
+            logger.error("Warm-up of %s failed: %s", task.name, exc, exc_info=True)
+            return
+        results[task.name] = result
+        timings[task.name] = TaskTiming(task.name, seconds, _result_size(result))
+
+    def _skip_failed_deps(ready: List[WarmupTask]) -> List[WarmupTask]:
+        runnable = []
+        for task in ready:
+            if any(dep in failed for dep in task.deps):
+                failed.add(task.name)
+                logger.warning("Skipping warm-up of %s: a dependency failed", task.name)
+            else:
+                runnable.append(task)
+        return runnable
+
+    if workers <= 1:
+        while waiting:
+            ready = _ready()
+            if not ready:
+                raise ValueError(f"warm-up dependency cycle among {[task.name for task in waiting]}")
+            for task in _skip_failed_deps(ready):
+                _finish(task, lambda task=task: _timed_call(task.fn, _args(task)))
+        return results, timings
+
+    # Not forked from the server: rebuilds run while its threads hold locks.
+    # A fork server starts workers faster than spawn where the platform has one.
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method)) as pool:
+        in_flight: Dict[Future, WarmupTask] = {}
+        while waiting or in_flight:
+            for task in _skip_failed_deps(_ready()):
+                in_flight[pool.submit(_timed_call, task.fn, _args(task))] = task
+            if not in_flight:
+                if waiting:
+                    raise ValueError(f"warm-up dependency cycle among {[task.name for task in waiting]}")
+                continue
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                _finish(in_flight.pop(future), future.result)
+    return results, timings
+
+
+def _log_report(timings: Dict[str, TaskTiming], wall_seconds: float) -> None:
+    serial = sum(timing.seconds for timing in timings.values())
+    for timing in sorted(timings.values(), key=lambda t: -t.seconds):
+        logger.info("  %-18s %7.2fs  %9d rows", timing.name, timing.seconds, timing.size)
+    logger.info("Dataset warm-up: %.2fs wall-clock for %.2fs of loading", wall_seconds, serial)
+
+
+def _read_datasets(
+    workers: Optional[int] = None,
+    changed: Optional[Set[str]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, TaskTiming], bool]:
+    """
+    Read datasets in the process pool: (results by task, timings, udise_rebuilt).
+
+    With *changed* (file names under DATASET_DIR), only the hospital and
+    census files listed are re-read; UDISE is re-read whenever its artifact
+    is stale either way.
+    """
+    from app.services import city_evidence_service, udise_artifacts
+
+    tasks = []
+    if changed is None or "hospital_directory.csv" in changed:
+        tasks.append(WarmupTask("hospitals", city_evidence_service._read_hospital_frame))
+    if changed is None or "Census.csv" in changed:
+        tasks.append(WarmupTask("census", city_evidence_service._read_census_frame))
+    dataset_dir, artifact = udise_artifacts.DATASET_DIR, udise_artifacts.ARTIFACT_FILE
+    udise_sources: Dict[str, Dict[str, int]] = {}
+    if not udise_artifacts.artifact_is_current(dataset_dir, artifact):
+        udise_sources = udise_artifacts.raw_signature(dataset_dir)
+        tasks += [
+            WarmupTask("udise_profile", udise_artifacts.read_profile_frame, args=lambda results: (dataset_dir,)),
+            WarmupTask(
+                "udise_teachers",
+                udise_artifacts.read_teacher_frame,
+                deps=("udise_profile",),
+                args=lambda results: (results["udise_profile"].index, dataset_dir),
+            ),
+            WarmupTask(
+                "udise_enrollment",
+                udise_artifacts.read_enrollment_frame,
+                deps=("udise_profile",),
+                args=lambda results: (results["udise_profile"].index, dataset_dir),
+            ),
+        ]
+    if not tasks:
+        return {}, {}, False
+
+    if workers is None:
+        workers = int(os.getenv("WARM_STARTUP_WORKERS") or min(MAX_WORKERS, os.cpu_count() or 1))
+    results, timings = run_tasks(tasks, workers=min(workers, len(tasks)))
+
+    udise_rebuilt = bool(udise_sources) and all(
+        name in results for name in ("udise_profile", "udise_teachers", "udise_enrollment")
+    )
+    if udise_rebuilt:
+        udise_artifacts.write_artifact(
+            udise_sources,
+            results["udise_profile"],
+            results["udise_teachers"],
+            results["udise_enrollment"],
+            artifact,
+        )
+    return results, timings, udise_rebuilt
+
+
+def warm_datasets(workers: Optional[int] = None) -> Dict[str, TaskTiming]:
+    """Load every local evidence dataset in parallel and install them in the service."""
+    from app.services import city_evidence_service
+
+    started = time.perf_counter()
+    results, timings, udise_rebuilt = _read_datasets(workers)
+    city_evidence_service.install_datasets(
+        city_evidence_service.build_datasets(
+            hospitals=results.get("hospitals"),
+            census=results.get("census"),
+            udise_rebuilt=udise_rebuilt,
+        )
+    )
+    _log_report(timings, time.perf_counter() - started)
+    return timings
+
+
+def rebuild_datasets(
+    changed: Optional[Set[str]] = None,
+    progress: Callable[[str], None] = lambda step: None,
+    workers: Optional[int] = None,
+) -> Dict[str, TaskTiming]:
+    """
+    Reload what *changed* (all datasets if None) while the current generation
+    keeps serving, then swap in datasets and descriptions together.
+
+    *progress* is called with the name of each step as it starts.
+    """
+    from app.services import city_evidence_service, district_evidence, pdf_evidence_service
+
+    started = time.perf_counter()
+    progress("reading datasets")
+    results, timings, udise_rebuilt = _read_datasets(workers, changed)
+
+    progress("building indexes")
+    datasets = city_evidence_service.build_datasets(
+        hospitals=results.get("hospitals"),
+        census=results.get("census"),
+        udise_rebuilt=udise_rebuilt,
+    )
+
+    pdf_records = None
+    if changed is None or any(name.lower().endswith(".pdf") for name in changed):
+        progress("parsing PDFs")
+        pdf_records = pdf_evidence_service.parse_pdf_evidence()
+
+    progress("rebuilding descriptions")
+    city_evidence_service.install_datasets(datasets, rebuild_descriptions=True, pdf_records=pdf_records)
+
+    progress("district evidence")
+    district_evidence.ensure_district_evidence()
+    _log_report(timings, time.perf_counter() - started)
+    return timings
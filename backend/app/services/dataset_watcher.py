@@ -0,0 +1,259 @@
+"""
+Watch the evidence dataset directory and reload it without a restart.
+
+DATASET_DIR is polled every DATASET_WATCH_INTERVAL seconds (file names,
+sizes and mtimes; no extra dependency). A change starts a debounce window:
+the rebuild begins only once the directory has been quiet for
+DATASET_WATCH_DEBOUNCE seconds, so a multi-file copy triggers one rebuild.
+
+The rebuild itself (dataset_warmup.rebuild_datasets) runs on a background
+thread: file reads go to the warm-up process pool, indexes and the
+description cache are built off to the side, and the new generation is
+swapped in at once. Requests keep being served from the old generation
+until then. Changes that land during a rebuild start another one afterwards.
+
+Progress and history are exposed through status() for the admin endpoint.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 30.0
+DEFAULT_DEBOUNCE_SECONDS = 10.0
+_HISTORY = 10  # finished rebuilds kept for status()
+
+Snapshot = Dict[str, Tuple[int, int]]  # file name → (size, mtime_ns)
+Rebuild = Callable[[Optional[Set[str]], Callable[[str], None]], Any]  # (changed, progress)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def snapshot_directory(directory: Path) -> Snapshot:
+    """Name, size and mtime of every file directly under *directory*."""
+    snapshot: Snapshot = {}
+    if not directory.is_dir():
+        return snapshot
+    for path in directory.iterdir():
+        try:
+            stat = path.stat()
+        except OSError:  # removed while listing
+            continue
+        if path.is_file():
+            snapshot[path.name] = (int(stat.st_size), int(stat.st_mtime_ns))
+    return snapshot
+
+
+def changed_files(before: Snapshot, after: Snapshot) -> Set[str]:
+    """Files added, removed or modified between two snapshots."""
+    return {name for name in before.keys() | after.keys() if before.get(name) != after.get(name)}
+
+
+class DatasetWatcher:
+    """Polls a directory, debounces changes and runs one rebuild at a time."""
+
+    def __init__(
+        self,
+        directory: Path,
+        rebuild: Rebuild,
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+        debounce: float = DEFAULT_DEBOUNCE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.directory = directory
+        self.interval = interval
+        self.debounce = debounce
+        self._rebuild = rebuild
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._snapshot: Snapshot = snapshot_directory(directory)
+        self._pending: Set[str] = set()
+        self._quiet_since: Optional[float] = None
+        self._rebuilding: Optional[threading.Thread] = None
+        self._current: Optional[Dict[str, Any]] = None
+        self._history: List[Dict[str, Any]] = []
+        self.generation = 0
+
+    # -- polling --------------------------------------------------------------
+
+    def poll(self) -> bool:
+        """
+        Check the directory once; start a rebuild if changes have settled.
+
+        Returns True if a rebuild was started.
+        """
+        snapshot = snapshot_directory(self.directory)
+        now = self._clock()
+        with self._lock:
+            changed = changed_files(self._snapshot, snapshot)
+            self._snapshot = snapshot
+            if changed:
+                self._pending |= changed
+                self._quiet_since = now
+                logger.info("Dataset change detected: %s", ", ".join(sorted(changed)))
+                return False
+            if not self._pending or self._rebuilding is not None:
+                return False
+            if now - (self._quiet_since or now) < self.debounce:
+                return False
+            changed, self._pending = self._pending, set()
+        return self.trigger(changed, reason="file change")
+
+    def trigger(self, changed: Optional[Set[str]] = None, reason: str = "manual") -> bool:
+        """Start a rebuild of *changed* (everything if None) unless one is running."""
+        with self._lock:
+            if self._rebuilding is not None:
+                if changed:
+                    self._pending |= changed
+                return False
+            self._current = {
+                "reason": reason,
+                "changed": sorted(changed) if changed is not None else None,
+                "started_at": _now_iso(),
+                "step": None,
+                "steps": [],
+            }
+            thread = threading.Thread(
+                target=self._run, args=(changed, self._current), name="dataset-rebuild", daemon=True
+            )
+            self._rebuilding = thread
+        thread.start()
+        return True
+
+    def _run(self, changed: Optional[Set[str]], record: Dict[str, Any]) -> None:
+        started = self._clock()
+        step_started = [started]
+
+        def progress(step: str) -> None:
+            now = self._clock()
+            with self._lock:
+                if record["step"] is not None:
+                    record["steps"].append({"step": record["step"], "seconds": round(now - step_started[0], 2)})
+                record["step"] = step
+                step_started[0] = now
+            logger.info("Dataset rebuild: %s", step)
+
+        error: Optional[str] = None
+        try:
+            self._rebuild(changed, progress)
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            logger.error("Dataset rebuild failed: %s", exc, exc_info=True)
+        finally:
+            progress("done")
+            with self._lock:
+                record["step"] = None
+                record["finished_at"] = _now_iso()
+                record["seconds"] = round(self._clock() - started, 2)
+                record["error"] = error
+                if error is None:
+                    self.generation += 1
+                self._history = [record, *self._history][:_HISTORY]
+                self._current = None
+                self._rebuilding = None
+                self._quiet_since = self._clock()  # changes seen meanwhile still get debounced
+
+    # -- background thread ----------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="dataset-watcher", daemon=True)
+        self._thread.start()
+        logger.info("Watching %s for dataset changes every %.0fs", self.directory, self.interval)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as exc:
+                logger.error("Dataset watcher poll failed: %s", exc, exc_info=True)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no rebuild is running; False on timeout."""
+        with self._lock:
+            thread = self._rebuilding
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    # -- status ---------------------------------------------------------------
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._rebuilding is not None:
+                state = "rebuilding"
+            elif self._pending:
+                state = "pending"
+            else:
+                state = "idle"
+            current = None
+            if self._current is not None:
+                current = {**self._current, "steps": list(self._current["steps"])}
+            return {
+                "state": state,
+                "watching": self._thread is not None,
+                "directory": str(self.directory),
+                "interval_seconds": self.interval,
+                "debounce_seconds": self.debounce,
+                "files": len(self._snapshot),
+                "pending_changes": sorted(self._pending),
+                "generation": self.generation,
+                "current": current,
+                "history": [dict(record) for record in self._history],
+            }
+
+
+# ---------------------------------------------------------------------------
+# App-wide watcher
+# ---------------------------------------------------------------------------
+
+_WATCHER: Optional[DatasetWatcher] = None
+
+
+def get_watcher() -> DatasetWatcher:
+    """The app's watcher over the evidence DATASET_DIR (created on first use, not started)."""
+    global _WATCHER
+    if _WATCHER is None:
+        from app.services.dataset_warmup import rebuild_datasets
+        from app.services.udise_artifacts import DATASET_DIR
+
+        _WATCHER = DatasetWatcher(
+            DATASET_DIR,
+            rebuild=lambda changed, progress: rebuild_datasets(changed, progress),
+            interval=float(os.getenv("DATASET_WATCH_INTERVAL", DEFAULT_INTERVAL_SECONDS)),
+            debounce=float(os.getenv("DATASET_WATCH_DEBOUNCE", DEFAULT_DEBOUNCE_SECONDS)),
+        )
+    return _WATCHER
+
+
+def start_dataset_watcher() -> None:
+    """Start polling unless DATASET_WATCH_INTERVAL is 0."""
+    watcher = get_watcher()
+    if watcher.interval > 0:
+        watcher.start()
+
+
+def stop_dataset_watcher() -> None:
+    if _WATCHER is not None:
+        _WATCHER.stop()
@@ -0,0 +1,112 @@
+"""
+Pre-serialized city description sections.
+
+Cached descriptions are held as one JSON fragment per section, validated
+against the response models once when the cache is loaded. A response is
+composed by picking fragment references for the requested family variant,
+serializing only the live sections that replace them, and splicing the
+fragments into the body — no copy of the cached sections is ever made, and
+the bytes in the cache cannot be mutated by a request.
+
+The same fragments are framed as server-sent events for the streaming
+variant of the description endpoint.
+"""
+
+from __future__ import annotations
+
+import json
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Type
+
+from pydantic import BaseModel
+
+from app.models.schemas import (
+    Communities,
+    Connectivity,
+    CrimeRate,
+    Education,
+    Geography,
+    Hospitals,
+)
+
+# Response order of the sections after city_name / state / generated
+SECTION_MODELS: Dict[str, Type[BaseModel]] = {
+    "crime_rate": CrimeRate,
+    "education": Education,
+    "communities": Communities,
+    "connectivity": Connectivity,
+    "hospitals": Hospitals,
+    "geography": Geography,
+}
+
+
+def serialize_section(name: str, data: Dict[str, Any]) -> bytes:
+    """Validate *data* against the section's response model and dump it as JSON."""
+    return SECTION_MODELS[name].model_validate(data).model_dump_json().encode("utf-8")
+
+
+class DescriptionFragments(NamedTuple):
+    shared: Mapping[str, bytes]  # section → fragment, same for every variant
+    variants: Mapping[str, Mapping[str, bytes]]  # variant → section → fragment
+
+    def select(self, variant: str) -> Dict[str, bytes]:
+        """Fragments for one variant; a fresh dict of references, safe to overlay."""
+        return {**self.shared, **self.variants[variant]}
+
+
+def freeze_entry(entry: Dict[str, Any]) -> DescriptionFragments:
+    """Serialize a {"shared": ..., "variants": ...} cache entry into read-only fragments."""
+    return DescriptionFragments(
+        shared=MappingProxyType({
+            name: serialize_section(name, data) for name, data in entry["shared"].items()
+        }),
+        variants=MappingProxyType({
+            variant: MappingProxyType({
+                name: serialize_section(name, data) for name, data in sections.items()
+            })
+            for variant, sections in entry["variants"].items()
+        }),
+    )
+
+
+def _header_parts(city_name: str, state: str) -> List[bytes]:
+    return [
+        b'{"city_name":', json.dumps(city_name).encode("utf-8"),
+        b',"state":', json.dumps(state).encode("utf-8"),
+        b',"generated":true',
+    ]
+
+
+def compose_description(city_name: str, state: str, sections: Mapping[str, bytes]) -> bytes:
+    """Splice section fragments into a CityDescriptionResponse JSON body."""
+    parts = _header_parts(city_name, state)
+    for name in SECTION_MODELS:
+        parts += [b',"', name.encode("ascii"), b'":', sections[name]]
+    parts.append(b"}")
+    return b"".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Server-sent events
+# ---------------------------------------------------------------------------
+#
+#   event: meta     data: {"city_name": ..., "state": ..., "generated": true}
+#   event: section  data: {"name": "<section>", "data": <section fragment>}
+#   event: done     data: {}
+#
+# A section may be sent twice: first from the cache, then its live version.
+
+def sse_event(event: str, data: bytes) -> bytes:
+    """One SSE frame; *data* must be single-line JSON."""
+    return b"event: " + event.encode("ascii") + b"\ndata: " + data + b"\n\n"
+
+
+def meta_event(city_name: str, state: str) -> bytes:
+    return sse_event("meta", b"".join(_header_parts(city_name, state)) + b"}")
+
+
+def section_event(name: str, fragment: bytes) -> bytes:
+    return sse_event("section", b'{"name":"' + name.encode("ascii") + b'","data":' + fragment + b"}")
+
+
+DONE_EVENT = sse_event("done", b"{}")
@@ -0,0 +1,444 @@
+"""
+District evidence for every loaded district, precomputed into SQLite.
+
+City descriptions only cover the registry cities, but the loaded datasets
+hold every district of the registry states. This job aggregates them once
+per district:
+
+  - education: UDISE+ school and teacher totals
+  - hospitals: hospital directory counts, bed capacity and top facilities
+  - communities: census literacy, UDISE+ enrolment estimates, religion shares
+
+Each district's evidence is validated against DistrictEvidenceResponse and
+stored as its finished JSON body, keyed by normalised (state, district) and
+indexed by LGD district code, so serving a district is one indexed read.
+
+LGD codes come from the district list shipped with the datasets
+(dataset/district-lgd-codes.csv, from lgdirectory.gov.in), matched on
+normalised state and district name; districts without a code can still be
+looked up by name.
+
+The store records the signature of the sources it was built from and is
+rebuilt by ensure_district_evidence() when they change.
+
+Usage (from backend/):
+    python -m app.services.district_evidence
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.models.schemas import DistrictEvidenceResponse
+from app.services.city_data import INDIAN_CITIES_DATA
+from app.services.hospital_table import HospitalTable, _summarize_list_text
+from app.services.udise_artifacts import AREA_FIELDS, AREA_KEYS, UdiseAreas, _normalize
+
+logger = logging.getLogger(__name__)
+
+DATASET_DIR = Path(__file__).resolve().parent.parent.parent / "dataset"
+CACHE_DIR = Path(__file__).resolve().parent.parent.parent / "dataset_cache"
+DB_FILE = CACHE_DIR / "district_evidence.sqlite3"
+LGD_DIRECTORY_FILE = DATASET_DIR / "district-lgd-codes.csv"
+STORE_VERSION = 1
+TOP_FACILITIES = 3
+
+DistrictKey = Tuple[str, str]  # (state_norm, district_norm)
+
+_SCHEMA = """
+CREATE TABLE districts (
+    state_norm TEXT NOT NULL,
+    district_norm TEXT NOT NULL,
+    lgd_code INTEGER,
+    body TEXT NOT NULL,
+    PRIMARY KEY (state_norm, district_norm)
+) WITHOUT ROWID;
+
+CREATE UNIQUE INDEX districts_by_lgd_code ON districts (lgd_code);
+
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_SOURCES = {
+    "education": "Ministry of Education — UDISE+ (Unified District Information System for Education)",
+    "hospitals": "National Health Portal — Hospital Directory",
+    "census": "Office of the Registrar General of India — Census Data",
+    "religion": "Office of the Registrar General of India — Census Religion Data",
+}
+
+
+def _pct(part: float, whole: float) -> float:
+    return round(part * 100 / whole, 1) if whole else 0.0
+
+
+# ---------------------------------------------------------------------------
+# LGD district directory
+# ---------------------------------------------------------------------------
+
+def _find_column(columns: Dict[str, str], *prefixes: str, exclude: Tuple[str, ...] = ()) -> Optional[str]:
+    """The first header (by prefix order) starting with a prefix and containing none of *exclude*."""
+    for prefix in prefixes:
+        for norm, name in columns.items():
+            if norm.startswith(prefix) and not any(word in norm for word in exclude):
+                return name
+    return None
+
+
+def read_lgd_directory(path: Path = LGD_DIRECTORY_FILE) -> Dict[DistrictKey, int]:
+    """LGD district code per normalised (state, district) name; empty without the file."""
+    if not path.exists():
+        return {}
+    codes: Dict[DistrictKey, int] = {}
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        reader = csv.DictReader(file)
+        columns = {_normalize(name): name for name in reader.fieldnames or []}
+        # Exports name these "State Name (In English)", "state_name", "State", ...
+        state = _find_column(columns, "state name", "state", exclude=("code",))
+        district = _find_column(columns, "district name", "district", exclude=("code", "lgd"))
+        code = _find_column(
+            columns, "district lgd code", "district code", "lgd district code", "lgd code", "lgd", "code",
+            exclude=("state",),
+        )
+        if not (state and district and code):
+            logger.warning("LGD directory %s lacks state / district name / LGD code columns", path)
+            return {}
+        for row in reader:
+            try:
+                value = int(str(row.get(code) or "").strip())
+            except ValueError:
+                continue
+            codes[(_normalize(row.get(state)), _normalize(row.get(district)))] = value
+    logger.info("LGD directory: %d district codes", len(codes))
+    return codes
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+def _education_by_district(areas: Optional[UdiseAreas]) -> Tuple[Dict[DistrictKey, Dict[str, int]], Dict[DistrictKey, str]]:
+    """UDISE area totals summed per district, and the raw district names."""
+    if areas is None or not len(areas):
+        return {}, {}
+    keys = pd.DataFrame(areas.keys, columns=list(AREA_KEYS))
+    counts = pd.DataFrame(areas.counts, columns=list(AREA_FIELDS)).astype(np.int64)
+    group = [keys["state_norm"], keys["district_norm"]]
+    totals = pd.DataFrame(counts.groupby(group, sort=False).sum())
+    names = pd.DataFrame(keys[["district"]].groupby(group, sort=False).first())
+    return (
+        {
+            (str(state_norm), str(district_norm)): dict(zip(AREA_FIELDS, map(int, row)))
+            for (state_norm, district_norm), row in zip(totals.index, totals.to_numpy())
+        },
+        {
+            (str(state_norm), str(district_norm)): str(name)
+            for (state_norm, district_norm), name in zip(names.index, names["district"])
+        },
+    )
+
+
+def _education(totals: Dict[str, int]) -> Optional[Dict[str, Any]]:
+    schools = totals["schools"]
+    if not schools:
+        return None
+    teachers = totals["total_teachers"]
+    return {
+        **{field: totals[field] for field in AREA_FIELDS if not field.endswith("_enrollment_estimate")},
+        "urban_pct": _pct(totals["urban_schools"], schools),
+        "trained_pct": _pct(totals["trained_teachers"], teachers),
+        "female_teacher_pct": _pct(totals["female_teachers"], teachers),
+        "teachers_per_school": round(teachers / schools, 1),
+    }
+
+
+def _hospitals(table: HospitalTable, ids: np.ndarray) -> Dict[str, Any]:
+    stats = table.stats(ids)
+    facilities = []
+    for row_id in table.top(ids, (), k=TOP_FACILITIES):
+        medicine = table.medicine[row_id]
+        facilities.append({
+            "name": table.name[row_id],
+            "medicine": medicine if medicine != "0" else "",
+            "beds": int(table.beds[row_id]),
+            "specialties": _summarize_list_text(table.specialties[row_id]),
+        })
+    return {
+        "total": stats.total,
+        "allopathic": stats.allopathic,
+        "emergency": stats.emergency,
+        "accredited": stats.accredited,
+        "average_beds": round(stats.known_beds_total / stats.known_beds_rows, 1) if stats.known_beds_rows else None,
+        "top_facilities": facilities,
+    }
+
+
+def aggregate_districts(
+    areas: Optional[UdiseAreas],
+    hospitals: Optional[HospitalTable],
+    census: Optional[pd.DataFrame],
+    lgd_codes: Dict[DistrictKey, int],
+    state_names: Dict[str, str],
+    religion: Callable[[str, str], Optional[str]] = lambda state, district_norm: None,
+) -> Dict[DistrictKey, Dict[str, Any]]:
+    """
+    Evidence for every district found in any of the datasets, keyed by
+    (state_norm, district_norm), shaped like DistrictEvidenceResponse.
+
+    *religion* maps (state name, district_norm) to a religion-shares snippet.
+    """
+    education, names = _education_by_district(areas)
+
+    hospital_ids: Dict[DistrictKey, np.ndarray] = {}
+    if hospitals is not None:
+        for key, ids in hospitals.index.district_ids().items():
+            hospital_ids[key] = np.asarray(ids, dtype=np.int64)
+            names.setdefault(key, hospitals.district[ids[0]])
+
+    literacy: Dict[DistrictKey, List[float]] = defaultdict(list)
+    if census is not None:
+        for state_norm, district_norm, district, rate in zip(
+            census["state_norm"], census["district_norm"], census["district"], census["literacy"]
+        ):
+            key = (state_norm, district_norm)
+            literacy[key].append(float(rate))
+            names[key] = district  # census spelling wins
+
+    evidence: Dict[DistrictKey, Dict[str, Any]] = {}
+    used_codes: Dict[int, DistrictKey] = {}
+    for key in sorted(education.keys() | hospital_ids.keys() | literacy.keys()):
+        state_norm, district_norm = key
+        if not district_norm:
+            continue
+        state = state_names.get(state_norm, state_norm.title())
+        code = lgd_codes.get(key)
+        if code is not None and code in used_codes:
+            logger.warning("LGD code %d matches both %s and %s; keeping the first", code, used_codes[code], key)
+            code = None
+        if code is not None:
+            used_codes[code] = key
+
+        record: Dict[str, Any] = {
+            "lgd_code": code,
+            "state": state,
+            "district": names.get(key) or district_norm.title(),
+            "hospitals": None,
+            "sources": [],
+        }
+        totals = education.get(key)
+        record["education"] = _education(totals) if totals else None
+        if record["education"]:
+            record["sources"].append(_SOURCES["education"])
+        if hospitals is not None and key in hospital_ids:
+            record["hospitals"] = _hospitals(hospitals, hospital_ids[key])
+            record["sources"].append(_SOURCES["hospitals"])
+
+        communities: Dict[str, Any] = {}
+        if literacy.get(key):
+            communities["literacy"] = round(sum(literacy[key]) / len(literacy[key]), 2)
+            record["sources"].append(_SOURCES["census"])
+        if totals and (totals["social_enrollment_estimate"] or totals["minority_enrollment_estimate"]):
+            communities["social_enrollment_estimate"] = totals["social_enrollment_estimate"]
+            communities["minority_enrollment_estimate"] = totals["minority_enrollment_estimate"]
+            if _SOURCES["education"] not in record["sources"]:
+                record["sources"].append(_SOURCES["education"])
+        snippet = religion(state, district_norm)
+        if snippet:
+            communities["religion"] = snippet
+            record["sources"].append(_SOURCES["religion"])
+        record["communities"] = communities or None
+
+        evidence[key] = record
+    return evidence
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+def write_store(
+    evidence: Dict[DistrictKey, Dict[str, Any]],
+    path: Path = DB_FILE,
+    sources: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Write a fresh store beside *path* and move it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    conn = sqlite3.connect(str(tmp_path))
+    try:
+        with conn:
+            conn.executescript(_SCHEMA)
+            conn.executemany(
+                "INSERT INTO districts (state_norm, district_norm, lgd_code, body) VALUES (?, ?, ?, ?)",
+                (
+                    (state_norm, district_norm, record["lgd_code"],
+                     DistrictEvidenceResponse.model_validate(record).model_dump_json())
+                    for (state_norm, district_norm), record in evidence.items()
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("version", str(STORE_VERSION)),
+                    ("built_at", str(int(time.time()))),
+                    ("sources", json.dumps(sources or {}, sort_keys=True)),
+                ],
+            )
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+
+class DistrictEvidenceStore:
+    """Read-only view of a built store; reopens when the file is replaced."""
+
+    def __init__(self, path: Path = DB_FILE) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            stat = None
+        stamp = (stat.st_ino, stat.st_mtime_ns) if stat is not None else None
+        if stamp != self._stamp:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            if stamp is not None:
+                self._conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+            self._stamp = stamp
+        return self._conn
+
+    def _fetch(self, query: str, params: Tuple[Any, ...]) -> Optional[Any]:
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            row = conn.execute(query, params).fetchone()
+        return row[0] if row else None
+
+    def is_built(self) -> bool:
+        with self._lock:
+            return self._connection() is not None
+
+    def by_lgd_code(self, lgd_code: int) -> Optional[bytes]:
+        """The district's JSON body, or None."""
+        body = self._fetch("SELECT body FROM districts WHERE lgd_code = ?", (lgd_code,))
+        return body.encode("utf-8") if body is not None else None
+
+    def by_name(self, state: str, district: str) -> Optional[bytes]:
+        body = self._fetch(
+            "SELECT body FROM districts WHERE state_norm = ? AND district_norm = ?",
+            (_normalize(state), _normalize(district)),
+        )
+        return body.encode("utf-8") if body is not None else None
+
+    def sources(self) -> Optional[Dict[str, Any]]:
+        """Signature the store was built from, or None if there is no current-version store."""
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        if meta.get("version") != str(STORE_VERSION):
+            return None
+        return json.loads(meta.get("sources", "{}"))
+
+
+_STORE: Optional[DistrictEvidenceStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> DistrictEvidenceStore:
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = DistrictEvidenceStore(DB_FILE)
+    return _STORE
+
+
+# ---------------------------------------------------------------------------
+# Build job
+# ---------------------------------------------------------------------------
+
+def _state_names() -> Dict[str, str]:
+    return {_normalize(city["state"]): city["state"] for city in INDIAN_CITIES_DATA if city.get("state")}
+
+
+def _source_signature() -> Dict[str, Any]:
+    from app.services import city_evidence_service
+
+    groups = city_evidence_service._source_signatures()
+    signature = {name: groups[name] for name in ("udise", "census", "hospitals", "religion_pdfs")}
+    lgd = [LGD_DIRECTORY_FILE] if LGD_DIRECTORY_FILE.exists() else []
+    signature["lgd"] = city_evidence_service._file_signature(lgd)
+    return signature
+
+
+def build_district_evidence(path: Path = DB_FILE) -> int:
+    """Aggregate the currently loaded datasets into the store; returns the district count."""
+    from app.services import city_evidence_service
+    from app.services.pdf_evidence_service import get_religion_snippet_for_district
+
+    t0 = time.time()
+    signature = _source_signature()
+    evidence = aggregate_districts(
+        city_evidence_service._udise_areas(),
+        city_evidence_service._hospital_table(),
+        city_evidence_service._load_census_frame(),
+        read_lgd_directory(),
+        _state_names(),
+        religion=lambda state, district_norm: get_religion_snippet_for_district(state, [district_norm]),
+    )
+    write_store(evidence, path, signature)
+    coded = sum(1 for record in evidence.values() if record["lgd_code"] is not None)
+    logger.info(
+        "District evidence: %d districts (%d with LGD codes) in %.1fs → %s",
+        len(evidence), coded, time.time() - t0, path,
+    )
+    return len(evidence)
+
+
+def ensure_district_evidence() -> bool:
+    """Rebuild the shared store if it is missing or its sources changed; True if rebuilt."""
+    store = get_store()
+    if store.sources() == _source_signature():
+        return False
+    build_district_evidence(store.path)
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Precompute per-district evidence into SQLite.")
+    parser.add_argument("--out", type=Path, default=DB_FILE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s  %(name)s  %(message)s")
+    count = build_district_evidence(args.out)
+    print(f"{count} districts, {os.path.getsize(args.out):,} bytes → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Row indexes for matching evidence dataset rows to cities.
+
+Rows (UDISE areas, hospitals) are matched to a city by district name, or,
+if none of the city's districts appear, by any city alias occurring in the
+row's place-name text. Instead of re-testing every alias against every row
+of the state per section build, each dataset is indexed once at load:
+
+  - (state_norm, district_norm) → row ids
+  - (state_norm, alias) → row ids, found with one Aho-Corasick pass per row
+    over all known aliases
+
+Aliases outside the prebuilt set (cities not in CITY_MAPPING) are scanned
+for once per state and then memoised in the same index.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Set, Tuple
+
+
+class AliasAutomaton:
+    """Aho-Corasick automaton reporting which patterns occur in a text."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[str]] = [set()]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._link()
+
+    def _add(self, pattern: str) -> None:
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            node = nxt
+        self._out[node].add(pattern)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] |= self._out[self._fail[child]]
+
+    def find(self, text: str) -> Set[str]:
+        found: Set[str] = set()
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            if self._out[node]:
+                found |= self._out[node]
+        return found
+
+
+class RowIndex:
+    """
+    District and alias index over one dataset's rows.
+
+    *text* builds the place-name string an alias must occur in; use a
+    separator that cannot appear in normalised names (e.g. "|") to keep
+    aliases from matching across fields. Columnar datasets are indexed with
+    from_columns() and only support match_ids().
+    """
+
+    def __init__(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        text: Callable[[Dict[str, Any]], str],
+        aliases: Iterable[str],
+    ) -> None:
+        self.rows = rows
+        self._build(
+            [row["state_norm"] for row in rows],
+            [row["district_norm"] for row in rows],
+            lambda row_id: text(rows[row_id]),
+            aliases,
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        states: Sequence[str],
+        districts: Sequence[str],
+        text: Callable[[int], str],
+        aliases: Iterable[str],
+    ) -> "RowIndex":
+        """Index parallel state/district columns; *text* maps a row id to its place text."""
+        index = cls.__new__(cls)
+        index.rows = None
+        index._build(states, districts, text, aliases)
+        return index
+
+    def _build(
+        self,
+        states: Sequence[str],
+        districts: Sequence[str],
+        text: Callable[[int], str],
+        aliases: Iterable[str],
+    ) -> None:
+        self._text = text
+        self._lock = threading.Lock()
+        self._by_state: Dict[str, List[int]] = defaultdict(list)
+        self._district: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._alias: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._known_aliases: Set[str] = {alias for alias in aliases if alias}
+
+        automaton = AliasAutomaton(self._known_aliases)
+        for row_id, (state, district) in enumerate(zip(states, districts)):
+            self._by_state[state].append(row_id)
+            self._district[(state, district)].append(row_id)
+            for alias in automaton.find(text(row_id)):
+                self._alias[(state, alias)].append(row_id)
+        self._scanned: Set[Tuple[str, str]] = set()
+
+    def _alias_ids(self, state: str, alias: str) -> List[int]:
+        key = (state, alias)
+        if alias not in self._known_aliases and key not in self._scanned:
+            with self._lock:
+                if key not in self._scanned:
+                    self._alias[key] = [
+                        row_id for row_id in self._by_state.get(state, ())
+                        if alias in self._text(row_id)
+                    ]
+                    self._scanned.add(key)
+        return self._alias.get(key, [])
+
+    def match_ids(self, state: str, districts: Iterable[str], aliases: Iterable[str]) -> List[int]:
+        """Row ids in the city's districts, else rows mentioning an alias; in row order."""
+        ids: Set[int] = set()
+        for district in districts:
+            ids.update(self._district.get((state, district), ()))
+        if not ids:
+            for alias in aliases:
+                if alias:
+                    ids.update(self._alias_ids(state, alias))
+        return sorted(ids)
+
+    def district_ids(self) -> Dict[Tuple[str, str], List[int]]:
+        """Row ids per (state, district) key, in row order."""
+        return dict(self._district)
+
+    def match(self, state: str, districts: Iterable[str], aliases: Iterable[str]) -> List[Dict[str, Any]]:
+        return [self.rows[row_id] for row_id in self.match_ids(state, districts, aliases)]
@@ -0,0 +1,185 @@
+"""
+Columnar hospital directory for the city evidence layer.
+
+Hospitals are held as parallel columns instead of one dict per row. Only the
+text needed for the section (name, discipline, specialties, district) is
+kept, as plain lists of str read one row at a time; everything the ranking
+reads is reduced at load to numpy arrays:
+
+  - accreditation / emergency / allopathic flags
+  - specialty and facility counts, bed counts
+  - one packed int64 "static score" ordering rows by
+    (accredited, emergency, specialties, facilities, beds, name)
+
+Ranking a city's hospitals is then one vectorized pass over its matched row
+ids: add the per-city alias bit on top of the static score, partition out
+the top k, and sort only those.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Set
+
+import numpy as np
+import pandas as pd
+
+from app.services.evidence_index import AliasAutomaton, RowIndex
+
+
+def _count_non_zero_parts(value: str | None) -> int:
+    if not value or value == "0":
+        return 0
+    parts = [part.strip() for part in re.split(r"[,;/|]", value) if part.strip() and part.strip() != "0"]
+    return len(parts)
+
+
+def _summarize_list_text(value: str | None, limit: int = 5) -> str:
+    if not value or value == "0":
+        return ""
+    cleaned = value.replace("\\n", "\n")
+    parts = [part.strip() for part in re.split(r"[\n,;/|]+", cleaned) if part.strip() and part.strip() != "0"]
+    if not parts:
+        return ""
+    trimmed = parts[:limit]
+    suffix = "..." if len(parts) > limit else ""
+    return ", ".join(trimmed) + suffix
+
+
+def _flag(values: pd.Series) -> np.ndarray:
+    return ((values != "") & (values != "0")).to_numpy(dtype=bool)
+
+
+class HospitalStats(NamedTuple):
+    total: int
+    allopathic: int
+    emergency: int
+    accredited: int
+    known_beds_rows: int
+    known_beds_total: int
+
+
+class HospitalTable:
+    """Struct-of-arrays hospital directory with a district/alias index."""
+
+    def __init__(self, frame: pd.DataFrame, aliases: Iterable[str] = ()) -> None:
+        """*frame* is city_evidence_service._read_hospital_frame() output."""
+        n = len(frame)
+
+        def column(name: str) -> pd.Series:
+            return pd.Series(frame[name]) if name in frame else pd.Series([""] * n, dtype=object)
+
+        def text(name: str) -> List[str]:
+            return [str(value) for value in column(name).tolist()]
+
+        self.name = text("hospital_name")
+        self.district = text("district")
+        self.medicine = text("medicine")
+        self.specialties = text("specialties")
+        self.beds = (
+            frame["total_beds"].to_numpy(dtype=np.int32) if "total_beds" in frame else np.zeros(n, np.int32)
+        )
+        self.accredited = _flag(column("accreditation"))
+        self.emergency = _flag(column("emergency_services"))
+        self.allopathic = column("medicine").str.lower().str.contains("allopathic", regex=False).to_numpy(dtype=bool)
+        self.specialty_count = np.fromiter(
+            (_count_non_zero_parts(value) for value in self.specialties), dtype=np.int32, count=n
+        )
+        facility_count = np.fromiter(
+            (_count_non_zero_parts(value) for value in column("facilities")), dtype=np.int32, count=n
+        )
+
+        # place text the district/alias index matches aliases against
+        place = [
+            " ".join(parts) for parts in zip(text("town"), text("subtown"), text("location"))
+        ]
+        aliases = sorted({alias for alias in aliases if alias})
+        self.index = RowIndex.from_columns(
+            text("state_norm"),
+            text("district_norm"),
+            lambda row_id: place[row_id],
+            aliases,
+        )
+
+        # the ranking's alias test runs over a wider text than the index's;
+        # postings for known aliases are found at load, others on demand
+        accreditation = text("accreditation")
+        self._rank_text = lambda row_id: " ".join(
+            [self.name[row_id], self.district[row_id], place[row_id], self.specialties[row_id], accreditation[row_id]]
+        )
+        automaton = AliasAutomaton(aliases)
+        postings: Dict[str, List[int]] = {alias: [] for alias in aliases}
+        for row_id in range(n):
+            for alias in automaton.find(self._rank_text(row_id)):
+                postings[alias].append(row_id)
+        self._rank_postings: Dict[str, np.ndarray] = {alias: np.asarray(ids, dtype=np.int64) for alias, ids in postings.items()}
+        self._known_aliases: Set[str] = set(aliases)
+
+        self.static_score, self._alias_bit = self._pack_scores(facility_count)
+
+    def _pack_scores(self, facility_count: np.ndarray) -> tuple:
+        """Pack the ranking keys, most significant first, into one int64 per row."""
+        _, name_rank = np.unique(np.asarray(self.name, dtype=str), return_inverse=True)
+        keys = [
+            self.accredited.astype(np.int64),
+            self.emergency.astype(np.int64),
+            self.specialty_count.astype(np.int64),
+            facility_count.astype(np.int64),
+            np.maximum(self.beds, 0).astype(np.int64),
+            name_rank.astype(np.int64),
+        ]
+        score = np.zeros(len(self.name), dtype=np.int64)
+        shift = 0
+        for key in reversed(keys):
+            bits = int(key.max()).bit_length() if len(key) else 0
+            score |= key << shift
+            shift += bits
+        if shift >= 63:
+            raise ValueError(f"hospital ranking keys need {shift + 1} bits")
+        return score, np.int64(1) << shift
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def match(self, state: str, districts: Iterable[str], aliases: Iterable[str]) -> np.ndarray:
+        """Row ids for a city (see RowIndex.match_ids), as an array."""
+        return np.asarray(self.index.match_ids(state, districts, aliases), dtype=np.int64)
+
+    def _alias_hits(self, ids: np.ndarray, aliases: Sequence[str]) -> np.ndarray:
+        hit = np.zeros(len(ids), dtype=bool)
+        for alias in aliases:
+            if not alias:
+                continue
+            if alias in self._known_aliases:
+                hit |= np.isin(ids, self._rank_postings[alias], assume_unique=True)
+            else:
+                hit |= np.fromiter((alias in self._rank_text(row_id) for row_id in ids), dtype=bool, count=len(ids))
+        return hit
+
+    def top(self, ids: np.ndarray, aliases: Sequence[str], k: int = 3) -> np.ndarray:
+        """
+        The k best of *ids* (ascending): rows mentioning an alias first, then
+        by static score; full ties keep row order.
+        """
+        if not len(ids):
+            return ids
+        score = self.static_score[ids] + self._alias_hits(ids, aliases) * self._alias_bit
+        if len(ids) > k:
+            kth = np.partition(score, len(ids) - k)[len(ids) - k]
+            candidates = np.flatnonzero(score >= kth)
+        else:
+            candidates = np.arange(len(ids))
+        order = np.lexsort((candidates, -score[candidates]))[:k]
+        return ids[candidates[order]]
+
+    def stats(self, ids: np.ndarray) -> HospitalStats:
+        beds = self.beds[ids]
+        known = beds > 0
+        return HospitalStats(
+            total=len(ids),
+            allopathic=int(self.allopathic[ids].sum()),
+            emergency=int(self.emergency[ids].sum()),
+            accredited=int(self.accredited[ids].sum()),
+            known_beds_rows=int(known.sum()),
+            known_beds_total=int(beds[known].sum()),
+        )
@@ -0,0 +1,241 @@
+"""
+Shared live enrichment for city descriptions.
+
+Live sections (NABH hospitals, geography, AI connectivity) come from slow
+external sources. Instead of a thread pool and a fresh round of fetches per
+request, every enrichment runs on one bounded app-wide executor and its
+result is cached per (city, language). Sources that do not depend on the
+language share one entry per city instead:
+
+  - Fresh results are returned without touching the sources.
+  - Stale results are returned immediately while one background refresh
+    runs (stale-while-revalidate).
+  - Concurrent misses for the same key share one in-flight fetch.
+  - A result missing a section whose source raised is cached for the short
+    negative TTL only, after which it is served stale while a refresh
+    retries every source. Sources report fetch failures by raising, not by
+    returning None (which means "no data").
+
+stream() yields each section as its source finishes. A request waits at most
+its timeout for a miss; sources still running after that keep going and
+fill the cache, so the next view is served instantly.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.services.ttl_cache import FRESH, STALE, TTLCache
+
+logger = logging.getLogger(__name__)
+
+LIVE_WORKERS = 8
+LIVE_TIMEOUT_SECONDS = 15
+_CACHE_TTL_SECONDS = 3600  # 1 hour
+_NEGATIVE_CACHE_TTL_SECONDS = 300  # retry cities with no live data after 5 minutes
+_STALE_TTL_SECONDS = 24 * 3600  # serve stale sections for up to a day more
+_CACHE_MAX_ENTRIES = 512
+
+LiveSource = Callable[[str, str, str], Optional[Dict[str, Any]]]  # (city, state, language) → section
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=LIVE_WORKERS, thread_name_prefix="live-enrichment")
+        return _EXECUTOR
+
+
+def shutdown_executor() -> None:
+    """Stop the shared executor; running fetches are abandoned."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is not None:
+            _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+            _EXECUTOR = None
+
+
+class _Flight:
+    """One in-flight enrichment; sections fill in as their sources finish."""
+
+    def __init__(self, pending: int) -> None:
+        self.sections: Dict[str, Dict[str, Any]] = {}
+        self.pending = pending
+        self.failed = 0  # sources that raised
+        self.done = False
+
+
+class LiveEnrichment:
+    """Cached, single-flight fan-out over a fixed set of live section sources."""
+
+    def __init__(
+        self,
+        sources: Dict[str, LiveSource],
+        cache: Optional[TTLCache] = None,
+        submit: Optional[Callable[..., Future]] = None,
+        language_independent: Iterable[str] = (),
+    ) -> None:
+        """*language_independent* names sources cached per city rather than per (city, language)."""
+        self.sources = sources
+        shared = set(language_independent)
+        self._groups: List[Tuple[bool, Dict[str, LiveSource]]] = [
+            (per_language, group)
+            for per_language, group in (
+                (False, {name: source for name, source in sources.items() if name in shared}),
+                (True, {name: source for name, source in sources.items() if name not in shared}),
+            )
+            if group
+        ]
+        if cache is None:
+            cache = TTLCache(
+                maxsize=_CACHE_MAX_ENTRIES,
+                ttl=_CACHE_TTL_SECONDS,
+                negative_ttl=_NEGATIVE_CACHE_TTL_SECONDS,
+                stale_ttl=_STALE_TTL_SECONDS,
+            )
+        self.cache = cache
+        self._submit = submit or (lambda fn, *args: _executor().submit(fn, *args))
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)  # a flight gained a section
+        self._in_flight: Dict[Hashable, _Flight] = {}
+
+    def get(
+        self,
+        city_name: str,
+        state: str,
+        language: str = "en",
+        timeout: float = LIVE_TIMEOUT_SECONDS,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Live sections for a city, by section name; never raises.
+
+        On a miss, waits up to *timeout* and returns whichever sections are
+        ready by then. Section dicts are shared with the cache: read only.
+        """
+        return dict(self.stream(city_name, state, language, timeout))
+
+    def stream(
+        self,
+        city_name: str,
+        state: str,
+        language: str = "en",
+        timeout: float = LIVE_TIMEOUT_SECONDS,
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Like get(), but yields (name, section) as each source finishes."""
+        city = city_name.strip().lower()
+        cached: List[Tuple[str, Dict[str, Any]]] = []
+        flights: List[_Flight] = []
+        for per_language, sources in self._groups:
+            key: Tuple[str, ...] = (city, language) if per_language else (city,)
+            lookup = self.cache.lookup(key)
+            if lookup.status == FRESH:
+                cached.extend((lookup.value or {}).items())
+            elif lookup.status == STALE:
+                if self.cache.try_begin_refresh(key):
+                    self._start(
+                        key, sources, city_name, state, language,
+                        on_done=lambda key=key: self.cache.end_refresh(key),
+                    )
+                cached.extend(lookup.value.items())
+            else:
+                flights.append(self._start(key, sources, city_name, state, language))
+        yield from cached
+        if not flights:
+            return
+
+        deadline = time.monotonic() + timeout
+        sent: Set[str] = set()
+        while True:
+            with self._changed:
+                while not all(flight.done for flight in flights) and all(
+                    flight.sections.keys() <= sent for flight in flights
+                ):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+                ready = [
+                    (name, section)
+                    for flight in flights
+                    for name, section in flight.sections.items()
+                    if name not in sent
+                ]
+                finished = all(flight.done for flight in flights)
+            for name, section in ready:
+                sent.add(name)
+                yield name, section
+            if finished:
+                return
+            if not ready:
+                logger.warning("Live enrichment for %s still running after %ss", city_name, timeout)
+                return
+
+    def _start(
+        self,
+        key: Hashable,
+        sources: Dict[str, LiveSource],
+        city_name: str,
+        state: str,
+        language: str,
+        on_done: Optional[Callable[[], None]] = None,
+    ) -> _Flight:
+        with self._lock:
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                if on_done is not None:
+                    on_done()
+                return flight
+            flight = self._in_flight[key] = _Flight(len(sources))
+
+        def _finished(name: str, future: Future) -> None:
+            try:
+                section = future.result()
+            except Exception as exc:
+                logger.warning("Live %s failed for %s: %s", name, city_name, exc)
+                section = None
+                failed = True
+            else:
+                failed = False
+            with self._changed:
+                flight.failed += failed
+                if section:
+                    flight.sections[name] = section
+                flight.pending -= 1
+                if flight.pending:
+                    self._changed.notify_all()
+                    return
+                del self._in_flight[key]
+                result = dict(flight.sections)
+                if result and flight.failed:
+                    self.cache.set(key, result, ttl=self.cache.negative_ttl)
+                else:
+                    self.cache.set(key, result or None)
+                flight.done = True
+                self._changed.notify_all()
+            if on_done is not None:
+                on_done()
+
+        for name, source in sources.items():
+            try:
+                future = self._submit(source, city_name, state, language)
+            except RuntimeError as exc:  # executor shut down
+                future = Future()
+                future.set_exception(exc)
+            future.add_done_callback(lambda future, name=name: _finished(name, future))
+        return flight
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._in_flight)
+        return {**self.cache.stats(), "in_flight": in_flight}
@@ -1,20 +1,50 @@
 """
 Living Cost Service for शहर AI.
-Loads LivingCostDataset/livingcost_india_all_inr.csv at startup and exposes
+Loads LivingCostDataset/livingcost_india_all_inr.csv on first use and exposes
 per-city affordability metrics used in city scoring.
+
+City names are resolved to CSV rows once, when the data is loaded:
+  1. Exact normalised match on the city name, its bracketed parts
+     ("Goa (Panaji)" → "goa", "panaji") and its evidence-registry aliases
+  2. Fuzzy match through a character-trigram index, confirmed by edit
+     distance; accepted only above MIN_CONFIDENCE
+
+City-level rows win over state-level rows at equal confidence, so "goa"
+never drifts into "goa velha" and "mangalore" never lands on "bangalore".
+After loading, every registry lookup is a dict hit; other names are matched
+on first use and remembered by the resolver, so a reload forgets them too.
 """
 
 import csv
+import logging
 import os
 import re
-from typing import Dict, Optional
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from app.services.single_flight import single_flight
+
+logger = logging.getLogger(__name__)
 
 # ── Path resolution ────────────────────────────────────────────────────────────
 _BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 _CSV_PATH = os.path.join(_BASE_DIR, "LivingCostDataset", "livingcost_india_all_inr.csv")
 
-# ── Internal lookup table: normalised city name → row dict ────────────────────
-_LIVING_COST_DATA: Dict[str, dict] = {}
+MIN_CONFIDENCE = 0.75  # mean of trigram Jaccard and edit-distance similarity
+MIN_TRIGRAM_OVERLAP = 0.3  # candidates below this are not scored at all
+MAX_OTHER_NAMES = 1024  # non-registry names remembered per resolver
+
+
+class LivingCostRow(NamedTuple):
+    key: str
+    level: str  # "city" or "state"
+    data: dict
+
+
+class LivingCostMatch(NamedTuple):
+    row: LivingCostRow
+    confidence: float  # 1.0 for exact matches
+    matched_name: str
 
 
 def _normalise(name: str) -> str:
@@ -25,24 +55,37 @@ def _normalise(name: str) -> str:
     return name.strip()
 
 
-def _load_csv() -> None:
-    global _LIVING_COST_DATA
-    if not os.path.exists(_CSV_PATH):
-        print(f"[living_cost_service] WARNING: CSV not found at {_CSV_PATH}")
-        return
+def _name_variants(city_name: str) -> List[str]:
+    """Normalised spellings of a registry name: full, outside and inside brackets."""
+    variants = [_normalise(city_name.replace("(", " ").replace(")", " "))]
+    outside = re.sub(r"\(.*?\)", " ", city_name)
+    variants.append(_normalise(outside))
+    variants.extend(_normalise(part) for part in re.findall(r"\((.*?)\)", city_name))
+    return [v for v in dict.fromkeys(re.sub(r"\s+", " ", v) for v in variants) if v]
+
+
+# ── Loading ────────────────────────────────────────────────────────────────────
 
-    with open(_CSV_PATH, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+def _row_level(source_url: str) -> str:
+    # livingcost.org/cost/india/<state> vs livingcost.org/cost/india/<state>/<city>
+    path = source_url.split("/cost/india/", 1)[-1].strip("/")
+    return "city" if "/" in path else "state"
+
+
+def _read_rows(path: str) -> List[LivingCostRow]:
+    rows: List[LivingCostRow] = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
             raw_city = row.get("city", "")
             # Skip comparison rows (e.g. "India vs Indonesia …")
             if "vs" in raw_city.lower() or "comparison" in raw_city.lower():
                 continue
-            key = _normalise(raw_city)
+            # "Hyderabad, Telangana" → "hyderabad"
+            key = _normalise(raw_city.split(",", 1)[0])
             if not key:
                 continue
             try:
-                _LIVING_COST_DATA[key] = {
+                data = {
                     "cost_one_person_inr": float(row["cost_one_person_inr"]),
                     "rent_one_person_inr": float(row["rent_one_person_inr"]),
                     "monthly_salary_after_tax_inr": float(row["monthly_salary_after_tax_inr"]),
@@ -51,32 +94,192 @@ def _load_csv() -> None:
                 }
             except (ValueError, KeyError):
                 continue
+            rows.append(LivingCostRow(key, _row_level(row.get("source_url", "")), data))
+    return rows
 
-    print(f"[living_cost_service] Loaded {len(_LIVING_COST_DATA)} city entries from CSV.")
 
+# ── Matching ───────────────────────────────────────────────────────────────────
 
-# Load eagerly at import time
-_load_csv()
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
 
 
-def get_living_cost(city_name: str) -> Optional[dict]:
-    """
-    Return living cost metrics for a given city, or None if not found.
+def _edit_similarity(a: str, b: str) -> float:
+    """1 - Levenshtein distance / longer length."""
+    if a == b:
+        return 1.0
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return 1.0 - previous[-1] / max(len(a), len(b))
 
-    Matching strategy:
-      1. Exact normalised match
-      2. Partial match (city name appears anywhere in the key)
-    """
-    target = _normalise(city_name)
-    if target in _LIVING_COST_DATA:
-        return _LIVING_COST_DATA[target]
 
-    # Partial match – e.g. "Goa (Panaji)" → matches "goa"
-    for key, data in _LIVING_COST_DATA.items():
-        if target in key or key in target:
-            return data
+class LivingCostIndex:
+    """Exact-key map plus a trigram inverted index over the CSV rows."""
+
+    def __init__(self, rows: Iterable[LivingCostRow]) -> None:
+        self.rows: List[LivingCostRow] = []
+        self.exact: Dict[str, LivingCostRow] = {}
+        self._grams: List[Set[str]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for row in rows:
+            existing = self.exact.get(row.key)
+            if existing is not None and existing.level == "city":
+                continue  # a state sharing a city's name never shadows the city
+            self.exact[row.key] = row
+            index = len(self.rows)
+            self.rows.append(row)
+            grams = _trigrams(row.key)
+            self._grams.append(grams)
+            for gram in grams:
+                self._postings[gram].append(index)
+
+    def match(self, name: str) -> Optional[Tuple[LivingCostRow, float]]:
+        """Best row for one normalised name, with its confidence."""
+        if name in self.exact:
+            return self.exact[name], 1.0
+
+        grams = _trigrams(name)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for index in self._postings.get(gram, ()):
+                shared[index] += 1
+
+        best: Optional[Tuple[float, bool, LivingCostRow]] = None
+        for index, overlap in shared.items():
+            jaccard = overlap / (len(grams) + len(self._grams[index]) - overlap)
+            if jaccard < MIN_TRIGRAM_OVERLAP:
+                continue
+            row = self.rows[index]
+            confidence = (jaccard + _edit_similarity(name, row.key)) / 2
+            candidate = (confidence, row.level == "city", row)
+            if best is None or candidate[:2] > best[:2]:
+                best = candidate
+        if best is None or best[0] < MIN_CONFIDENCE:
+            return None
+        return best[2], round(best[0], 3)
 
-    return None
+
+def resolve_city(
+    index: LivingCostIndex,
+    city_name: str,
+    aliases: Iterable[str] = (),
+) -> Optional[LivingCostMatch]:
+    """Match a city by its name variants and aliases; exact hits beat fuzzy ones."""
+    names = list(dict.fromkeys([*_name_variants(city_name), *(_normalise(a) for a in aliases)]))
+    best: Optional[LivingCostMatch] = None
+    for name in names:
+        hit = index.match(name)
+        if hit is None:
+            continue
+        row, confidence = hit
+        rank = (confidence, row.level == "city")
+        if best is None or rank > (best.confidence, best.row.level == "city"):
+            best = LivingCostMatch(row, confidence, name)
+    return best
+
+
+def _registry_aliases() -> Dict[str, List[str]]:
+    """Registry city name → aliases from the city evidence mapping (if available)."""
+    from app.services.city_data import get_city_names
+
+    try:
+        from app.services.city_evidence_service import CITY_MAPPING, _city_key
+    except ImportError as exc:  # evidence datasets not installed
+        logger.debug("City aliases unavailable for living-cost matching: %s", exc)
+        return {name: [] for name in get_city_names()}
+
+    return {
+        name: list(CITY_MAPPING.get(_city_key(name), {}).get("city_aliases", []))
+        for name in get_city_names()
+    }
+
+
+class LivingCostResolver(NamedTuple):
+    name_index: LivingCostIndex
+    matches: Dict[str, LivingCostMatch]  # normalised registry name → match
+    unmatched: List[str]
+    others: Dict[str, Optional[LivingCostMatch]]  # other names matched so far
+
+    def resolve_other(self, target: str) -> Optional[LivingCostMatch]:
+        """Match a normalised name outside the registry, remembering the result."""
+        if target in self.others:
+            return self.others[target]
+        match = resolve_city(self.name_index, target)
+        if len(self.others) < MAX_OTHER_NAMES:
+            self.others[target] = match
+        return match
+
+
+def build_resolver(
+    rows: Iterable[LivingCostRow],
+    aliases: Dict[str, List[str]],
+) -> LivingCostResolver:
+    """Resolve every registry city (key of *aliases*) against *rows* up front."""
+    index = LivingCostIndex(rows)
+    matches: Dict[str, LivingCostMatch] = {}
+    unmatched: List[str] = []
+    for city_name, city_aliases in aliases.items():
+        match = resolve_city(index, city_name, city_aliases)
+        if match is None:
+            unmatched.append(city_name)
+            continue
+        for name in _name_variants(city_name):
+            matches.setdefault(name, match)
+        if match.confidence < 1.0:
+            logger.info(
+                "Living cost: '%s' fuzzily matched to '%s' (confidence %.2f)",
+                city_name, match.row.key, match.confidence,
+            )
+    return LivingCostResolver(index, matches, unmatched, {})
+
+
+@single_flight
+def _get_resolver() -> LivingCostResolver:
+    if not os.path.exists(_CSV_PATH):
+        logger.warning("Living cost CSV not found at %s", _CSV_PATH)
+        rows: List[LivingCostRow] = []
+    else:
+        rows = _read_rows(_CSV_PATH)
+    aliases = _registry_aliases()
+    resolver = build_resolver(rows, aliases)
+    logger.info(
+        "Loaded %d living cost entries; %d/%d registry cities matched",
+        len(resolver.name_index.rows), len(aliases) - len(resolver.unmatched), len(aliases),
+    )
+    return resolver
+
+
+def warm_living_cost() -> List[str]:
+    """Load and resolve the dataset now; logs and returns unmatched registry cities."""
+    resolver = _get_resolver()
+    if resolver.unmatched:
+        logger.warning(
+            "No living cost data for %d registry cities: %s",
+            len(resolver.unmatched), ", ".join(resolver.unmatched),
+        )
+    return resolver.unmatched
+
+
+def resolve_living_cost(city_name: str) -> Optional[LivingCostMatch]:
+    """Matched row (with confidence) for *city_name*, or None."""
+    target = _normalise(city_name.replace("(", " ").replace(")", " "))
+    target = re.sub(r"\s+", " ", target)
+    resolver = _get_resolver()
+    match = resolver.matches.get(target)
+    if match is None and target:
+        match = resolver.resolve_other(target)
+    return match
+
+
+def get_living_cost(city_name: str) -> Optional[dict]:
+    """Return living cost metrics for a given city, or None if not found."""
+    match = resolve_living_cost(city_name)
+    return match.row.data if match is not None else None
 
 
 def get_affordability_score(city_name: str, num_earning_members: int = 1) -> float:
@@ -8,23 +8,52 @@ Approach (v3 – coordinate-based):
   1. Search locations by coordinates (lat/lon + 25 km radius) with
      parameters_id=2 (PM2.5).
   2. For each location, find the PM2.5 sensor ID from the `sensors` array.
-  3. Call `/sensors/{sensor_id}/measurements?limit=1` to get the most
-     recent PM2.5 reading.
+  3. Call `/sensors/{sensor_id}/measurements?limit=1` for the candidate
+     sensors concurrently; the first valid PM2.5 reading wins.
   4. Convert PM2.5 µg/m³ → AQI via US EPA breakpoints.
 
+Bulk mode (OPENAQ_FETCH_MODE=bulk):
+  Latest PM2.5 readings for every station inside the all-India grid extent
+  are pulled from `/parameters/2/latest` in a few paged requests. Each
+  city's PM2.5 is the inverse-distance-weighted mean of the stations within
+  25 km, computed for all cities at once. The same stations rebuild the
+  all-India interpolation grid (see aqi_grid).
+
+The grid is kept fresh in either mode: a background job (and /api/aqi/at on
+a cold or expired grid) runs a grid refresh, which reuses the bulk refresh
+in bulk mode and fetches the same India-wide stations on its own otherwise.
+
 Features:
   - Async HTTP requests (via httpx)
-  - In-memory TTL cache (5 minutes)
+  - Bounded LRU cache: 5-minute TTL, 1-minute negative TTL for cities
+    without data, stale-while-revalidate with a single background refresh
+  - Every live reading is appended to the local AQI history store
+  - The cache is checkpointed to AQI_SNAPSHOT_PATH and restored at startup,
+    so new instances serve recent values before their first refresh
   - Graceful fallback: returns None on any failure
-  - API key loaded from OPENAQ_API_KEY environment variable
+  - API key loaded from OPENAQ_API_KEY environment variable; the API root
+    can be overridden with OPENAQ_BASE_URL (e.g. tests/openaq_standin.py)
 """
 
+import asyncio
+import json
+import math
 import os
 import logging
 import time
-from typing import Optional, Dict, Any
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Set, Tuple
 
 import httpx
+import numpy as np
+
+from app.services.aqi_engine import sub_index
+from app.services.aqi_grid import LAT_MAX, LAT_MIN, LON_MAX, LON_MIN, build_grid
+from app.services.aqi_history import parse_timestamp, record_live_reading
+from app.services.aqi_providers import fetch_hedged, get_providers
+from app.services.aqi_spatial import IDW_MAX_DISTANCE_KM, haversine_matrix, idw
+from app.services.ttl_cache import FRESH, STALE, TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -65,45 +94,37 @@ _CITY_COORDS: Dict[str, tuple] = {
 # Cache implementation
 # ---------------------------------------------------------------------------
 
-_CACHE: Dict[str, Dict[str, Any]] = {}
 _CACHE_TTL_SECONDS = 300  # 5 minutes
+_NEGATIVE_CACHE_TTL_SECONDS = 60  # retry cities without data after 1 minute
+_STALE_TTL_SECONDS = 900  # serve stale values for up to 15 more minutes
+_CACHE_MAX_ENTRIES = 256
 
+_CACHE = TTLCache(
+    maxsize=_CACHE_MAX_ENTRIES,
+    ttl=_CACHE_TTL_SECONDS,
+    negative_ttl=_NEGATIVE_CACHE_TTL_SECONDS,
+    stale_ttl=_STALE_TTL_SECONDS,
+)
 
-def _cache_get(key: str) -> Optional[Dict[str, Any]]:
-    entry = _CACHE.get(key)
-    if entry and (time.monotonic() - entry["ts"]) < _CACHE_TTL_SECONDS:
-        return entry["value"]
-    return None
-
-
-def _cache_set(key: str, value: Any) -> None:
-    _CACHE[key] = {"value": value, "ts": time.monotonic()}
+# Strong references to in-flight background refreshes (asyncio only keeps weak ones)
+_REFRESH_TASKS: Set["asyncio.Task[Any]"] = set()
 
 
 # ---------------------------------------------------------------------------
 # US EPA PM2.5 → AQI conversion
 # ---------------------------------------------------------------------------
 
-_PM25_BREAKPOINTS = [
-    (0.0, 12.0, 0, 50),
-    (12.1, 35.4, 51, 100),
-    (35.5, 55.4, 101, 150),
-    (55.5, 150.4, 151, 200),
-    (150.5, 250.4, 201, 300),
-    (250.5, 350.4, 301, 400),
-    (350.5, 500.4, 401, 500),
-]
-
+def pm25_to_aqi(pm25: float) -> Optional[int]:
+    """
+    Convert PM2.5 concentration (µg/m³) to AQI using US EPA breakpoints.
 
-def pm25_to_aqi(pm25: float) -> int:
-    """Convert PM2.5 concentration (µg/m³) to AQI using US EPA breakpoints."""
+    Non-finite readings (NaN, inf) are treated as missing and give None.
+    """
+    if not math.isfinite(pm25):
+        return None
     if pm25 < 0:
         return 0
-    for bp_lo, bp_hi, aqi_lo, aqi_hi in _PM25_BREAKPOINTS:
-        if bp_lo <= pm25 <= bp_hi:
-            aqi = ((aqi_hi - aqi_lo) / (bp_hi - bp_lo)) * (pm25 - bp_lo) + aqi_lo
-            return round(aqi)
-    return 500  # Hazardous cap
+    return int(round(float(sub_index(pm25, "pm25", "us_epa"))))
 
 
 # ---------------------------------------------------------------------------
@@ -112,6 +133,26 @@ def pm25_to_aqi(pm25: float) -> int:
 
 OPENAQ_BASE_URL = "https://api.openaq.org/v3"
 SEARCH_RADIUS_M = 25000  # Max allowed by OpenAQ v3 (25 km)
+MAX_PROBED_SENSORS = 5  # Candidate locations probed in step 3
+SENSOR_PROBE_CONCURRENCY = 5  # Measurement requests in flight per city
+
+FETCH_MODE_PER_CITY = "per_city"
+FETCH_MODE_BULK = "bulk"
+BULK_PAGE_LIMIT = 1000  # stations per page of /parameters/2/latest
+BULK_MAX_PAGES = 10
+BULK_MAX_AGE_SECONDS = 3 * 3600  # ignore stations that stopped reporting
+BULK_MIN_STALE_CITIES = 2  # below this, per-city refreshes are cheaper
+GRID_REFRESH_SECONDS = 300  # rebuild interval of the all-India grid
+
+
+def _get_base_url() -> str:
+    """OpenAQ v3 root; OPENAQ_BASE_URL points the service at a stand-in server."""
+    return (os.getenv("OPENAQ_BASE_URL") or OPENAQ_BASE_URL).rstrip("/")
+
+
+def _get_fetch_mode() -> str:
+    mode = os.getenv("OPENAQ_FETCH_MODE", FETCH_MODE_PER_CITY).strip().lower()
+    return FETCH_MODE_BULK if mode == FETCH_MODE_BULK else FETCH_MODE_PER_CITY
 
 
 def _get_api_key() -> Optional[str]:
@@ -164,11 +205,94 @@ def _extract_pm25_from_location(location: dict) -> Optional[float]:
             latest = param.get("latest")
             if latest and latest.get("value") is not None:
                 val = float(latest["value"])
-                if val > 0:
+                if math.isfinite(val) and val > 0:
                     return val
     return None
 
 
+async def _fetch_sensor_reading(
+    client: httpx.AsyncClient,
+    sensor_id: int,
+    headers: Dict[str, str],
+) -> Optional[Tuple[int, float, str]]:
+    """
+    Fetch the latest measurement for one sensor.
+
+    Returns (sensor_id, pm25, timestamp), or None when the sensor has no
+    usable PM2.5 value.
+    """
+    meas_resp = await client.get(
+        f"{_get_base_url()}/sensors/{sensor_id}/measurements",
+        params={"limit": 1},
+        headers=headers,
+    )
+
+    if meas_resp.status_code != 200:
+        return None
+
+    measurements = meas_resp.json().get("results", [])
+    if not measurements:
+        return None
+
+    meas = measurements[0]
+    pm25_value = meas.get("value")
+    if pm25_value is None or not math.isfinite(pm25_value) or pm25_value <= 0:
+        return None
+
+    # Extract timestamp from the period/datetime
+    period = meas.get("period", {})
+    timestamp = (
+        period.get("datetimeTo", {}).get("utc")
+        or period.get("datetimeFrom", {}).get("utc")
+        or meas.get("datetime", "unknown")
+    )
+    return sensor_id, float(pm25_value), timestamp
+
+
+async def _probe_sensors(
+    client: httpx.AsyncClient,
+    sensor_ids: List[int],
+    headers: Dict[str, str],
+) -> Optional[Tuple[int, float, str]]:
+    """
+    Probe candidate sensors concurrently and return the first valid reading.
+
+    At most SENSOR_PROBE_CONCURRENCY requests are in flight at once. As soon
+    as one sensor yields a usable PM2.5 value, the outstanding probes are
+    cancelled, so a city whose first stations are stale costs roughly one
+    round trip instead of one per station.
+    """
+    if not sensor_ids:
+        return None
+
+    semaphore = asyncio.Semaphore(SENSOR_PROBE_CONCURRENCY)
+
+    async def _bounded(sensor_id: int) -> Optional[Tuple[int, float, str]]:
+        async with semaphore:
+            return await _fetch_sensor_reading(client, sensor_id, headers)
+
+    pending = {asyncio.create_task(_bounded(sensor_id)) for sensor_id in sensor_ids}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled():
+                    continue
+                exc = task.exception()
+                if exc is not None:
+                    logger.debug("Sensor probe failed: %s", exc)
+                    continue
+                reading = task.result()
+                if reading is not None:
+                    return reading
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
 # ---------------------------------------------------------------------------
 # Main public API
 # ---------------------------------------------------------------------------
@@ -180,16 +304,50 @@ async def get_current_aqi(city_name: str) -> Optional[Dict[str, Any]]:
 
     Uses coordinate-based search → sensor-based measurements.
 
+    Fresh cache entries (including cached "no data" results) are returned
+    directly. A stale entry is returned immediately while one background
+    refresh runs for the city.
+
     Returns a dict or None on failure.
     """
     cache_key = city_name.lower()
-    cached = _cache_get(cache_key)
-    if cached is not None:
+    lookup = _CACHE.lookup(cache_key)
+    if lookup.status == FRESH:
         logger.debug("Cache hit for city: %s", city_name)
-        return cached
+        return lookup.value
+    if lookup.status == STALE:
+        logger.debug("Serving stale AQI for city: %s", city_name)
+        _schedule_refresh(city_name, cache_key)
+        return lookup.value
 
-    api_key = _get_api_key()
-    if not api_key:
+    return await _refresh_city(city_name, cache_key)
+
+
+def _schedule_refresh(city_name: str, cache_key: str) -> None:
+    """Start a background refresh for *city_name* unless one is already running."""
+    if not _CACHE.try_begin_refresh(cache_key):
+        return
+
+    async def _run() -> None:
+        try:
+            await _refresh_city(city_name, cache_key)
+        finally:
+            _CACHE.end_refresh(cache_key)
+
+    task = asyncio.create_task(_run())
+    _REFRESH_TASKS.add(task)
+    task.add_done_callback(_REFRESH_TASKS.discard)
+
+
+async def _refresh_city(city_name: str, cache_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch live AQI for *city_name* and store the outcome (hit or miss) in the cache.
+
+    OpenAQ is the primary provider; when a backup feed is configured the
+    fetch is hedged and readings are merged (see aqi_providers).
+    """
+    providers = get_providers()
+    if not providers:
         return None
 
     coords = _CITY_COORDS.get(city_name)
@@ -197,6 +355,19 @@ async def get_current_aqi(city_name: str) -> Optional[Dict[str, Any]]:
         logger.info("No coordinates registered for city: %s", city_name)
         return None
 
+    result = await fetch_hedged(city_name, coords, providers)
+    _CACHE.set(cache_key, result)
+    if result is not None:
+        await asyncio.to_thread(record_live_reading, result)
+    return result
+
+
+async def _fetch_current_aqi(
+    city_name: str,
+    coords: Tuple[float, float],
+    api_key: str,
+) -> Optional[Dict[str, Any]]:
+    """Query OpenAQ for the latest PM2.5 reading near *coords* (uncached)."""
     lat, lon = coords
     headers = {"X-API-Key": api_key, "Accept": "application/json"}
 
@@ -204,7 +375,7 @@ async def get_current_aqi(city_name: str) -> Optional[Dict[str, Any]]:
         async with httpx.AsyncClient(timeout=15.0) as client:
             # Step 1: Find locations near the city with PM2.5 sensors
             locations_resp = await client.get(
-                f"{OPENAQ_BASE_URL}/locations",
+                f"{_get_base_url()}/locations",
                 params={
                     "coordinates": f"{lat},{lon}",
                     "radius": SEARCH_RADIUS_M,
@@ -236,57 +407,36 @@ async def get_current_aqi(city_name: str) -> Optional[Dict[str, Any]]:
                         "pm25": round(pm25_value, 2),
                         "aqi_estimate": aqi_estimate,
                         "timestamp": "embedded",
+                        "station_id": location.get("id"),
                         "data_source": "openaq_live",
                     }
-                    _cache_set(cache_key, result)
                     logger.info(
                         "OpenAQ live AQI for %s (embedded): PM2.5=%.1f → AQI=%d",
                         city_name, pm25_value, aqi_estimate,
                     )
                     return result
 
-            # Step 3: Get latest via sensor measurements endpoint
-            for location in results[:5]:
-                sensor_id = _find_pm25_sensor_id(location)
-                if not sensor_id:
-                    continue
-
-                meas_resp = await client.get(
-                    f"{OPENAQ_BASE_URL}/sensors/{sensor_id}/measurements",
-                    params={"limit": 1},
-                    headers=headers,
-                )
-
-                if meas_resp.status_code != 200:
-                    continue
-
-                measurements = meas_resp.json().get("results", [])
-                if not measurements:
-                    continue
-
-                meas = measurements[0]
-                pm25_value = meas.get("value")
-                if pm25_value is None or pm25_value <= 0:
-                    continue
-
-                # Extract timestamp from the period/datetime
-                period = meas.get("period", {})
-                timestamp = (
-                    period.get("datetimeTo", {}).get("utc")
-                    or period.get("datetimeFrom", {}).get("utc")
-                    or meas.get("datetime", "unknown")
-                )
-
-                aqi_estimate = pm25_to_aqi(float(pm25_value))
+            # Step 3: Get latest via sensor measurements endpoint.
+            # Candidate sensors are probed concurrently; the first valid
+            # reading wins and the remaining requests are cancelled.
+            sensor_ids = [
+                sensor_id
+                for sensor_id in (_find_pm25_sensor_id(loc) for loc in results[:MAX_PROBED_SENSORS])
+                if sensor_id
+            ]
+            reading = await _probe_sensors(client, sensor_ids, headers)
+            if reading is not None:
+                sensor_id, pm25_value, timestamp = reading
+                aqi_estimate = pm25_to_aqi(pm25_value)
                 result = {
                     "city": city_name,
-                    "pm25": round(float(pm25_value), 2),
+                    "pm25": round(pm25_value, 2),
                     "aqi_estimate": aqi_estimate,
                     "timestamp": timestamp,
+                    "station_id": sensor_id,
                     "data_source": "openaq_live",
                 }
 
-                _cache_set(cache_key, result)
                 logger.info(
                     "OpenAQ live AQI for %s (sensor %d): PM2.5=%.1f → AQI=%d",
                     city_name, sensor_id, pm25_value, aqi_estimate,
@@ -308,11 +458,279 @@ async def get_current_aqi(city_name: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+# ---------------------------------------------------------------------------
+# Bulk bounding-box fetch
+# ---------------------------------------------------------------------------
+
+# Registry coordinates as arrays, in _CITY_COORDS order
+_CITY_NAMES: List[str] = list(_CITY_COORDS)
+_CITY_LATS = np.array([coords[0] for coords in _CITY_COORDS.values()])
+_CITY_LONS = np.array([coords[1] for coords in _CITY_COORDS.values()])
+
+# (min_lon, min_lat, max_lon, max_lat) of the all-India grid; every
+# registered city lies inside it, so one fetch serves cities and grid
+GRID_BBOX: Tuple[float, float, float, float] = (LON_MIN, LAT_MIN, LON_MAX, LAT_MAX)
+
+_BULK_TASK: Optional["asyncio.Task[Dict[str, Optional[Dict[str, Any]]]]"] = None
+_GRID_TASK: Optional["asyncio.Task[None]"] = None
+_GRID_JOB: Optional["asyncio.Task[None]"] = None
+
+
+def _parse_latest_station(
+    item: dict,
+    bbox: Tuple[float, float, float, float],
+) -> Optional[Tuple[int, float, float, float, int]]:
+    """
+    Parse one `/parameters/2/latest` row into (sensor_id, lat, lon, pm25, ts).
+
+    Rows outside *bbox* or without a finite, positive value are dropped.
+    """
+    coordinates = item.get("coordinates") or {}
+    lat = coordinates.get("latitude")
+    lon = coordinates.get("longitude")
+    value = item.get("value")
+    if lat is None or lon is None or value is None or not math.isfinite(value) or value <= 0:
+        return None
+    min_lon, min_lat, max_lon, max_lat = bbox
+    if not (min_lat <= lat <= max_lat and min_lon <= lon <= max_lon):
+        return None
+    moment = item.get("datetime")
+    if isinstance(moment, dict):
+        moment = moment.get("utc")
+    sensor_id = item.get("sensorsId") or item.get("locationsId") or 0
+    return int(sensor_id), float(lat), float(lon), float(value), parse_timestamp(moment)
+
+
+async def _fetch_bbox_latest(
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    bbox: Tuple[float, float, float, float],
+) -> List[Tuple[int, float, float, float, int]]:
+    """
+    Page through the latest PM2.5 readings of every station inside *bbox*.
+
+    Stops at the first short page or after BULK_MAX_PAGES requests; hitting
+    the cap is logged, since stations beyond it are silently missing.
+    """
+    stations: List[Tuple[int, float, float, float, int]] = []
+    for page in range(1, BULK_MAX_PAGES + 1):
+        resp = await client.get(
+            f"{_get_base_url()}/parameters/2/latest",
+            params={
+                "bbox": ",".join(f"{edge:.4f}" for edge in bbox),
+                "limit": BULK_PAGE_LIMIT,
+                "page": page,
+            },
+            headers=headers,
+        )
+        if resp.status_code != 200:
+            logger.warning("OpenAQ latest API returned %d (page %d)", resp.status_code, page)
+            break
+        results = resp.json().get("results", [])
+        for item in results:
+            station = _parse_latest_station(item, bbox)
+            if station is not None:
+                stations.append(station)
+        if len(results) < BULK_PAGE_LIMIT:
+            break
+    else:
+        logger.warning(
+            "OpenAQ bulk fetch truncated at %d pages (%d stations); raise BULK_MAX_PAGES",
+            BULK_MAX_PAGES, len(stations),
+        )
+    return stations
+
+
+def _fresh_stations(
+    stations: List[Tuple[int, float, float, float, int]],
+    now: Optional[float] = None,
+) -> List[Tuple[int, float, float, float, int]]:
+    now = time.time() if now is None else now
+    return [station for station in stations if now - station[4] <= BULK_MAX_AGE_SECONDS]
+
+
+def _aggregate_cities(
+    fresh: List[Tuple[int, float, float, float, int]],
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """IDW-aggregate (fresh) station PM2.5 onto every registered city in one pass."""
+    output: Dict[str, Optional[Dict[str, Any]]] = {name: None for name in _CITY_NAMES}
+    if not fresh:
+        return output
+
+    _, lats, lons, values, stamps = (np.array(column) for column in zip(*fresh))
+    estimates, counts = idw(_CITY_LATS, _CITY_LONS, lats, lons, values)
+    aqis = sub_index(estimates, "pm25", "us_epa")
+
+    # Latest contributing station timestamp per city
+    in_range = haversine_matrix(_CITY_LATS, _CITY_LONS, lats, lons) <= IDW_MAX_DISTANCE_KM
+    latest = np.where(in_range, stamps, 0).max(axis=1)
+    for i in np.flatnonzero(counts > 0):
+        name = _CITY_NAMES[i]
+        output[name] = {
+            "city": name,
+            "pm25": round(float(estimates[i]), 2),
+            "aqi_estimate": int(round(float(aqis[i]))),
+            "timestamp": datetime.fromtimestamp(int(latest[i]), tz=timezone.utc).isoformat(),
+            "station_id": None,  # an IDW blend of stations_used stations
+            "stations_used": int(counts[i]),
+            "data_source": "openaq_live",
+        }
+    return output
+
+
+async def _fetch_india_stations() -> Optional[List[Tuple[int, float, float, float, int]]]:
+    """Latest readings of every station in GRID_BBOX; None without an API key or on network errors."""
+    api_key = _get_api_key()
+    if not api_key:
+        return None
+
+    headers = {"X-API-Key": api_key, "Accept": "application/json"}
+    try:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            return await _fetch_bbox_latest(client, headers, GRID_BBOX)
+    except httpx.RequestError as exc:
+        logger.error("Network error during bulk OpenAQ fetch: %s", exc)
+        return None
+
+
+async def _rebuild_grid(fresh: List[Tuple[int, float, float, float, int]]) -> None:
+    if not fresh:
+        return
+    _, lats, lons, values, _ = (np.array(column) for column in zip(*fresh))
+    try:
+        await asyncio.to_thread(build_grid, lats, lons, values)
+    except Exception as exc:
+        logger.error("AQI grid rebuild failed: %s", exc)
+
+
+async def refresh_all_cities_bulk() -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Refresh the cache for every registered city from one bounding-box fetch.
+
+    Concurrent callers share a single in-flight refresh. Only cities with a
+    station in range are cached: the others are left alone, so their next
+    lookup falls back to the per-city search (_refresh_city) instead of
+    being pinned to a negative entry. The all-India interpolation grid is
+    rebuilt from the same stations.
+    """
+    return await asyncio.shield(schedule_bulk_refresh())
+
+
+def schedule_bulk_refresh() -> "asyncio.Task[Dict[str, Optional[Dict[str, Any]]]]":
+    """Start a bulk refresh unless one is already running; returns its task."""
+    global _BULK_TASK
+    if _BULK_TASK is None or _BULK_TASK.done():
+        _BULK_TASK = asyncio.ensure_future(_refresh_all_cities_bulk())
+    return _BULK_TASK
+
+
+async def _refresh_all_cities_bulk() -> Dict[str, Optional[Dict[str, Any]]]:
+    stations = await _fetch_india_stations()
+    if stations is None:
+        return {name: None for name in _CITY_NAMES}
+
+    fresh = _fresh_stations(stations)
+    results = _aggregate_cities(fresh)
+    for name, result in results.items():
+        if result is not None:
+            _CACHE.set(name.lower(), result)
+            await asyncio.to_thread(record_live_reading, result)
+
+    await _rebuild_grid(fresh)
+    logger.info(
+        "Bulk OpenAQ refresh: %d stations, %d/%d cities with data",
+        len(stations), sum(r is not None for r in results.values()), len(results),
+    )
+    return results
+
+
+async def refresh_grid() -> None:
+    """
+    Rebuild the all-India grid from the latest station readings, in any fetch mode.
+
+    In bulk mode this is the bulk city refresh, which rebuilds the grid from
+    the same fetch; otherwise the India-wide stations are fetched for the
+    grid alone and the city cache is left to the per-city lookups.
+    Concurrent callers share one rebuild.
+    """
+    await asyncio.shield(schedule_grid_refresh())
+
+
+def schedule_grid_refresh() -> "asyncio.Task[None]":
+    """Start a grid rebuild unless one is already running; returns its task."""
+    global _GRID_TASK
+    if _GRID_TASK is None or _GRID_TASK.done():
+        _GRID_TASK = asyncio.ensure_future(_refresh_grid())
+    return _GRID_TASK
+
+
+async def _refresh_grid() -> None:
+    if _get_fetch_mode() == FETCH_MODE_BULK:
+        await refresh_all_cities_bulk()
+        return
+
+    stations = await _fetch_india_stations()
+    if stations is None:
+        return
+    fresh = _fresh_stations(stations)
+    await _rebuild_grid(fresh)
+    logger.info("AQI grid refresh: %d stations (%d fresh)", len(stations), len(fresh))
+
+
+async def _run_grid_job(interval: float) -> None:
+    while True:
+        try:
+            await refresh_grid()
+        except Exception as exc:
+            logger.error("AQI grid refresh failed: %s", exc)
+        await asyncio.sleep(interval)
+
+
+def start_grid_job() -> None:
+    """Rebuild the grid periodically (AQI_GRID_REFRESH_SECONDS); needs OPENAQ_API_KEY."""
+    global _GRID_JOB
+    if _GRID_JOB is not None and not _GRID_JOB.done():
+        return
+    if not os.getenv("OPENAQ_API_KEY"):
+        logger.info("OPENAQ_API_KEY is not set; the AQI grid job is not started.")
+        return
+    interval = float(os.getenv("AQI_GRID_REFRESH_SECONDS") or GRID_REFRESH_SECONDS)
+    _GRID_JOB = asyncio.create_task(_run_grid_job(interval))
+
+
+async def stop_grid_job() -> None:
+    global _GRID_JOB
+    if _GRID_JOB is not None:
+        _GRID_JOB.cancel()
+        try:
+            await _GRID_JOB
+        except asyncio.CancelledError:
+            pass
+        _GRID_JOB = None
+
+
 async def get_current_aqi_batch(
     city_names: list[str],
 ) -> Dict[str, Optional[Dict[str, Any]]]:
-    """Fetch live AQI for multiple cities concurrently."""
-    import asyncio
+    """
+    Fetch live AQI for multiple cities concurrently.
+
+    In bulk mode, one bounding-box refresh first repopulates the cache when
+    several requested cities are missing or stale; the per-city lookups
+    below are then served from the cache, and cities the bulk pass missed
+    go through _refresh_city as usual.
+    """
+    if _get_fetch_mode() == FETCH_MODE_BULK:
+        needs_refresh = sum(
+            1
+            for city in city_names
+            if city in _CITY_COORDS and _CACHE.peek(city.lower()) != FRESH
+        )
+        if needs_refresh >= BULK_MIN_STALE_CITIES:
+            try:
+                await refresh_all_cities_bulk()
+            except Exception as exc:
+                logger.error("Bulk OpenAQ refresh failed: %s", exc)
 
     tasks = [get_current_aqi(city) for city in city_names]
     results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -328,6 +746,111 @@ async def get_current_aqi_batch(
     return output
 
 
+# ---------------------------------------------------------------------------
+# Snapshot checkpointing (warm starts)
+# ---------------------------------------------------------------------------
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_INTERVAL_SECONDS = 60
+_DEFAULT_SNAPSHOT_PATH = (
+    Path(__file__).resolve().parent.parent.parent / "dataset_cache" / "aqi_snapshot.json"
+)
+
+_SNAPSHOT_JOB: Optional["asyncio.Task[None]"] = None
+
+
+def _snapshot_path() -> Path:
+    return Path(os.getenv("AQI_SNAPSHOT_PATH") or _DEFAULT_SNAPSHOT_PATH)
+
+
+def save_snapshot(path: Optional[Path] = None) -> int:
+    """
+    Checkpoint servable cache entries to *path* (atomic replace).
+
+    Each entry carries its age and any TTL of its own, so a reader can tell
+    how fresh it still is.
+    Returns the number of entries written.
+    """
+    path = Path(path or _snapshot_path())
+    entries = _CACHE.snapshot()
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": time.time(),
+        "entries": [[key, value, round(age, 1), ttl] for key, value, age, ttl in entries],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return len(entries)
+
+
+def load_snapshot(path: Optional[Path] = None) -> int:
+    """
+    Restore cache entries from a checkpoint written by save_snapshot().
+
+    Entries keep their original age plus the time the file sat on disk, so
+    anything past the stale window is dropped and the rest is served (and
+    refreshed in the background) exactly as before the restart.
+    """
+    path = Path(path or _snapshot_path())
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable AQI snapshot %s: %s", path, exc)
+        return 0
+    if payload.get("version") != SNAPSHOT_VERSION:
+        return 0
+
+    elapsed = max(0.0, time.time() - float(payload.get("saved_at", 0)))
+    loaded = _CACHE.restore(
+        (key, value, age + elapsed, ttl) for key, value, age, ttl in payload.get("entries", [])
+    )
+    logger.info("Restored %d AQI cache entries from snapshot (%.0fs old)", loaded, elapsed)
+    return loaded
+
+
+async def _run_snapshot_job(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(save_snapshot)
+        except Exception as exc:
+            logger.error("AQI snapshot checkpoint failed: %s", exc)
+
+
+def start_snapshot_job() -> None:
+    """Checkpoint the cache periodically (AQI_SNAPSHOT_INTERVAL_SECONDS)."""
+    global _SNAPSHOT_JOB
+    if _SNAPSHOT_JOB is not None and not _SNAPSHOT_JOB.done():
+        return
+    interval = float(os.getenv("AQI_SNAPSHOT_INTERVAL_SECONDS") or SNAPSHOT_INTERVAL_SECONDS)
+    _SNAPSHOT_JOB = asyncio.create_task(_run_snapshot_job(interval))
+
+
+async def stop_snapshot_job() -> None:
+    """Stop the periodic checkpoint and write a final snapshot."""
+    global _SNAPSHOT_JOB
+    if _SNAPSHOT_JOB is not None:
+        _SNAPSHOT_JOB.cancel()
+        try:
+            await _SNAPSHOT_JOB
+        except asyncio.CancelledError:
+            pass
+        _SNAPSHOT_JOB = None
+    try:
+        save_snapshot()
+    except Exception as exc:
+        logger.error("Final AQI snapshot failed: %s", exc)
+
+
 def clear_cache() -> None:
     """Clear the AQI cache (useful for testing)."""
     _CACHE.clear()
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/staleness counters for the AQI cache."""
+    return _CACHE.stats()
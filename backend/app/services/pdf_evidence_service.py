@@ -10,12 +10,16 @@ import json
 import logging
 import os
 import re
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from dotenv import load_dotenv
 
+from app.services.single_flight import SingleFlightLoader
+
 _BACKEND_ENV = Path(__file__).resolve().parent.parent.parent / ".env"
 load_dotenv(_BACKEND_ENV)
 
@@ -31,8 +35,12 @@ CHUNK_MAX_CHARS = 80_000
 _COOLDOWN_SECONDS = 600  # 10 minutes before retrying exhausted models
 _cooldown_until: float = 0.0  # epoch timestamp; skip Gemini calls until this passes
 
-_mem_crime: Optional[List[Dict[str, Any]]] = None
-_mem_religion: Optional[List[Dict[str, Any]]] = None
+# Parsed records by kind ("crime", "religion"), as one generation: a reload
+# parses off to the side (parse_pdf_evidence), is seen by the thread that
+# rebuilds descriptions from it (staged_pdf_evidence) and is then installed
+# in one step (install_pdf_evidence), like city_evidence_service's datasets.
+_RECORDS = SingleFlightLoader("pdf_evidence")
+_STAGING = threading.local()  # .records: generation being staged by this thread
 
 
 def _pdf_signature() -> str:
@@ -314,14 +322,11 @@ def _dedupe_crime_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     return list(merged.values())
 
 
-def _load_or_parse_crime() -> Tuple[str, List[Dict[str, Any]]]:
-    global _mem_crime
+def _parse_crime_records() -> List[Dict[str, Any]]:
+    """Crime records from the JSON cache, or parsed from the PDFs (not installed)."""
     sig = _pdf_signature()
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-    if _mem_crime is not None:
-        return sig, _mem_crime
-
     crime_paths = sorted(
         p for p in DATASET_DIR.glob("*.pdf") if _classify_pdf(p.name) == "crime"
     )
@@ -334,12 +339,10 @@ def _load_or_parse_crime() -> Tuple[str, List[Dict[str, Any]]]:
             if payload.get("signature") == sig:
                 retry_after = payload.get("retry_after", 0)
                 if cached_records or not crime_paths:
-                    _mem_crime = cached_records
-                    return sig, cached_records
+                    return cached_records
                 if time.time() < retry_after:
                     logger.info("Crime cache empty but retry cooldown active (%.0fs left)", retry_after - time.time())
-                    _mem_crime = []
-                    return sig, []
+                    return []
         except (json.JSONDecodeError, OSError):
             pass
 
@@ -347,13 +350,11 @@ def _load_or_parse_crime() -> Tuple[str, List[Dict[str, Any]]]:
         payload = {"signature": sig, "records": []}
         with open(CRIME_CACHE, "w", encoding="utf-8") as fh:
             json.dump(payload, fh, ensure_ascii=True)
-        _mem_crime = []
-        return sig, []
+        return []
 
     if time.time() < _cooldown_until:
         logger.info("Gemini cooldown active, returning empty crime records")
-        _mem_crime = []
-        return sig, []
+        return []
 
     _exhausted_models.clear()
     logger.info("Parsing %d crime PDFs via Gemini (page-chunked)…", len(crime_paths))
@@ -400,8 +401,7 @@ def _load_or_parse_crime() -> Tuple[str, List[Dict[str, Any]]]:
                 fh, ensure_ascii=True,
             )
 
-    _mem_crime = records
-    return sig, records
+    return records
 
 
 def _normalize_religion_record(rec: Dict[str, Any]) -> Dict[str, Any]:
@@ -435,14 +435,11 @@ def _dedupe_religion_records(records: List[Dict[str, Any]]) -> List[Dict[str, An
     return list(merged.values())
 
 
-def _load_or_parse_religion() -> Tuple[str, List[Dict[str, Any]]]:
-    global _mem_religion
+def _parse_religion_records() -> List[Dict[str, Any]]:
+    """Religion records from the JSON cache, or parsed from the PDFs (not installed)."""
     sig = _pdf_signature()
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-    if _mem_religion is not None:
-        return sig, _mem_religion
-
     religion_paths = sorted(
         p for p in DATASET_DIR.glob("*.pdf") if _classify_pdf(p.name) == "religion"
     )
@@ -455,12 +452,10 @@ def _load_or_parse_religion() -> Tuple[str, List[Dict[str, Any]]]:
             if payload.get("signature") == sig:
                 retry_after = payload.get("retry_after", 0)
                 if cached_records or not religion_paths:
-                    _mem_religion = cached_records
-                    return sig, cached_records
+                    return cached_records
                 if time.time() < retry_after:
                     logger.info("Religion cache empty but retry cooldown active (%.0fs left)", retry_after - time.time())
-                    _mem_religion = []
-                    return sig, []
+                    return []
         except (json.JSONDecodeError, OSError):
             pass
 
@@ -468,13 +463,11 @@ def _load_or_parse_religion() -> Tuple[str, List[Dict[str, Any]]]:
         payload = {"signature": sig, "records": []}
         with open(RELIGION_CACHE, "w", encoding="utf-8") as fh:
             json.dump(payload, fh, ensure_ascii=True)
-        _mem_religion = []
-        return sig, []
+        return []
 
     if time.time() < _cooldown_until:
         logger.info("Gemini cooldown active, returning empty religion records")
-        _mem_religion = []
-        return sig, []
+        return []
 
     _exhausted_models.clear()
     logger.info("Parsing %d religion PDFs via Gemini (page-chunked)…", len(religion_paths))
@@ -521,8 +514,14 @@ def _load_or_parse_religion() -> Tuple[str, List[Dict[str, Any]]]:
                 fh, ensure_ascii=True,
             )
 
-    _mem_religion = records
-    return sig, records
+    return records
+
+
+def _records(kind: str, parse: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    staged = getattr(_STAGING, "records", None)
+    if staged is not None and kind in staged:
+        return staged[kind]
+    return _RECORDS.get(kind, parse)
 
 
 def _best_crime_record(
@@ -530,7 +529,7 @@ def _best_crime_record(
     state: str,
     district_norms: List[str],
 ) -> Optional[Dict[str, Any]]:
-    _, records = _load_or_parse_crime()
+    records = _records("crime", _parse_crime_records)
     if not records:
         return None
     state_n = _norm(state)
@@ -563,7 +562,7 @@ def _best_religion_record(
     state: str,
     district_norms: List[str],
 ) -> Optional[Dict[str, Any]]:
-    _, records = _load_or_parse_religion()
+    records = _records("religion", _parse_religion_records)
     if not records:
         return None
     state_n = _norm(state)
@@ -685,12 +684,34 @@ def _float_pct(val: Any) -> str:
     return f"{x:.1f}%"
 
 
-def warm_pdf_evidence_cache() -> None:
-    """Pre-parse PDFs when the server starts."""
-    global _mem_crime, _mem_religion, _cooldown_until
-    _mem_crime = None
-    _mem_religion = None
+def parse_pdf_evidence() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Crime and religion records read afresh (JSON cache or PDFs), by kind.
+
+    Nothing is installed: the current records keep serving until
+    install_pdf_evidence().
+    """
+    global _cooldown_until
     _cooldown_until = 0.0
     _exhausted_models.clear()
-    _load_or_parse_crime()
-    _load_or_parse_religion()
+    return {"crime": _parse_crime_records(), "religion": _parse_religion_records()}
+
+
+@contextmanager
+def staged_pdf_evidence(records: Optional[Dict[str, List[Dict[str, Any]]]]) -> Iterator[None]:
+    """Within the block, this thread alone reads *records* (None: the installed ones)."""
+    _STAGING.records = records
+    try:
+        yield
+    finally:
+        _STAGING.records = None
+
+
+def install_pdf_evidence(records: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Make *records* (from parse_pdf_evidence) the current generation."""
+    _RECORDS.replace(records)
+
+
+def warm_pdf_evidence_cache() -> None:
+    """Pre-parse PDFs when the server starts."""
+    install_pdf_evidence(parse_pdf_evidence())
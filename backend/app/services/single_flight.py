@@ -0,0 +1,185 @@
+"""
+Single-flight memoising loaders for the heavy dataset loads.
+
+functools.lru_cache does not coordinate concurrent misses: under a burst of
+requests in FastAPI's threadpool, every thread that arrives before the first
+load finishes starts the same parse. A SingleFlightLoader holds one flight
+per key instead. The first caller loads while later callers for that key
+wait for its result, and callers for other keys are not blocked. A failed
+load is raised to everyone waiting on it, but is not cached, so the next
+call tries again.
+
+Loaded values belong to a generation. replace() installs a new generation
+in one assignment. A load that was already running completes into the
+generation it started in, so it can never overwrite newer data.
+
+Per-key metrics (loads, load time, hits, waiters, errors) are available from
+stats(), and from loader_stats() for every loader in the process.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Hashable, List, Mapping, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight:
+    """One running load; waiters block on *done*."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class _Generation:
+    def __init__(self, values: Dict[Hashable, Any]) -> None:
+        self.values = values
+        self.flights: Dict[Hashable, _Flight] = {}
+
+
+class _KeyStats:
+    __slots__ = ("loads", "errors", "hits", "waits", "max_waiters", "load_seconds", "last_load_seconds")
+
+    def __init__(self) -> None:
+        self.loads = 0
+        self.errors = 0
+        self.hits = 0
+        self.waits = 0  # calls that found a load in flight and waited for it
+        self.max_waiters = 0  # most callers waiting on one load
+        self.load_seconds = 0.0
+        self.last_load_seconds: Optional[float] = None
+
+
+_LOADERS: List["SingleFlightLoader"] = []
+_LOADERS_LOCK = threading.Lock()
+
+
+class SingleFlightLoader:
+    """Per-key memoised loads; concurrent misses for one key share a single load."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._generation = _Generation({})
+        self._stats: Dict[Hashable, _KeyStats] = {}
+        with _LOADERS_LOCK:
+            _LOADERS.append(self)
+
+    def get(self, key: Hashable, load: Callable[[], T]) -> T:
+        """The value for *key*, calling *load* at most once per generation."""
+        with self._lock:
+            generation = self._generation
+            stats = self._stats.setdefault(key, _KeyStats())
+            if key in generation.values:
+                stats.hits += 1
+                return generation.values[key]
+            flight = generation.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = generation.flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+                stats.waits += 1
+                stats.max_waiters = max(stats.max_waiters, flight.waiters)
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        started = time.perf_counter()
+        try:
+            flight.value = load()
+        except BaseException as exc:
+            flight.error = exc
+            with self._lock:
+                del generation.flights[key]
+                stats.errors += 1
+            flight.done.set()
+            raise
+        seconds = time.perf_counter() - started
+        with self._lock:
+            generation.values[key] = flight.value
+            del generation.flights[key]
+            stats.loads += 1
+            stats.load_seconds += seconds
+            stats.last_load_seconds = seconds
+        flight.done.set()
+        return flight.value
+
+    def peek(self, key: Hashable) -> Any:
+        """The loaded value for *key*, or None without loading."""
+        return self._generation.values.get(key)
+
+    def values(self) -> Dict[Hashable, Any]:
+        """A copy of the current generation's loaded values."""
+        with self._lock:
+            return dict(self._generation.values)
+
+    def replace(self, values: Mapping[Any, Any]) -> None:
+        """Install *values* as the new generation; loads in flight finish into the old one."""
+        generation = _Generation(dict(values))
+        with self._lock:
+            self._generation = generation
+
+    def clear(self) -> None:
+        self.replace({})
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            generation = self._generation
+            return {
+                str(key): {
+                    "loaded": key in generation.values,
+                    "in_flight": key in generation.flights,
+                    "waiting": generation.flights[key].waiters if key in generation.flights else 0,
+                    "loads": stats.loads,
+                    "errors": stats.errors,
+                    "hits": stats.hits,
+                    "waits": stats.waits,
+                    "max_waiters": stats.max_waiters,
+                    "load_seconds_total": round(stats.load_seconds, 3),
+                    "last_load_seconds": (
+                        round(stats.last_load_seconds, 3) if stats.last_load_seconds is not None else None
+                    ),
+                }
+                for key, stats in self._stats.items()
+            }
+
+
+class SingleFlightFunction(Generic[T]):
+    """A loader function memoised by single_flight; *loader* holds its values."""
+
+    def __init__(self, fn: Callable[..., T]) -> None:
+        functools.update_wrapper(self, fn)
+        self._fn = fn
+        self.loader = SingleFlightLoader(f"{fn.__module__}.{fn.__qualname__}")
+
+    def __call__(self, *args: Any, **kwargs: Any) -> T:
+        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        return self.loader.get(key, lambda: self._fn(*args, **kwargs))
+
+    def cache_clear(self) -> None:
+        self.loader.clear()
+
+
+def single_flight(fn: Callable[..., T]) -> SingleFlightFunction[T]:
+    """
+    Drop-in for lru_cache(maxsize=None) on loader functions with hashable
+    arguments, with single-flight misses; keeps cache_clear().
+    """
+    return SingleFlightFunction(fn)
+
+
+def loader_stats() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Metrics of every loader, by loader name and key."""
+    with _LOADERS_LOCK:
+        loaders = list(_LOADERS)
+    return {loader.name: loader.stats() for loader in loaders}
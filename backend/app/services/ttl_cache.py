@@ -0,0 +1,198 @@
+"""
+Bounded in-memory cache with TTL expiry for शहर AI services.
+
+Entries are evicted least-recently-used once `maxsize` is reached. Positive
+values and negative results (`None`) get separate TTLs, so lookups that found
+nothing are retried sooner than successful ones. Positive entries may also be
+served stale for a grace period while a single caller refreshes them
+(stale-while-revalidate). A positive value can be stored with a shorter
+TTL of its own, e.g. an incomplete result that should be refreshed soon.
+
+The cache is thread-safe and keeps hit/miss/staleness counters for metrics.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+class CacheLookup(NamedTuple):
+    status: str  # FRESH | STALE | MISS
+    value: Any = None
+
+
+class _Entry(NamedTuple):
+    value: Any
+    stored_at: float
+    ttl: Optional[float] = None  # overrides the cache's ttl for this entry
+
+
+class TTLCache:
+    """LRU + TTL cache with negative caching and stale-while-revalidate."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float,
+        stale_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._refreshing: Set[Hashable] = set()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "negative_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "refreshes": 0,
+        }
+
+    def lookup(self, key: Hashable) -> CacheLookup:
+        """Return the cached value for *key* together with its freshness."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return CacheLookup(MISS)
+
+            age = self._clock() - entry.stored_at
+            ttl = self._ttl(entry)
+            if entry.value is None:
+                if age < self.negative_ttl:
+                    self._data.move_to_end(key)
+                    self._stats["negative_hits"] += 1
+                    return CacheLookup(FRESH, None)
+            elif age < ttl:
+                self._data.move_to_end(key)
+                self._stats["hits"] += 1
+                return CacheLookup(FRESH, entry.value)
+            elif age < ttl + self.stale_ttl:
+                self._data.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                return CacheLookup(STALE, entry.value)
+
+            del self._data[key]
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return CacheLookup(MISS)
+
+    def peek(self, key: Hashable) -> str:
+        """Freshness of *key* without touching LRU order or counters."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISS
+            age = self._clock() - entry.stored_at
+            ttl = self._ttl(entry)
+            if entry.value is None:
+                return FRESH if age < self.negative_ttl else MISS
+            if age < ttl:
+                return FRESH
+            return STALE if age < ttl + self.stale_ttl else MISS
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store *value* (``None`` is cached as a negative result).
+
+        *ttl* replaces the cache's ttl for this positive entry; it is still
+        served stale for stale_ttl after that.
+        """
+        with self._lock:
+            self._data[key] = _Entry(value, self._clock(), ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def try_begin_refresh(self, key: Hashable) -> bool:
+        """Claim the background refresh for *key*; False if one is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self._stats["refreshes"] += 1
+            return True
+
+    def end_refresh(self, key: Hashable) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def snapshot(self) -> List[Tuple[Hashable, Any, float, Optional[float]]]:
+        """(key, value, age_seconds, ttl override or None) for every positive entry still servable."""
+        with self._lock:
+            now = self._clock()
+            return [
+                (key, entry.value, now - entry.stored_at, entry.ttl)
+                for key, entry in self._data.items()
+                if entry.value is not None and now - entry.stored_at < self._ttl(entry) + self.stale_ttl
+            ]
+
+    def restore(self, items: Iterable[Tuple[Hashable, Any, float, Optional[float]]]) -> int:
+        """
+        Load (key, value, age_seconds, ttl) entries, e.g. from a snapshot.
+
+        Ages and per-entry TTLs are preserved, so restored values expire and
+        go stale on the same schedule as if they had never left memory.
+        Existing keys and entries too old to serve are skipped. Returns how
+        many were loaded.
+        """
+        loaded = 0
+        with self._lock:
+            now = self._clock()
+            for key, value, age, ttl in sorted(items, key=lambda item: -item[2]):
+                entry = _Entry(value, now - max(age, 0.0), ttl)
+                if value is None or key in self._data or age >= self._ttl(entry) + self.stale_ttl:
+                    continue
+                self._data[key] = entry
+                loaded += 1
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+        return loaded
+
+    def _ttl(self, entry: _Entry) -> float:
+        return self.ttl if entry.ttl is None else entry.ttl
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._refreshing.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = (
+                self._stats["hits"]
+                + self._stats["negative_hits"]
+                + self._stats["stale_hits"]
+                + self._stats["misses"]
+            )
+            served = lookups - self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "refreshing": len(self._refreshing),
+                "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,446 @@
+"""
+Offline UDISE+ aggregates for the city evidence service.
+
+The raw UDISE+ exports in backend/dataset (`*_prof1.csv` school profiles,
+`*_tch.csv` teachers, `*_enr1.csv` enrolment; together close to 1 GB) are
+reduced once to a compact per-area table, where an area is a
+(state, district, block, urban local body) combination. Each area carries
+the school counts and the teacher/enrolment totals that the education and
+communities sections sum over, so serving never needs the raw files.
+
+The artifact (dataset_cache/udise_areas.npz) records the size/mtime of the
+CSVs it was built from. When the CSVs are present and have changed, it is
+rebuilt on first use; when they are absent, the artifact is used as is.
+The Docker image builds the artifact in a build stage and leaves the raw
+CSVs out, so deployments only carry the artifact.
+
+Usage (from backend/):
+    python -m app.services.udise_artifacts
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.services.city_data import INDIAN_CITIES_DATA
+from app.services.single_flight import single_flight
+
+logger = logging.getLogger(__name__)
+
+DATASET_DIR = Path(__file__).resolve().parent.parent.parent / "dataset"
+CACHE_DIR = Path(__file__).resolve().parent.parent.parent / "dataset_cache"
+ARTIFACT_FILE = CACHE_DIR / "udise_areas.npz"
+ARTIFACT_VERSION = 1
+CHUNK_ROWS = 200_000  # rows per pandas chunk when reading the raw CSVs
+
+RAW_PATTERNS = ("*_prof1.csv", "*_tch.csv", "*_enr1.csv")
+AREA_KEYS = ("state_norm", "district", "district_norm", "block_norm", "ulb_norm")
+AREA_FIELDS = (
+    "schools",
+    "urban_schools",
+    "minority_schools",
+    "pre_primary_schools",
+    "approachable_schools",
+    "total_teachers",
+    "female_teachers",
+    "trained_teachers",
+    "postgraduate_teachers",
+    "social_enrollment_estimate",
+    "minority_enrollment_estimate",
+)
+
+
+def _normalize(value: str | None) -> str:
+    if not value:
+        return ""
+    value = value.strip().lower()
+    value = value.replace("&", " and ")
+    value = re.sub(r"[^a-z0-9 ]+", " ", value)
+    value = re.sub(r"\s+", " ", value)
+    return value.strip()
+
+
+def _as_int(value: str | None) -> int:
+    if value is None:
+        return 0
+    value = value.strip()
+    if not value or value == "0":
+        return 0
+    try:
+        return int(float(value))
+    except ValueError:
+        return 0
+
+
+def _compute_relevant_state_norms() -> Set[str]:
+    """Pre-compute the set of normalised state names we actually need."""
+    return {_normalize(city.get("state")) for city in INDIAN_CITIES_DATA if city.get("state")}
+
+
+_RELEVANT_STATE_NORMS: Set[str] = _compute_relevant_state_norms()
+
+
+# ---------------------------------------------------------------------------
+# Raw CSV readers (build step only; chunked, column-projected)
+# ---------------------------------------------------------------------------
+
+def _raw_paths(dataset_dir: Path) -> List[Path]:
+    return sorted(path for pattern in RAW_PATTERNS for path in dataset_dir.glob(pattern))
+
+
+def raw_signature(dataset_dir: Path = DATASET_DIR) -> Dict[str, Dict[str, int]]:
+    """Size/mtime of the raw UDISE CSVs, keyed like the description cache signature."""
+    signature: Dict[str, Dict[str, int]] = {}
+    for path in _raw_paths(dataset_dir):
+        stat = path.stat()
+        signature[path.name] = {"size": int(stat.st_size), "mtime_ns": int(stat.st_mtime_ns)}
+    return signature
+
+
+def normalize_series(values: pd.Series) -> pd.Series:
+    """`_normalize` applied once per distinct value and mapped back."""
+    uniques = pd.unique(values)
+    return values.map({value: _normalize(value) for value in uniques})
+
+
+def as_int_series(values: pd.Series) -> pd.Series:
+    """Vectorized `_as_int`: numeric cells truncated toward zero, anything else 0."""
+    numeric = np.asarray(pd.to_numeric(values, errors="coerce"), dtype=np.float64)
+    numeric = np.where(np.isfinite(numeric), numeric, 0.0)
+    return pd.Series(np.trunc(numeric).astype(np.int64), index=values.index)
+
+
+def _read_chunks(
+    path: Path,
+    usecols: Optional[Iterable[str]] = None,
+    dtype: Union[type, Dict[Hashable, Any], None] = None,
+    chunk_rows: int = CHUNK_ROWS,
+    text: bool = True,
+) -> Iterator[pd.DataFrame]:
+    # text=True keeps empty / "NA" cells as strings, like csv.DictReader did
+    yield from pd.read_csv(
+        path,
+        usecols=list(usecols) if usecols is not None else None,
+        dtype=dtype,
+        keep_default_na=not text,
+        encoding="utf-8-sig",
+        chunksize=chunk_rows,
+    )
+
+
+def _keep_last(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate and keep the last row per index value (later files/rows win)."""
+    frame = pd.concat(frames)
+    return frame.loc[~frame.index.duplicated(keep="last")]
+
+
+def read_profile_frame(dataset_dir: Path = DATASET_DIR, chunk_rows: int = CHUNK_ROWS) -> pd.DataFrame:
+    """School profiles in registry states, one row per pseudocode: area keys + 0/1 flags."""
+    t0 = time.time()
+    flags = {
+        "rural_urban": ("urban_schools", "2"),
+        "minority_school": ("minority_schools", "1"),
+        "pre_primary": ("pre_primary_schools", "1"),
+        "approachable_road": ("approachable_schools", "1"),
+    }
+    columns = ["pseudocode", "state", "district", "block", "lgd_urban_local_body_name", *flags]
+    frames: List[pd.DataFrame] = []
+    skipped = 0
+    for path in sorted(dataset_dir.glob("*_prof1.csv")):
+        for chunk in _read_chunks(path, columns, str, chunk_rows):
+            state_norm = normalize_series(chunk.loc[:, "state"])
+            relevant = state_norm.isin(_RELEVANT_STATE_NORMS).to_numpy()
+            skipped += int((~relevant).sum())
+            pseudocode = chunk["pseudocode"].str.strip()
+            keep = relevant & (pseudocode != "").to_numpy()
+            rows = chunk.loc[keep]
+            frame = pd.DataFrame(
+                {
+                    "state_norm": state_norm.loc[keep],
+                    "district": rows["district"].str.strip(),
+                    "district_norm": normalize_series(rows["district"]),
+                    "block_norm": normalize_series(rows["block"]),
+                    "ulb_norm": normalize_series(rows["lgd_urban_local_body_name"]),
+                    **{
+                        field: (rows[column].str.strip() == flag).astype(np.int64)
+                        for column, (field, flag) in flags.items()
+                    },
+                }
+            ).set_axis(pd.Index(pseudocode.loc[keep], name="pseudocode"))
+            frames.append(frame)
+    if frames:
+        profile = _keep_last(frames)
+    else:
+        profile = pd.DataFrame(columns=[*AREA_KEYS, *(field for field, _ in flags.values())])
+    logger.info(
+        "UDISE profile: kept %d rows, skipped %d irrelevant-state rows (%.1fs)",
+        len(profile), skipped, time.time() - t0,
+    )
+    return profile
+
+
+def read_teacher_frame(
+    relevant: pd.Index,
+    dataset_dir: Path = DATASET_DIR,
+    chunk_rows: int = CHUNK_ROWS,
+) -> pd.DataFrame:
+    """Teacher counts per relevant pseudocode (the last row for a pseudocode wins)."""
+    t0 = time.time()
+    fields = {
+        "total_tch": "total_teachers",
+        "female": "female_teachers",
+        "trained_comp": "trained_teachers",
+        "post_graduate_and_above": "postgraduate_teachers",
+    }
+    columns = ["pseudocode", *fields]
+    partials: List[pd.DataFrame] = []
+    skipped = 0
+    for path in sorted(dataset_dir.glob("*_tch.csv")):
+        for chunk in _read_chunks(path, columns, str, chunk_rows):
+            pseudocode = chunk["pseudocode"].str.strip()
+            keep = pseudocode.isin(relevant).to_numpy()
+            skipped += int((~keep).sum())
+            rows = chunk.loc[keep]
+            frame = pd.DataFrame(
+                {field: as_int_series(rows[column]) for column, field in fields.items()}
+            ).set_axis(pd.Index(pseudocode.loc[keep], name="pseudocode"))
+            partials.append(frame)
+    if partials:
+        teachers = _keep_last(partials)
+    else:
+        teachers = pd.DataFrame(columns=list(fields.values()), dtype=np.int64)
+    logger.info(
+        "UDISE teachers: kept %d rows, skipped %d (%.1fs)",
+        len(teachers), skipped, time.time() - t0,
+    )
+    return teachers
+
+
+def read_enrollment_frame(
+    relevant: pd.Index,
+    dataset_dir: Path = DATASET_DIR,
+    chunk_rows: int = CHUNK_ROWS,
+) -> pd.DataFrame:
+    """
+    Social (item_group 1) and minority (item_group 5) enrolment per relevant pseudocode.
+
+    Each row contributes the sum of all its numeric columns; cells are
+    truncated to integers first, as the per-row reader did.
+    """
+    t0 = time.time()
+    groups = {"1": "social_enrollment_estimate", "5": "minority_enrollment_estimate"}
+    totals: Optional[pd.DataFrame] = None
+    skipped = 0
+    for path in sorted(dataset_dir.glob("*_enr1.csv")):
+        header = pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns
+        numeric = [column for column in header if column not in {"pseudocode", "item_group", "item_id"}]
+        dtype: Dict[Hashable, Any] = {"pseudocode": str, "item_group": str, "item_id": str}
+        for chunk in _read_chunks(path, None, dtype, chunk_rows, text=False):
+            pseudocode = chunk["pseudocode"].str.strip()
+            keep = pseudocode.isin(relevant).to_numpy()
+            skipped += int((~keep).sum())
+            rows = chunk.loc[keep]
+            values = rows[numeric]
+            if not all(pd.api.types.is_numeric_dtype(values[column]) for column in numeric):
+                values = pd.DataFrame(values.apply(as_int_series))
+            row_total = np.trunc(values.fillna(0).to_numpy(dtype=np.float64)).sum(axis=1).astype(np.int64)
+            frame = pd.DataFrame(
+                {"pseudocode": pseudocode.loc[keep], "group": rows["item_group"].str.strip(), "total": row_total}
+            )
+            frame = frame.loc[frame["group"].isin(groups)]
+            sums = pd.Series(frame.groupby(["pseudocode", "group"])["total"].sum())
+            partial = sums.unstack(fill_value=0)
+            totals = partial if totals is None else totals.add(partial, fill_value=0)
+    enrollment = pd.DataFrame(
+        {
+            field: (totals[group] if totals is not None and group in totals else pd.Series(dtype=np.int64))
+            for group, field in groups.items()
+        }
+    ).fillna(0).astype(np.int64)
+    logger.info(
+        "UDISE enrollment: kept %d pseudocodes, skipped %d rows (%.1fs)",
+        len(enrollment), skipped, time.time() - t0,
+    )
+    return enrollment
+
+
+def aggregate_areas(
+    profile: pd.DataFrame,
+    teachers: pd.DataFrame,
+    enrollment: pd.DataFrame,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum per-school figures into (area keys, area counts) arrays sorted by area."""
+    schools = profile.join(teachers, how="left").join(enrollment, how="left")
+    schools["schools"] = 1
+    for field in AREA_FIELDS:
+        if field not in schools:
+            schools[field] = 0
+    schools[list(AREA_FIELDS)] = schools[list(AREA_FIELDS)].fillna(0).astype(np.int64)
+    areas = pd.DataFrame(schools.groupby(list(AREA_KEYS), sort=True)[list(AREA_FIELDS)].sum())
+    keys = np.array(areas.index.tolist(), dtype=str).reshape(len(areas), len(AREA_KEYS))
+    return keys, areas.to_numpy(dtype=np.int64)
+
+
+# ---------------------------------------------------------------------------
+# Artifact
+# ---------------------------------------------------------------------------
+
+class UdiseAreas:
+    """Per-area UDISE aggregates as parallel arrays."""
+
+    def __init__(self, keys: np.ndarray, counts: np.ndarray, meta: Dict[str, Any]) -> None:
+        self.keys = keys
+        self.counts = counts
+        self.meta = meta
+
+    @property
+    def sources(self) -> Dict[str, Dict[str, int]]:
+        return self.meta.get("sources", {})
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """One dict per area with the AREA_KEYS and AREA_FIELDS entries."""
+        key_lists = self.keys.tolist()
+        count_lists = self.counts.tolist()
+        return [
+            {**dict(zip(AREA_KEYS, key)), **dict(zip(AREA_FIELDS, counts))}
+            for key, counts in zip(key_lists, count_lists)
+        ]
+
+
+def save_artifact(areas: UdiseAreas, path: Path = ARTIFACT_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as file:
+        np.savez_compressed(
+            file,
+            keys=areas.keys,
+            counts=areas.counts,
+            meta=np.array(json.dumps(areas.meta)),
+        )
+    os.replace(tmp_path, path)
+
+
+def load_artifact(path: Path = ARTIFACT_FILE) -> Optional[UdiseAreas]:
+    if not path.exists():
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != ARTIFACT_VERSION or meta.get("fields") != list(AREA_FIELDS):
+                logger.warning("Ignoring UDISE artifact %s with unexpected layout", path.name)
+                return None
+            return UdiseAreas(data["keys"], data["counts"], meta)
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Failed to load UDISE artifact %s: %s", path.name, exc)
+        return None
+
+
+def write_artifact(
+    sources: Dict[str, Dict[str, int]],
+    profile: pd.DataFrame,
+    teachers: pd.DataFrame,
+    enrollment: pd.DataFrame,
+    path: Path = ARTIFACT_FILE,
+) -> UdiseAreas:
+    """Aggregate already-read frames (built from *sources*) and write the artifact."""
+    keys, counts = aggregate_areas(profile, teachers, enrollment)
+    areas = UdiseAreas(
+        keys,
+        counts,
+        {
+            "version": ARTIFACT_VERSION,
+            "built_at": time.time(),
+            "sources": sources,
+            "key_fields": list(AREA_KEYS),
+            "fields": list(AREA_FIELDS),
+        },
+    )
+    save_artifact(areas, path)
+    return areas
+
+
+def build_artifact(
+    dataset_dir: Path = DATASET_DIR,
+    path: Path = ARTIFACT_FILE,
+    chunk_rows: int = CHUNK_ROWS,
+) -> UdiseAreas:
+    """Read the raw UDISE CSVs under *dataset_dir* and write the area artifact."""
+    t0 = time.time()
+    sources = raw_signature(dataset_dir)
+    profile = read_profile_frame(dataset_dir, chunk_rows)
+    areas = write_artifact(
+        sources,
+        profile,
+        read_teacher_frame(profile.index, dataset_dir, chunk_rows),
+        read_enrollment_frame(profile.index, dataset_dir, chunk_rows),
+        path,
+    )
+    logger.info(
+        "UDISE artifact: %d schools in %d areas written to %s (%.1fs)",
+        int(areas.counts[:, 0].sum()) if len(areas) else 0, len(areas), path.name, time.time() - t0,
+    )
+    return areas
+
+
+def artifact_is_current(dataset_dir: Path = DATASET_DIR, path: Path = ARTIFACT_FILE) -> bool:
+    """False only if raw CSVs are present and the artifact is missing or built from others."""
+    raw = raw_signature(dataset_dir)
+    if not raw:
+        return True
+    areas = load_artifact(path)
+    return areas is not None and areas.sources == raw
+
+
+@single_flight
+def get_udise_areas() -> Optional[UdiseAreas]:
+    """
+    The current area artifact.
+
+    Rebuilt from the raw CSVs only if they are present and differ from the
+    ones the artifact was built from; None if there is neither.
+    """
+    areas = load_artifact(ARTIFACT_FILE)
+    raw = raw_signature(DATASET_DIR)
+    if raw and (areas is None or areas.sources != raw):
+        logger.info("UDISE artifact missing or stale; rebuilding from raw CSVs")
+        return build_artifact(DATASET_DIR, ARTIFACT_FILE)
+    if areas is None:
+        logger.warning("No UDISE artifact at %s and no raw UDISE CSVs", ARTIFACT_FILE)
+    return areas
+
+
+def udise_source_signature() -> Dict[str, Dict[str, int]]:
+    """Raw-file signature the served UDISE data corresponds to (empty without data)."""
+    areas = get_udise_areas()
+    return dict(areas.sources) if areas is not None else {}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build the UDISE+ per-area artifact from raw CSVs.")
+    parser.add_argument("--dataset-dir", type=Path, default=DATASET_DIR)
+    parser.add_argument("--out", type=Path, default=ARTIFACT_FILE)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s  %(name)s  %(message)s")
+    if not raw_signature(args.dataset_dir):
+        parser.error(f"no UDISE CSVs ({', '.join(RAW_PATTERNS)}) under {args.dataset_dir}")
+    areas = build_artifact(args.dataset_dir, args.out, args.chunk_rows)
+    print(f"{len(areas)} areas, {os.path.getsize(args.out):,} bytes → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
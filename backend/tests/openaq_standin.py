@@ -0,0 +1,350 @@
+"""
+Local OpenAQ v3 stand-in server for load and integration testing.
+
+Serves the subset of the OpenAQ v3 API used by services/openaq_service.py
+from recorded fixtures (tests/fixtures/openaq/):
+
+  - GET /locations?coordinates=lat,lon&radius=m&limit=n
+  - GET /sensors/{sensor_id}/measurements?limit=n
+  - GET /parameters/2/latest?bbox=minLon,minLat,maxLon,maxLat&limit=n&page=p
+
+Faults can be injected on every API request: fixed + jittered latency, a
+5xx error rate and a 429 rate-limit rate (with Retry-After). Fixture
+timestamps are shifted so the newest reading is "now" at server start.
+
+Usage (from backend/):
+    python -m tests.openaq_standin --port 8099 --latency-ms 80 --error-rate 0.02
+    OPENAQ_BASE_URL=http://127.0.0.1:8099 OPENAQ_API_KEY=dummy uvicorn app.main:app
+
+Fixtures can be re-recorded from the real API (uses OPENAQ_API_KEY):
+    python -m tests.openaq_standin --record
+
+Runtime knobs: GET/PUT /_standin/config and GET /_standin/stats.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+import numpy as np
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.aqi_history import parse_timestamp
+from app.services.aqi_spatial import haversine_matrix
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "openaq"
+PM25_PARAMETER_ID = 2
+
+
+@dataclass
+class StandinConfig:
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0  # share of requests answered with 503
+    rate_limit_rate: float = 0.0  # share of requests answered with 429
+    retry_after_s: int = 1
+    seed: Optional[int] = None
+
+
+def _load_fixtures(fixtures_dir: Path) -> Dict[str, Any]:
+    locations = json.loads((fixtures_dir / "locations.json").read_text(encoding="utf-8"))["results"]
+    measurements = json.loads((fixtures_dir / "measurements.json").read_text(encoding="utf-8"))
+    return {
+        "locations": locations,
+        "measurements": {int(sensor_id): rows for sensor_id, rows in measurements.items()},
+    }
+
+
+def _shift_iso(value: str, offset: int) -> str:
+    ts = parse_timestamp(value) + offset
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _rebase_timestamps(measurements: Dict[int, List[dict]]) -> None:
+    """Shift every measurement period so the newest one ends now."""
+    stamps = [
+        parse_timestamp(row["period"]["datetimeTo"]["utc"])
+        for rows in measurements.values()
+        for row in rows
+    ]
+    if not stamps:
+        return
+    offset = int(datetime.now(timezone.utc).timestamp()) - max(stamps)
+    for rows in measurements.values():
+        for row in rows:
+            for edge in ("datetimeFrom", "datetimeTo"):
+                moment = row["period"][edge]
+                moment["utc"] = _shift_iso(moment["utc"], offset)
+                moment["local"] = moment["utc"]
+
+
+def _pm25_sensor_ids(location: dict) -> List[int]:
+    return [
+        sensor["id"]
+        for sensor in location.get("sensors", [])
+        if sensor.get("parameter", {}).get("id") == PM25_PARAMETER_ID
+    ]
+
+
+def install_fault_injection(app: FastAPI, config: StandinConfig) -> Counter:
+    """
+    Add latency/error/429 injection to every non-/_standin route of *app*,
+    plus the /_standin/config and /_standin/stats endpoints. Returns the
+    request counters.
+    """
+    rng = random.Random(config.seed)
+    stats: Counter = Counter()
+    app.state.config = config
+    app.state.stats = stats
+
+    @app.middleware("http")
+    async def _inject_faults(request: Request, call_next):
+        if request.url.path.startswith("/_standin"):
+            return await call_next(request)
+        stats["requests"] += 1
+        cfg: StandinConfig = app.state.config
+        delay_ms = cfg.latency_ms + rng.uniform(0.0, cfg.latency_jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000.0)
+        roll = rng.random()
+        if roll < cfg.rate_limit_rate:
+            stats["rate_limited"] += 1
+            return JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": str(cfg.retry_after_s)},
+            )
+        if roll < cfg.rate_limit_rate + cfg.error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"detail": "Injected server error"}, status_code=503)
+        return await call_next(request)
+
+    @app.get("/_standin/config")
+    async def read_config():
+        return asdict(app.state.config)
+
+    @app.put("/_standin/config")
+    async def update_config(changes: Dict[str, Any]):
+        current = asdict(app.state.config)
+        current.update({key: value for key, value in changes.items() if key in current})
+        app.state.config = StandinConfig(**current)
+        return current
+
+    @app.get("/_standin/stats")
+    async def read_stats():
+        return dict(stats)
+
+    return stats
+
+
+def create_app(
+    config: Optional[StandinConfig] = None,
+    fixtures_dir: Path = FIXTURES_DIR,
+    rebase_timestamps: bool = True,
+) -> FastAPI:
+    """Build the stand-in ASGI app over the fixtures in *fixtures_dir*."""
+    config = config or StandinConfig()
+    fixtures = _load_fixtures(fixtures_dir)
+    if rebase_timestamps:
+        _rebase_timestamps(fixtures["measurements"])
+
+    locations: List[dict] = fixtures["locations"]
+    measurements: Dict[int, List[dict]] = fixtures["measurements"]
+    loc_lats = np.array([loc["coordinates"]["latitude"] for loc in locations])
+    loc_lons = np.array([loc["coordinates"]["longitude"] for loc in locations])
+
+    app = FastAPI(title="OpenAQ v3 stand-in")
+    install_fault_injection(app, config)
+
+    def _page(results: List[dict], limit: int, page: int) -> Dict[str, Any]:
+        start = (page - 1) * limit
+        return {
+            "meta": {"name": "openaq-api", "page": page, "limit": limit, "found": len(results)},
+            "results": results[start:start + limit],
+        }
+
+    @app.get("/locations")
+    async def get_locations(
+        coordinates: Optional[str] = None,
+        radius: int = Query(default=25000, le=25000),
+        parameters_id: Optional[int] = None,
+        limit: int = Query(default=100, ge=1, le=1000),
+        page: int = Query(default=1, ge=1),
+    ):
+        candidates = list(range(len(locations)))
+        if coordinates:
+            lat, lon = (float(part) for part in coordinates.split(","))
+            distances = haversine_matrix([lat], [lon], loc_lats, loc_lons)[0]
+            candidates = [int(i) for i in np.argsort(distances) if distances[i] * 1000.0 <= radius]
+        results = [locations[i] for i in candidates]
+        if parameters_id is not None:
+            results = [
+                loc for loc in results
+                if any(s.get("parameter", {}).get("id") == parameters_id for s in loc.get("sensors", []))
+            ]
+        return _page(results, limit, page)
+
+    @app.get("/sensors/{sensor_id}/measurements")
+    async def get_measurements(
+        sensor_id: int,
+        limit: int = Query(default=100, ge=1, le=1000),
+        page: int = Query(default=1, ge=1),
+    ):
+        return _page(measurements.get(sensor_id, []), limit, page)
+
+    @app.get("/parameters/{parameter_id}/latest")
+    async def get_parameter_latest(
+        parameter_id: int,
+        bbox: Optional[str] = None,
+        limit: int = Query(default=100, ge=1, le=1000),
+        page: int = Query(default=1, ge=1),
+    ):
+        edges = [float(part) for part in bbox.split(",")] if bbox else None
+        results = []
+        if parameter_id == PM25_PARAMETER_ID:
+            for loc in locations:
+                lat = loc["coordinates"]["latitude"]
+                lon = loc["coordinates"]["longitude"]
+                if edges and not (edges[0] <= lon <= edges[2] and edges[1] <= lat <= edges[3]):
+                    continue
+                for sensor_id in _pm25_sensor_ids(loc):
+                    rows = measurements.get(sensor_id)
+                    if not rows:
+                        continue
+                    moment = rows[0]["period"]["datetimeTo"]
+                    results.append({
+                        "datetime": {"utc": moment["utc"], "local": moment["local"]},
+                        "value": rows[0]["value"],
+                        "coordinates": {"latitude": lat, "longitude": lon},
+                        "sensorsId": sensor_id,
+                        "locationsId": loc["id"],
+                    })
+        return _page(results, limit, page)
+
+    return app
+
+
+@contextmanager
+def serve_in_thread(app: FastAPI) -> Iterator[str]:
+    """Run *app* with uvicorn on a free local port; yields its base URL."""
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.02)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+def record_fixtures(
+    base_url: str,
+    api_key: str,
+    fixtures_dir: Path = FIXTURES_DIR,
+    max_sensors_per_city: int = 5,
+) -> None:
+    """Record /locations and latest measurements for every registered city."""
+    from app.services.openaq_service import SEARCH_RADIUS_M, _CITY_COORDS
+
+    headers = {"X-API-Key": api_key, "Accept": "application/json"}
+    locations: Dict[int, dict] = {}
+    measurements: Dict[str, List[dict]] = {}
+    with httpx.Client(base_url=base_url.rstrip("/"), headers=headers, timeout=30.0) as client:
+        for city, (lat, lon) in _CITY_COORDS.items():
+            resp = client.get("/locations", params={
+                "coordinates": f"{lat},{lon}",
+                "radius": SEARCH_RADIUS_M,
+                "parameters_id": PM25_PARAMETER_ID,
+                "limit": 10,
+            })
+            resp.raise_for_status()
+            city_locations = resp.json().get("results", [])
+            print(f"{city}: {len(city_locations)} locations")
+            for loc in city_locations:
+                locations[loc["id"]] = loc
+                for sensor_id in _pm25_sensor_ids(loc)[:max_sensors_per_city]:
+                    if str(sensor_id) in measurements:
+                        continue
+                    meas = client.get(f"/sensors/{sensor_id}/measurements", params={"limit": 1})
+                    if meas.status_code == 200:
+                        measurements[str(sensor_id)] = meas.json().get("results", [])
+
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    (fixtures_dir / "locations.json").write_text(
+        json.dumps({"results": list(locations.values())}, indent=1, ensure_ascii=False), encoding="utf-8"
+    )
+    (fixtures_dir / "measurements.json").write_text(
+        json.dumps(measurements, indent=1, ensure_ascii=False), encoding="utf-8"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    parser.add_argument("--no-rebase", action="store_true", help="serve fixture timestamps unchanged")
+    parser.add_argument("--record", action="store_true", help="re-record fixtures from the real API")
+    parser.add_argument("--record-from", default="https://api.openaq.org/v3")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        api_key = os.getenv("OPENAQ_API_KEY")
+        if not api_key:
+            parser.error("OPENAQ_API_KEY must be set to record fixtures")
+        record_fixtures(args.record_from, api_key, args.fixtures)
+        return
+
+    import uvicorn
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_s=args.retry_after,
+        seed=args.seed,
+    )
+    app = create_app(config, args.fixtures, rebase_timestamps=not args.no_rebase)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
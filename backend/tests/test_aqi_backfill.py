@@ -0,0 +1,92 @@
+"""
+Unit tests for services/aqi_backfill.py
+
+Tests cover:
+1. Chunked per-file aggregation: PM2.5 filtering, station → city mapping,
+   hourly buckets
+2. Backfill into the history store with rollups, in-process and across
+   worker processes
+3. Idempotent re-runs and malformed files
+"""
+
+import gzip
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.aqi_backfill import aggregate_file, backfill
+from app.services.aqi_history import AQIHistoryStore
+from app.services.openaq_service import pm25_to_aqi
+
+HEADER = "location_id,sensors_id,location,datetime,lat,lon,parameter,units,value\n"
+HOUR = 1_704_067_200  # 2024-01-01T00:00:00Z
+
+
+def _write_archive(path, rows):
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        fh.write(HEADER)
+        for row in rows:
+            fh.write(",".join(str(v) for v in row) + "\n")
+
+
+def _delhi_day(location_id, day="2024-01-01", value=100.0):
+    rows = []
+    for hour in range(24):
+        ts = f"{day}T{hour:02d}:00:00+05:30"
+        rows.append((location_id, 1, "Delhi Stn", ts, 28.63, 77.22, "pm25", "µg/m³", value))
+        rows.append((location_id, 2, "Delhi Stn", ts, 28.63, 77.22, "pm10", "µg/m³", 300.0))
+    return rows
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AQIHistoryStore(tmp_path / "aqi_history.sqlite3")
+    yield store
+    store.close()
+
+
+def test_aggregate_file_filters_and_maps(tmp_path):
+    path = tmp_path / "location-1-20240101.csv.gz"
+    rows = _delhi_day(1) + [
+        (9, 9, "Remote", "2024-01-01T00:00:00Z", 20.0, 90.0, "pm25", "µg/m³", 50.0),  # no city nearby
+        (1, 1, "Delhi Stn", "2024-01-01T00:00:00Z", 28.63, 77.22, "pm25", "µg/m³", -1.0),  # invalid
+    ]
+    _write_archive(path, rows)
+
+    result = aggregate_file(path, chunk_rows=10)  # force several chunks
+
+    assert result.error is None
+    assert result.rows_read == len(rows)
+    assert result.rows_used == 24
+    assert {city for city, *_ in result.buckets} == {"Delhi"}
+    city, bucket, count, pm25_sum, pm25_min, pm25_max, aqi_sum = min(result.buckets, key=lambda b: b[1])
+    assert bucket == HOUR - 6 * 3600  # 00:00 IST → 18:30 UTC, floored to the hour
+    assert (count, pm25_sum, pm25_min, pm25_max) == (1, 100.0, 100.0, 100.0)
+    assert round(aqi_sum) == pm25_to_aqi(100.0)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_backfill_writes_rollups_once(tmp_path, store, workers):
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    _write_archive(archive / "location-1-20240102.csv.gz", _delhi_day(1, "2024-01-02", 100.0))
+    _write_archive(archive / "location-2-20240102.csv.gz", _delhi_day(2, "2024-01-02", 50.0))
+    (archive / "broken.csv.gz").write_bytes(b"not gzip")
+
+    totals = backfill([archive], store=store, workers=workers, chunk_rows=16)
+
+    assert totals["files"] == 3
+    assert totals["ingested"] == 2
+    assert totals["failed"] == 1
+    assert totals["rows_used"] == 48
+    day = store.query("Delhi", HOUR, HOUR + 3 * 86400, "daily")
+    assert sum(bucket["count"] for bucket in day) == 48
+    hourly = store.query("Delhi", HOUR, HOUR + 3 * 86400, "hourly")
+    assert all(bucket["pm25_mean"] == 75.0 for bucket in hourly)
+
+    again = backfill([archive], store=store, workers=workers)
+    assert again["files"] == 1  # only the broken file is retried
+    assert again["ingested"] == 0
@@ -0,0 +1,69 @@
+"""
+Unit tests for services/aqi_engine.py
+
+Tests cover:
+1. US EPA PM2.5 breakpoints, including the gaps between segments, and
+   non-finite readings treated as missing
+2. Indian CPCB NAQI breakpoints
+3. Dominant pollutant selection with missing readings
+4. Inverting sub-indices back to concentrations
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.aqi_engine import compute_aqi, concentration_from_index, sub_index
+from app.services.openaq_service import pm25_to_aqi
+
+
+def test_pm25_matches_epa_breakpoints():
+    # Hand-computed from the EPA PM2.5 table; 12.05 and 55.45 fall in the gaps
+    # between published segments and interpolate within the next segment
+    values = [0.0, 5.0, 12.0, 12.05, 20.0, 35.4, 45.0, 55.45, 150.4, 600.0]
+    expected = [0, 21, 50, 51, 68, 100, 124, 151, 200, 500]
+    assert np.round(sub_index(np.array(values), "pm25")).astype(int).tolist() == expected
+    assert [pm25_to_aqi(value) for value in values] == expected
+
+
+def test_pm25_to_aqi_missing_readings():
+    assert pm25_to_aqi(float("nan")) is None
+    assert pm25_to_aqi(float("inf")) is None
+    assert pm25_to_aqi(-5.0) == 0
+
+
+def test_naqi_breakpoints():
+    result = sub_index([15.0, 60.0, 90.0, 300.0], "pm25", scale="in_naqi")
+    assert result.tolist() == pytest.approx([25.0, 100.0, 200.0, 438.6], abs=0.01)
+    assert sub_index(2.0, "co", scale="in_naqi") == pytest.approx(100.0)
+
+
+def test_dominant_pollutant_ignores_missing_readings():
+    result = compute_aqi(
+        {
+            "pm25": [80.0, np.nan, np.nan],
+            "pm10": [120.0, 300.0, np.nan],
+            "no2": [20.0, np.nan, np.nan],
+        },
+        scale="in_naqi",
+    )
+    assert result.dominant.tolist() == ["pm25", "pm10", None]
+    assert result.aqi[0] == pytest.approx(result.sub_indices["pm25"][0])
+    assert result.aqi[1] == pytest.approx(250.0)
+    assert np.isnan(result.aqi[2])
+
+
+def test_concentration_from_index_round_trips():
+    pm25 = np.array([3.0, 20.0, 45.0, 100.0, 300.0])
+    for scale in ("us_epa", "in_naqi"):
+        indices = sub_index(pm25, "pm25", scale)
+        assert np.allclose(concentration_from_index(indices, "pm25", scale), pm25)
+
+
+def test_unknown_pollutant_is_rejected():
+    with pytest.raises(ValueError):
+        compute_aqi({"pm1": [1.0]})
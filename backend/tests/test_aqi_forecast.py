@@ -0,0 +1,129 @@
+"""
+Unit tests for services/aqi_forecast.py
+
+Tests cover:
+1. Seasonal profile + smoothed level recovered from a clean daily cycle
+2. Vectorized fit across cities with gaps and cities without history
+3. Forecasts built from the history store and cached lookups
+4. No on-demand rebuild right after a failed build; peeks never build
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services import aqi_forecast
+from app.services.aqi_forecast import (
+    FORECAST_HORIZON_HOURS,
+    build_forecasts,
+    clear_forecasts,
+    fit_forecasts,
+    get_forecast,
+    peek_forecast,
+)
+from app.services.aqi_history import AQIHistoryStore
+
+NOW = 1_736_942_400  # 2025-01-15T12:00:00Z
+
+
+def _daily_cycle(start_hour, n_hours, base, amplitude):
+    hours = (start_hour + np.arange(n_hours)) % 24
+    return base + amplitude * np.sin(2 * np.pi * hours / 24)
+
+
+def test_fit_recovers_daily_cycle():
+    start_hour = NOW // 3600 - 240
+    history = np.vstack([
+        _daily_cycle(start_hour, 240, 80.0, 20.0),
+        _daily_cycle(start_hour, 240, 30.0, 5.0),
+    ])
+    forecast, sigma = fit_forecasts(history, start_hour, horizon=48)
+
+    expected = np.vstack([
+        _daily_cycle(start_hour + 240, 48, 80.0, 20.0),
+        _daily_cycle(start_hour + 240, 48, 30.0, 5.0),
+    ])
+    assert forecast.shape == (2, 48)
+    assert np.allclose(forecast, expected, atol=0.5)
+    assert np.all(sigma < 0.5)
+
+
+def test_fit_handles_gaps_and_empty_rows():
+    start_hour = NOW // 3600 - 96
+    history = np.full((2, 96), np.nan)
+    history[0, ::3] = 50.0  # sparse but constant
+    forecast, _ = fit_forecasts(history, start_hour, horizon=24)
+
+    assert np.allclose(forecast[0], 50.0)
+    assert np.allclose(forecast[1], 0.0)  # no history -> no NaNs leak out
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AQIHistoryStore(tmp_path / "aqi_history.sqlite3")
+    yield store
+    store.close()
+
+
+def test_build_forecasts_from_store(store):
+    readings = [
+        ("Delhi", "s1", NOW - h * 3600, 100.0, 174.0) for h in range(1, 73)
+    ] + [
+        ("Shimla", "s2", NOW - h * 3600, 10.0, 42.0) for h in range(1, 6)  # too little history
+    ]
+    store.append_many(readings)
+
+    forecasts = build_forecasts(["Delhi", "Shimla"], store=store, now=NOW)
+
+    assert set(forecasts) == {"delhi"}
+    delhi = forecasts["delhi"]
+    assert len(delhi["hourly"]) == FORECAST_HORIZON_HOURS
+    assert delhi["hourly"][0]["ts"] == NOW + 3600
+    assert delhi["mean_aqi_24h"] == 174
+    assert delhi["observed_hours"] == 72
+
+
+def test_get_forecast_serves_cached_snapshot(store, monkeypatch):
+    store.append_many([("Pune", "s1", NOW - h * 3600, 40.0, 112.0) for h in range(1, 60)])
+    monkeypatch.setattr(aqi_forecast, "_registry_cities", lambda: ["Pune", "Delhi"])
+    monkeypatch.setattr(aqi_forecast, "get_history_store", lambda: store)
+    monkeypatch.setattr(aqi_forecast.time, "time", lambda: float(NOW))
+    clear_forecasts()
+
+    try:
+        assert get_forecast("pune")["mean_aqi_24h"] == 112
+        assert get_forecast("Delhi") is None
+        store.append_many([("Delhi", "s1", NOW - h * 3600, 90.0, 170.0) for h in range(1, 60)])
+        assert get_forecast("Delhi") is None  # served from the snapshot until the next refresh
+    finally:
+        clear_forecasts()
+
+
+def test_failed_build_is_not_retried_immediately(monkeypatch):
+    calls = []
+
+    def _failing_build(*args, **kwargs):
+        calls.append(1)
+        raise OSError("history store unavailable")
+
+    clock = [float(NOW)]
+    monkeypatch.setattr(aqi_forecast, "_registry_cities", lambda: ["Pune"])
+    monkeypatch.setattr(aqi_forecast, "build_forecasts", _failing_build)
+    monkeypatch.setattr(aqi_forecast.time, "time", lambda: clock[0])
+    clear_forecasts()
+
+    try:
+        assert peek_forecast("pune") is None
+        assert calls == []
+        assert get_forecast("pune") is None
+        assert get_forecast("pune") is None
+        assert len(calls) == 1
+        clock[0] += aqi_forecast.RETRY_AFTER_FAILURE_SECONDS
+        assert get_forecast("pune") is None
+        assert len(calls) == 2
+    finally:
+        clear_forecasts()
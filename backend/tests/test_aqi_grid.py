@@ -0,0 +1,54 @@
+"""
+Unit tests for services/aqi_grid.py
+
+Tests cover:
+1. Cell indexing at the grid edges and outside India
+2. Building the memory-mapped grid and O(1) point lookups
+3. get_grid() picking up a rebuilt grid file
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services import aqi_grid
+from app.services.aqi_grid import N_LAT, N_LON, build_grid, cell_index, get_grid
+
+
+def test_cell_index_bounds():
+    assert cell_index(6.0, 68.0) == (0, 0)
+    assert cell_index(37.5, 97.5) == (N_LAT - 1, N_LON - 1)
+    assert cell_index(51.5, -0.1) is None  # London
+
+
+def test_build_grid_and_lookup(tmp_path):
+    path = tmp_path / "aqi_grid.f32"
+    grid = build_grid(
+        np.array([28.6139, 28.70]), np.array([77.2090, 77.10]), np.array([100.0, 60.0]),
+        path=path, built_at=123.0,
+    )
+
+    assert path.exists() and path.with_suffix(".json").exists()
+    assert grid.built_at == 123.0
+    delhi = grid.value_at(28.6139, 77.2090)
+    assert 60.0 < delhi < 100.0
+    assert grid.value_at(12.9716, 77.5946) is None  # Bangalore: no station in range
+    assert grid.value_at(0.0, 0.0) is None
+
+
+def test_get_grid_reloads_after_rebuild(tmp_path, monkeypatch):
+    path = tmp_path / "aqi_grid.f32"
+    monkeypatch.setenv("AQI_GRID_PATH", str(path))
+    monkeypatch.setattr(aqi_grid, "_GRID", None)
+    assert get_grid() is None
+
+    build_grid(np.array([19.076]), np.array([72.8777]), np.array([30.0]), built_at=1.0)
+    assert get_grid().value_at(19.076, 72.8777) == 30.0
+
+    build_grid(np.array([19.076]), np.array([72.8777]), np.array([50.0]), built_at=2.0)
+    os.utime(path.with_suffix(".json"), ns=(1, 1))  # force a distinct mtime
+    assert get_grid().built_at == 2.0
+    assert get_grid().value_at(19.076, 72.8777) == 50.0
@@ -0,0 +1,92 @@
+"""
+Unit tests for services/aqi_history.py
+
+Tests cover:
+1. Appending readings updates hourly/daily/monthly rollups incrementally
+2. Duplicate readings are ignored
+3. Multi-year summary (average + trend) and the city_data fallback
+4. The summary threshold counts hours with readings, not raw samples
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services import aqi_history
+from app.services.aqi_history import AQIHistoryStore, get_aqi_baseline
+
+
+def _ts(year, month, day, hour=0):
+    return int(datetime(year, month, day, hour, tzinfo=timezone.utc).timestamp())
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AQIHistoryStore(tmp_path / "history.sqlite3")
+    yield store
+    store.close()
+
+
+def test_rollups_are_maintained_on_append(store):
+    store.append("Delhi", "s1", _ts(2025, 1, 1, 10), 40.0, 112)
+    store.append("Delhi", "s2", _ts(2025, 1, 1, 10) + 600, 60.0, 153)
+    store.append("Delhi", "s1", _ts(2025, 1, 2, 5), 20.0, 68)
+
+    hourly = store.query("Delhi", _ts(2025, 1, 1), _ts(2025, 1, 3), "hourly")
+    assert [row["count"] for row in hourly] == [2, 1]
+    assert hourly[0]["pm25_mean"] == 50.0
+    assert hourly[0]["pm25_min"] == 40.0
+    assert hourly[0]["pm25_max"] == 60.0
+
+    daily = store.query("Delhi", _ts(2025, 1, 1), _ts(2025, 2, 1), "daily")
+    assert [row["count"] for row in daily] == [2, 1]
+
+    monthly = store.query("Delhi", _ts(2024, 12, 1), _ts(2025, 2, 1), "monthly")
+    assert len(monthly) == 1
+    assert monthly[0]["count"] == 3
+    assert monthly[0]["aqi_mean"] == round((112 + 153 + 68) / 3, 1)
+
+
+def test_duplicate_readings_are_ignored(store):
+    assert store.append("Pune", "s1", _ts(2025, 3, 1), 30.0, 89) is True
+    assert store.append("Pune", "s1", _ts(2025, 3, 1), 30.0, 89) is False
+    assert store.query("Pune", 0, _ts(2030, 1, 1), "daily")[0]["count"] == 1
+
+
+def test_summary_average_and_trend(store, monkeypatch):
+    monkeypatch.setattr(aqi_history, "MIN_SUMMARY_HOURS", 2)
+    monkeypatch.setattr(aqi_history, "MIN_TREND_HOURS", 2)
+    # Prior year around AQI 200, last year around AQI 100 → improving
+    store.append_many([
+        ("Jaipur", "s1", _ts(2024, 3, 1), 150.0, 200),
+        ("Jaipur", "s1", _ts(2024, 6, 1), 150.0, 200),
+        ("Jaipur", "s1", _ts(2025, 3, 1), 35.0, 100),
+        ("Jaipur", "s1", _ts(2025, 6, 1), 35.0, 100),
+    ])
+
+    summary = store.summary("Jaipur", now=_ts(2025, 6, 15))
+    assert summary.avg_aqi == 150.0
+    assert summary.trend == "improving"
+    assert summary.samples == 4
+    assert store.rolling_average("Jaipur", days=30, now=_ts(2025, 6, 15)) == 100.0
+
+
+def test_summary_threshold_counts_hours(store, monkeypatch):
+    monkeypatch.setattr(aqi_history, "MIN_SUMMARY_HOURS", 24)
+    # Readings every 5 minutes for 12 hours: 144 samples but only 12 hours
+    start = _ts(2025, 6, 1)
+    store.append_many([("Pune", "s1", start + i * 300, 30.0, 89) for i in range(144)])
+    assert store.summary("Pune", now=_ts(2025, 6, 15)).avg_aqi is None
+
+    store.append_many([("Pune", "s1", start + 12 * 3600 + i * 3600, 30.0, 89) for i in range(12)])
+    assert store.summary("Pune", now=_ts(2025, 6, 15)).avg_aqi == 89.0
+
+
+def test_baseline_falls_back_to_static_values(store, monkeypatch):
+    monkeypatch.setattr(aqi_history, "_STORE", store)
+    city = {"city_name": "Shimla", "current_aqi": 48, "avg_aqi_5yr": 52.3, "aqi_trend": "stable"}
+    assert get_aqi_baseline(city) == (52.3, "stable")
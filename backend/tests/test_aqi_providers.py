@@ -0,0 +1,125 @@
+"""
+Tests for services/aqi_providers.py against the OpenAQ and WAQI stand-ins.
+
+Tests cover:
+1. Fast primary: the backup provider is never called
+2. Slow primary: the backup is fired after the hedge delay and wins, and the
+   cancelled primary call still counts towards its latency window
+3. Primary without data: the backup fills the coverage gap
+4. Quality-weighted merge of two readings
+5. A single configured provider gives the same result shape as a merge
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services import aqi_history, aqi_providers
+from app.services.aqi_history import AQIHistoryStore
+from app.services.aqi_providers import OpenAQProvider, WAQIProvider, merge_results
+from app.services.openaq_service import clear_cache, get_current_aqi
+from tests import openaq_standin, waqi_standin
+from tests.openaq_standin import StandinConfig, serve_in_thread
+
+
+@pytest.fixture(scope="module")
+def servers():
+    openaq_app = openaq_standin.create_app(StandinConfig(seed=1))
+    waqi_app = waqi_standin.create_app(StandinConfig(seed=2))
+    with serve_in_thread(openaq_app) as openaq_url, serve_in_thread(waqi_app) as waqi_url:
+        yield openaq_app, openaq_url, waqi_app, waqi_url
+
+
+@pytest.fixture(autouse=True)
+def _providers_env(servers, tmp_path, monkeypatch):
+    openaq_app, openaq_url, waqi_app, waqi_url = servers
+    openaq_app.state.config = StandinConfig(seed=1)
+    waqi_app.state.config = StandinConfig(seed=2)
+    openaq_app.state.stats.clear()
+    waqi_app.state.stats.clear()
+    for provider in aqi_providers._PROVIDERS:
+        provider._latencies.clear()
+
+    store = AQIHistoryStore(tmp_path / "aqi_history.sqlite3")
+    monkeypatch.setattr(aqi_history, "_STORE", store)
+    monkeypatch.setenv("OPENAQ_BASE_URL", openaq_url)
+    monkeypatch.setenv("OPENAQ_API_KEY", "standin-key")
+    monkeypatch.setenv("WAQI_BASE_URL", waqi_url)
+    monkeypatch.setenv("WAQI_API_TOKEN", "standin-token")
+    monkeypatch.setattr(aqi_providers, "DEFAULT_HEDGE_DELAY_S", 0.15)
+    clear_cache()
+    yield openaq_app, waqi_app
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_does_not_hedge(_providers_env, monkeypatch):
+    openaq_app, waqi_app = _providers_env
+    monkeypatch.setattr(aqi_providers, "DEFAULT_HEDGE_DELAY_S", 2.0)
+
+    result = await get_current_aqi("Delhi")
+
+    assert result["data_source"] == "openaq_live"
+    assert result["providers"] == ["openaq"]
+    assert 0 < result["quality"] <= 1
+    assert waqi_app.state.stats["requests"] == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged(_providers_env):
+    openaq_app, waqi_app = _providers_env
+    openaq_app.state.config = StandinConfig(latency_ms=1000)
+
+    result = await get_current_aqi("Mumbai")
+
+    assert result["data_source"] == "waqi_live"
+    assert result["providers"] == ["waqi"]
+    assert waqi_app.state.stats["requests"] == 1
+    openaq = aqi_providers._PROVIDERS[0]
+    assert len(openaq._latencies) == 1 and openaq._latencies[0] >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_backup_covers_missing_primary_data(_providers_env):
+    openaq_app, waqi_app = _providers_env
+
+    # The OpenAQ fixtures have no station near Pondicherry
+    result = await get_current_aqi("Pondicherry")
+
+    assert result is not None
+    assert result["data_source"] == "waqi_live"
+    assert "station_coords" not in result
+
+
+def test_merge_weights_by_quality():
+    now = datetime.now(timezone.utc).isoformat()
+    coords = (28.6139, 77.2090)
+    merged = merge_results(
+        "Delhi",
+        [
+            (OpenAQProvider(), {"pm25": 100.0, "timestamp": now, "station_id": 1}),
+            (WAQIProvider(), {"pm25": 50.0, "timestamp": now, "station_id": "waqi:1",
+                              "station_coords": (28.6139, 77.2090)}),
+        ],
+        coords,
+    )
+
+    # OpenAQ: trust 1.0 × unknown distance 0.8; WAQI: trust 0.8 × at the centre 1.0
+    assert merged["pm25"] == 75.0
+    assert merged["data_source"] == "multi_provider"
+    assert merged["providers"] == ["openaq", "waqi"]
+
+
+@pytest.mark.asyncio
+async def test_single_provider_result_shape(_providers_env, monkeypatch):
+    monkeypatch.delenv("WAQI_API_TOKEN")
+
+    result = await get_current_aqi("Delhi")
+
+    assert result["providers"] == ["openaq"]
+    assert 0 < result["quality"] <= 1
+    assert "station_coords" not in result
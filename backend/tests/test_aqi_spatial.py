@@ -0,0 +1,40 @@
+"""
+Unit tests for services/aqi_spatial.py
+
+Tests cover:
+1. Haversine distance matrix shape and known distances
+2. IDW weighting, the 1 km distance floor and the 25 km cut-off
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.aqi_spatial import haversine_matrix, idw
+
+
+def test_haversine_matrix_known_distances():
+    # Delhi and Mumbai are ~1150 km apart
+    d = haversine_matrix([28.6139, 19.0760], [77.2090, 72.8777], [28.6139], [77.2090])
+    assert d.shape == (2, 1)
+    assert d[0, 0] == 0.0
+    assert 1130 < d[1, 0] < 1170
+
+
+def test_idw_weights_and_cutoff():
+    target_lat, target_lon = np.array([10.0, 30.0]), np.array([77.0, 77.0])
+    # stations at ~0 km, ~11 km and ~111 km from the first target
+    station_lat = np.array([10.0, 10.1, 11.0])
+    station_lon = np.array([77.0, 77.0, 77.0])
+    values = np.array([100.0, 10.0, 1000.0])
+
+    estimates, counts = idw(target_lat, target_lon, station_lat, station_lon, values)
+
+    assert counts.tolist() == [2, 0]
+    # 0 km is floored to 1 km, so weights are 1 and 1/11.1²
+    w = 1.0 / 11.119 ** 2
+    assert np.isclose(estimates[0], (100.0 + 10.0 * w) / (1.0 + w), rtol=1e-3)
+    assert np.isnan(estimates[1])
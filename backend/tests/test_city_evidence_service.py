@@ -0,0 +1,124 @@
+"""
+Unit tests for the persisted description cache in services/city_evidence_service.py
+
+Tests cover:
+1. The four family variants differ in their crime section and are each
+   served from the cached section files without rebuilding
+2. A changed Census.csv rebuilds only the communities section; education
+   and hospitals are served from their cached files
+3. Live fetch errors reach the live cache instead of reading as "no data"
+"""
+
+import json
+import os
+import sys
+import types
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    import dataset.geography_fetcher  # noqa: F401
+    import dataset.nabh_fetcher  # noqa: F401
+except ImportError:
+    # Only the live sections use these fetchers; none run in these tests
+    for _module, _attr in (("dataset.geography_fetcher", "GeographyFetcher"), ("dataset.nabh_fetcher", "NABHFetcher")):
+        sys.modules.setdefault("dataset", types.ModuleType("dataset"))
+        sys.modules[_module] = types.ModuleType(_module)
+        setattr(sys.modules[_module], _attr, object)
+
+from app.services import city_evidence_service as ces
+from tests.test_description_fragments import SHARED
+
+CITIES = [
+    {"city_name": "Agra", "state": "Uttar Pradesh"},
+    {"city_name": "Mysore", "state": "Karnataka"},
+]
+VARIANTS = [(False, False), (True, False), (False, True), (True, True)]
+
+
+@pytest.fixture
+def builds(tmp_path, monkeypatch):
+    """Cache files and datasets under tmp_path; returns section build counts."""
+    dataset_dir = tmp_path / "dataset"
+    dataset_dir.mkdir()
+    (dataset_dir / "Census.csv").write_text("State,District,Literacy\nUttar Pradesh,Agra,69.4\n", encoding="utf-8")
+    monkeypatch.setattr(ces, "DATASET_DIR", dataset_dir)
+    monkeypatch.setattr(ces, "SECTION_CACHE_DIR", tmp_path / "city_descriptions")
+    monkeypatch.setattr(ces, "get_all_cities", lambda: CITIES)
+    monkeypatch.setattr(ces, "_udise_areas", lambda: None)
+    monkeypatch.setattr(
+        ces, "_get_mapping", lambda city_name, state: {"districts": [city_name.lower()], "state_norm": state.lower()}
+    )
+    monkeypatch.setattr(ces, "get_crime_section_for_city", lambda *args: None)  # generic, per-family text
+    monkeypatch.setattr(ces, "_live_fragments", lambda *args: iter(()))
+
+    counts: Counter = Counter()
+
+    def _counting(name, build):
+        def _build(city_name, state):
+            counts[name] += 1
+            return build(city_name, state)
+        return _build
+
+    for name in ces._SECTION_BUILDERS:
+        build = ces._SECTION_BUILDERS[name] if name == "crime_rate" else (lambda city_name, state, name=name: SHARED[name])
+        monkeypatch.setitem(ces._SECTION_BUILDERS, name, _counting(name, build))
+
+    ces._DATASETS.clear()
+    yield counts
+    ces._DATASETS.clear()
+
+
+def _crime_sections(city_name, state):
+    return [
+        json.loads(ces.render_city_description(city_name, state, has_children, has_elderly))["crime_rate"]
+        for has_children, has_elderly in VARIANTS
+    ]
+
+
+def test_family_variants_are_served_from_cache(builds):
+    first = _crime_sections("Agra", "Uttar Pradesh")
+    assert len({json.dumps(section, sort_keys=True) for section in first}) == 4
+    assert "children" in first[1]["description"] and "elderly" in first[2]["description"]
+    assert builds == Counter({name: len(CITIES) for name in ces._SECTION_BUILDERS})
+
+    # A new process (empty memory) reads every variant back from the section files
+    ces._DATASETS.clear()
+    builds.clear()
+    assert _crime_sections("Agra", "Uttar Pradesh") == first
+    assert builds == Counter()
+    assert json.loads(ces.render_city_description("Mysore", "Karnataka", True, True))["crime_rate"] != first[3]
+
+
+def test_census_change_rebuilds_only_communities(builds):
+    ces.warm_city_description_cache()
+    builds.clear()
+
+    (ces.DATASET_DIR / "Census.csv").write_text(
+        "State,District,Literacy\nUttar Pradesh,Agra,69.4\nKarnataka,Mysore,72.8\n", encoding="utf-8"
+    )
+    ces._DATASETS.clear()
+    ces.warm_city_description_cache()
+
+    assert builds == Counter({"communities": len(CITIES)})
+    cached = json.loads((ces.SECTION_CACHE_DIR / "communities.json").read_text(encoding="utf-8"))
+    assert "Census.csv" in cached["signature"]["census"]
+
+
+@pytest.mark.parametrize(
+    "builder, fetcher",
+    [
+        (ces._build_live_hospitals_section, "_NABH_FETCHER"),
+        (ces._build_live_geography_section, "_GEOGRAPHY_FETCHER"),
+    ],
+)
+def test_live_fetch_errors_propagate(builder, fetcher, monkeypatch):
+    def _fetch(**kwargs):
+        raise TimeoutError("source down")
+
+    monkeypatch.setattr(ces, fetcher, types.SimpleNamespace(fetch=_fetch))
+    with pytest.raises(TimeoutError):
+        builder("Pune", "Maharashtra")
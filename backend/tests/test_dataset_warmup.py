@@ -0,0 +1,88 @@
+"""
+Unit tests for services/dataset_warmup.py
+
+Tests cover:
+1. Dependency order and dependency results passed as arguments, in-process
+   and in a process pool
+2. Independent tasks overlapping in the pool
+3. Failed tasks skipping their dependents, and cycle detection
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from app.services.dataset_warmup import WarmupTask, run_tasks
+
+
+def _numbers(n):
+    return list(range(n))
+
+
+def _total(values):
+    return sum(values)
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return [seconds]
+
+
+def _fail():
+    raise RuntimeError("broken file")
+
+
+def _graph():
+    return [
+        WarmupTask("total", _total, deps=("numbers",), args=lambda results: (results["numbers"],)),
+        WarmupTask("numbers", _numbers, args=lambda results: (5,)),
+        WarmupTask("other", _numbers, args=lambda results: (2,)),
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_dependencies_and_timings(workers):
+    results, timings = run_tasks(_graph(), workers=workers)
+
+    assert results == {"numbers": [0, 1, 2, 3, 4], "total": 10, "other": [0, 1]}
+    assert set(timings) == {"numbers", "total", "other"}
+    assert timings["numbers"].size == 5
+    assert all(timing.seconds >= 0 for timing in timings.values())
+
+
+def test_independent_tasks_run_in_parallel():
+    tasks = [WarmupTask(f"sleep{i}", _sleep, args=lambda results: (0.5,)) for i in range(3)]
+
+    started = time.perf_counter()
+    results, _ = run_tasks(tasks, workers=3)
+
+    assert len(results) == 3
+    assert time.perf_counter() - started < 1.4
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failure_skips_dependents(workers):
+    tasks = [
+        WarmupTask("profile", _fail),
+        WarmupTask("teachers", _total, deps=("profile",), args=lambda results: (results["profile"],)),
+        WarmupTask("census", _numbers, args=lambda results: (3,)),
+    ]
+
+    results, timings = run_tasks(tasks, workers=workers)
+
+    assert results == {"census": [0, 1, 2]}
+    assert set(timings) == {"census"}
+
+
+def test_unknown_dependency_and_cycle_rejected():
+    with pytest.raises(ValueError):
+        run_tasks([WarmupTask("a", _numbers, deps=("missing",))], workers=1)
+    with pytest.raises(ValueError):
+        run_tasks(
+            [WarmupTask("a", _numbers, deps=("b",)), WarmupTask("b", _numbers, deps=("a",))],
+            workers=1,
+        )
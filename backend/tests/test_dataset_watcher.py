@@ -0,0 +1,137 @@
+"""
+Unit tests for services/dataset_watcher.py
+
+Tests cover:
+1. Changes are debounced into one rebuild of exactly the changed files
+2. Changes during a rebuild queue a follow-up rebuild instead of overlapping
+3. Step progress, history and generation in status()
+4. A failed rebuild is recorded without bumping the generation
+"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.dataset_watcher import DatasetWatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _touch(directory, name, content="x", mtime=None):
+    path = directory / name
+    path.write_text(content)
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def _watcher(tmp_path, rebuild, clock):
+    return DatasetWatcher(tmp_path, rebuild, interval=1, debounce=10, clock=clock)
+
+
+def test_changes_are_debounced_into_one_rebuild(tmp_path):
+    _touch(tmp_path, "Census.csv", mtime=1_000)
+    calls = []
+    clock = FakeClock()
+    watcher = _watcher(tmp_path, lambda changed, progress: calls.append(changed), clock)
+
+    _touch(tmp_path, "Census.csv", "new", mtime=2_000)
+    assert watcher.poll() is False
+    clock.now = 5
+    _touch(tmp_path, "crime.pdf")
+    assert watcher.poll() is False  # still copying: debounce restarts
+    clock.now = 12
+    assert watcher.poll() is False
+    assert watcher.status()["state"] == "pending"
+    assert watcher.status()["pending_changes"] == ["Census.csv", "crime.pdf"]
+
+    clock.now = 16
+    assert watcher.poll() is True
+    assert watcher.wait_idle(5)
+    assert calls == [{"Census.csv", "crime.pdf"}]
+    assert watcher.poll() is False
+    assert watcher.status()["state"] == "idle"
+
+
+def test_change_during_rebuild_queues_another(tmp_path):
+    release = threading.Event()
+    calls = []
+
+    def rebuild(changed, progress):
+        calls.append(changed)
+        release.wait(5)
+
+    clock = FakeClock()
+    watcher = _watcher(tmp_path, rebuild, clock)
+    assert watcher.trigger() is True
+    assert watcher.trigger() is False  # one rebuild at a time
+
+    _touch(tmp_path, "hospital_directory.csv")
+    watcher.poll()
+    clock.now = 20
+    assert watcher.poll() is False
+    assert watcher.status()["state"] == "rebuilding"
+
+    release.set()
+    assert watcher.wait_idle(5)
+    assert watcher.status()["state"] == "pending"
+    clock.now = 40
+    assert watcher.poll() is True
+    assert watcher.wait_idle(5)
+    assert calls == [None, {"hospital_directory.csv"}]
+    assert watcher.generation == 2
+
+
+def test_status_reports_steps_and_history(tmp_path):
+    clock = FakeClock()
+    at_second_step = threading.Event()
+    release = threading.Event()
+
+    def rebuild(changed, progress):
+        progress("reading datasets")
+        clock.now += 3
+        progress("rebuilding descriptions")
+        at_second_step.set()
+        release.wait(5)
+        clock.now += 2
+
+    watcher = _watcher(tmp_path, rebuild, clock)
+    watcher.trigger()
+    assert at_second_step.wait(5)
+    current = watcher.status()["current"]
+    assert current["reason"] == "manual"
+    assert current["step"] == "rebuilding descriptions"
+    assert current["steps"] == [{"step": "reading datasets", "seconds": 3.0}]
+
+    release.set()
+    assert watcher.wait_idle(5)
+    status = watcher.status()
+    assert status["current"] is None
+    assert status["generation"] == 1
+    [record] = status["history"]
+    assert record["error"] is None
+    assert record["seconds"] == 5.0
+    assert [step["step"] for step in record["steps"]] == ["reading datasets", "rebuilding descriptions"]
+
+
+def test_failed_rebuild_is_recorded(tmp_path):
+    def rebuild(changed, progress):
+        progress("reading datasets")
+        raise ValueError("bad CSV")
+
+    watcher = _watcher(tmp_path, rebuild, FakeClock())
+    watcher.trigger({"Census.csv"})
+    assert watcher.wait_idle(5)
+
+    status = watcher.status()
+    assert status["state"] == "idle"
+    assert status["generation"] == 0
+    assert status["history"][0]["error"] == "ValueError: bad CSV"
+    assert status["history"][0]["changed"] == ["Census.csv"]
@@ -0,0 +1,104 @@
+"""
+Unit tests for services/description_fragments.py
+
+Tests cover:
+1. Spliced bodies match the CityDescriptionResponse model's own output
+2. Section fragments are validated (extra keys dropped, bad data rejected)
+3. Cached fragments are read-only and variant selection never aliases them
+4. Server-sent event framing of the same fragments
+"""
+
+import json
+import os
+import sys
+
+import pytest
+from pydantic import ValidationError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.models.schemas import CityDescriptionResponse
+from app.services.description_fragments import (
+    DONE_EVENT,
+    compose_description,
+    freeze_entry,
+    meta_event,
+    section_event,
+    serialize_section,
+)
+
+
+def _section(**fields):
+    base = {"description": "text", "key_factors": ["a"], "sources": ["s"]}
+    base.update(fields)
+    return base
+
+
+SHARED = {
+    "education": _section(score=7, highlights=["h"]),
+    "communities": _section(demographics="mixed", highlights=["Hindi"]),
+    "connectivity": _section(nearest_metro="Delhi", distance_km=250, transport_options="rail"),
+    "hospitals": _section(score=6, facilities=["AIIMS"], internal_rows=[1, 2]),
+    "geography": _section(terrain="Plains", climate="Humid", features=["river"]),
+}
+ENTRY = {
+    "shared": SHARED,
+    "variants": {
+        "general": {"crime_rate": _section(security_score=6)},
+        "children": {"crime_rate": _section(security_score=6, description="children text")},
+    },
+}
+
+
+def test_composed_body_matches_response_model():
+    fragments = freeze_entry(ENTRY)
+    body = compose_description("Agra", "Uttar Pradesh \"UP\"", fragments.select("children"))
+
+    expected = CityDescriptionResponse(
+        city_name="Agra",
+        state="Uttar Pradesh \"UP\"",
+        generated=True,
+        crime_rate=ENTRY["variants"]["children"]["crime_rate"],
+        **SHARED,
+    )
+    assert json.loads(body) == json.loads(expected.model_dump_json())
+    assert list(json.loads(body))[3:] == [
+        "crime_rate", "education", "communities", "connectivity", "hospitals", "geography",
+    ]
+
+
+def test_serialize_section_validates():
+    assert "internal_rows" not in json.loads(serialize_section("hospitals", SHARED["hospitals"]))
+    with pytest.raises(ValidationError):
+        serialize_section("hospitals", {"description": "no score"})
+
+
+def test_fragments_are_read_only_and_selection_is_fresh():
+    fragments = freeze_entry(ENTRY)
+    with pytest.raises(TypeError):
+        fragments.shared["education"] = b"{}"
+
+    sections = fragments.select("general")
+    sections["hospitals"] = serialize_section("hospitals", _section(score=9, facilities=[]))
+    assert fragments.select("general")["hospitals"] == fragments.shared["hospitals"]
+    assert fragments.select("general")["education"] is fragments.shared["education"]
+
+
+def _parse_sse(stream):
+    events = []
+    for frame in stream.decode("utf-8").split("\n\n"):
+        if frame:
+            event, data = frame.split("\n")
+            events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_sse_frames():
+    fragment = serialize_section("education", SHARED["education"])
+    stream = meta_event("Agra", "UP") + section_event("education", fragment) + DONE_EVENT
+
+    assert _parse_sse(stream) == [
+        ("meta", {"city_name": "Agra", "state": "UP", "generated": True}),
+        ("section", {"name": "education", "data": json.loads(fragment)}),
+        ("done", {}),
+    ]
@@ -0,0 +1,161 @@
+"""
+Unit tests for services/district_evidence.py
+
+Tests cover:
+1. Per-district aggregation across UDISE areas, hospitals and census rows
+2. LGD directory parsing and code collisions
+3. The SQLite store: lookups by LGD code and by name, bodies matching the
+   response model, and reopening after the file is replaced
+4. A store built from an LGD directory file answers lookups by its codes
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.models.schemas import DistrictEvidenceResponse
+from app.services.district_evidence import (
+    DistrictEvidenceStore,
+    aggregate_districts,
+    read_lgd_directory,
+    write_store,
+)
+from app.services.hospital_table import HospitalTable
+from app.services.udise_artifacts import AREA_FIELDS, UdiseAreas
+
+
+def _areas(rows):
+    """rows: (state_norm, district, district_norm, block_norm, ulb_norm, {field: count})."""
+    keys = np.array([row[:5] for row in rows], dtype=object)
+    counts = np.array([[row[5].get(field, 0) for field in AREA_FIELDS] for row in rows], dtype=np.int64)
+    return UdiseAreas(keys, counts, {})
+
+
+def _hospital(name, district_norm, **fields):
+    row = {
+        "hospital_name": name, "district": district_norm.title(), "medicine": "Allopathic",
+        "specialties": "", "facilities": "", "accreditation": "", "emergency_services": "",
+        "state_norm": "karnataka", "district_norm": district_norm,
+        "town": "", "subtown": "", "location": "", "total_beds": 0,
+    }
+    row.update(fields)
+    return row
+
+
+AREAS = _areas([
+    ("karnataka", "MYSURU", "mysuru", "a", "", {"schools": 10, "urban_schools": 4, "total_teachers": 50,
+                                                  "trained_teachers": 40, "female_teachers": 25,
+                                                  "social_enrollment_estimate": 900}),
+    ("karnataka", "MYSURU", "mysuru", "b", "", {"schools": 30, "urban_schools": 6, "total_teachers": 150,
+                                                  "trained_teachers": 110, "female_teachers": 75}),
+    ("karnataka", "UDUPI", "udupi", "c", "", {"schools": 5, "total_teachers": 20}),
+])
+HOSPITALS = HospitalTable(pd.DataFrame([
+    _hospital("Alpha", "mysuru", total_beds=100, specialties="cardio, neuro"),
+    _hospital("Beta", "mysuru", accreditation="NABH", emergency_services="Yes"),
+    _hospital("Gamma", "kodagu", total_beds=20, medicine="Ayurveda"),
+]))
+CENSUS = pd.DataFrame([
+    {"state": "Karnataka", "state_norm": "karnataka", "district": "Mysore", "district_norm": "mysuru", "literacy": 72.8},
+    {"state": "Karnataka", "state_norm": "karnataka", "district": "Kodagu", "district_norm": "kodagu", "literacy": 82.6},
+])
+
+
+def _evidence(lgd_codes=None):
+    return aggregate_districts(
+        AREAS, HOSPITALS, CENSUS,
+        lgd_codes if lgd_codes is not None else {("karnataka", "mysuru"): 577, ("karnataka", "kodagu"): 565},
+        {"karnataka": "Karnataka"},
+        religion=lambda state, district_norm: "Hindu: 80%" if district_norm == "udupi" else None,
+    )
+
+
+def test_aggregates_every_district():
+    evidence = _evidence()
+    assert sorted(evidence) == [("karnataka", "kodagu"), ("karnataka", "mysuru"), ("karnataka", "udupi")]
+
+    mysuru = evidence[("karnataka", "mysuru")]
+    assert mysuru["lgd_code"] == 577
+    assert mysuru["district"] == "Mysore"  # census spelling
+    assert mysuru["education"]["schools"] == 40
+    assert mysuru["education"]["urban_pct"] == 25.0
+    assert mysuru["education"]["trained_pct"] == 75.0
+    assert mysuru["education"]["teachers_per_school"] == 5.0
+    assert mysuru["hospitals"]["total"] == 2
+    assert mysuru["hospitals"]["average_beds"] == 100.0
+    assert [facility["name"] for facility in mysuru["hospitals"]["top_facilities"]] == ["Beta", "Alpha"]
+    assert mysuru["hospitals"]["top_facilities"][1]["specialties"] == "cardio, neuro"
+    assert mysuru["communities"] == {"literacy": 72.8, "social_enrollment_estimate": 900, "minority_enrollment_estimate": 0}
+
+    kodagu = evidence[("karnataka", "kodagu")]
+    assert kodagu["education"] is None
+    assert kodagu["hospitals"]["top_facilities"][0]["medicine"] == "Ayurveda"
+
+    udupi = evidence[("karnataka", "udupi")]
+    assert udupi["lgd_code"] is None
+    assert udupi["district"] == "UDUPI"
+    assert udupi["hospitals"] is None
+    assert udupi["communities"] == {"religion": "Hindu: 80%"}
+    for record in evidence.values():
+        DistrictEvidenceResponse.model_validate(record)
+
+
+def test_lgd_directory(tmp_path):
+    path = tmp_path / "district-lgd-codes.csv"
+    path.write_text(
+        "S.No.,State Code,State Name (In English),District Code,District Name (In English)\n"
+        "1,29,Karnataka,577,Mysuru\n"
+        "2,29,Karnataka,,Unknown\n"
+        "3,32,Kerala,595,Ernakulam\n",
+        encoding="utf-8",
+    )
+    assert read_lgd_directory(path) == {("karnataka", "mysuru"): 577, ("kerala", "ernakulam"): 595}
+    assert read_lgd_directory(tmp_path / "missing.csv") == {}
+
+    evidence = _evidence({("karnataka", "mysuru"): 577, ("karnataka", "udupi"): 577})
+    assert evidence[("karnataka", "mysuru")]["lgd_code"] == 577
+    assert evidence[("karnataka", "udupi")]["lgd_code"] is None
+
+
+def test_store_lookups(tmp_path):
+    path = tmp_path / "district_evidence.sqlite3"
+    store = DistrictEvidenceStore(path)
+    assert not store.is_built()
+    assert store.by_lgd_code(577) is None
+
+    evidence = _evidence()
+    write_store(evidence, path, sources={"census": {"Census.csv": {"size": 1, "mtime_ns": 2}}})
+    assert store.is_built()
+    body = store.by_lgd_code(577)
+    assert json.loads(body) == json.loads(
+        DistrictEvidenceResponse.model_validate(evidence[("karnataka", "mysuru")]).model_dump_json()
+    )
+    assert store.by_name(" KARNATAKA ", "Udupi") is not None
+    assert store.by_lgd_code(1) is None
+    assert store.sources() == {"census": {"Census.csv": {"size": 1, "mtime_ns": 2}}}
+
+    write_store({key: evidence[key] for key in [("karnataka", "udupi")]}, path)
+    assert store.by_lgd_code(577) is None  # replaced file is picked up
+    assert store.by_name("karnataka", "udupi") is not None
+
+
+def test_store_from_lgd_file(tmp_path):
+    lgd = tmp_path / "district-lgd-codes.csv"
+    lgd.write_text(
+        "state_code,state_name,district_lgd_code,district_name\n"
+        "29,KARNATAKA,577,Mysuru\n"
+        "29,KARNATAKA,572,Udupi\n",
+        encoding="utf-8",
+    )
+    path = tmp_path / "district_evidence.sqlite3"
+    write_store(_evidence(read_lgd_directory(lgd)), path)
+
+    store = DistrictEvidenceStore(path)
+    assert json.loads(store.by_lgd_code(577))["district"] == "Mysore"
+    assert json.loads(store.by_lgd_code(572))["lgd_code"] == 572
+    assert store.by_lgd_code(565) is None  # kodagu has no code in this file
@@ -0,0 +1,76 @@
+"""
+Unit tests for services/evidence_index.py
+
+Tests cover:
+1. Aho-Corasick matches, including overlapping and nested aliases
+2. District matches taking precedence over alias matches, in row order
+3. Aliases outside the prebuilt set, and no matches across fields
+4. Indexes built from columns match the row-based ones
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.evidence_index import AliasAutomaton, RowIndex
+
+
+def test_automaton_finds_overlapping_patterns():
+    automaton = AliasAutomaton(["mumbai", "navi mumbai", "bai", "he", "she", "hers", ""])
+
+    assert automaton.find("navi mumbai east") == {"navi mumbai", "mumbai", "bai"}
+    assert automaton.find("ushers") == {"she", "he", "hers"}
+    assert automaton.find("pune") == set()
+
+
+def _rows():
+    return [
+        {"state_norm": "karnataka", "district_norm": "mysuru", "ulb_norm": "mysore city", "block_norm": ""},
+        {"state_norm": "karnataka", "district_norm": "bengaluru urban", "ulb_norm": "bbmp", "block_norm": "south"},
+        {"state_norm": "karnataka", "district_norm": "ramanagara", "ulb_norm": "", "block_norm": "bangalore rural"},
+        {"state_norm": "karnataka", "district_norm": "bengaluru urban", "ulb_norm": "", "block_norm": "north"},
+        {"state_norm": "kerala", "district_norm": "ernakulam", "ulb_norm": "kochi", "block_norm": "vyttila"},
+    ]
+
+
+def _index():
+    return RowIndex(
+        _rows(),
+        text=lambda row: f"{row['ulb_norm']}|{row['block_norm']}",
+        aliases=["bangalore", "bbmp", "mysore", "kochi"],
+    )
+
+
+def test_districts_win_over_aliases():
+    index = _index()
+
+    assert index.match_ids("karnataka", ["bengaluru urban"], ["bangalore", "bbmp"]) == [1, 3]
+    # no district hit: rows mentioning any alias, in row order
+    assert index.match_ids("karnataka", ["bengaluru"], ["bangalore", "bbmp"]) == [1, 2]
+    assert index.match("kerala", ["kochi"], ["kochi"]) == [_rows()[4]]
+    assert index.match_ids("kerala", ["mysuru"], ["mysore"]) == []
+
+
+def test_unknown_alias_scanned_and_no_cross_field_match():
+    index = _index()
+
+    assert index.match_ids("kerala", [], ["vyttila"]) == [4]
+    assert index.match_ids("kerala", [], ["vyttila"]) == [4]  # memoised
+    assert index.match_ids("karnataka", [], ["bbmp south"]) == []
+    assert index.match_ids("karnataka", [], ["", "city"]) == [0]
+
+
+def test_from_columns_matches_row_index():
+    rows = _rows()
+    texts = [f"{row['ulb_norm']}|{row['block_norm']}" for row in rows]
+    index = RowIndex.from_columns(
+        [row["state_norm"] for row in rows],
+        [row["district_norm"] for row in rows],
+        lambda row_id: texts[row_id],
+        aliases=["bangalore", "bbmp"],
+    )
+
+    assert index.match_ids("karnataka", ["bengaluru"], ["bangalore", "bbmp"]) == [1, 2]
+    assert index.match_ids("kerala", [], ["vyttila"]) == [4]
+    assert index.rows is None
@@ -0,0 +1,92 @@
+"""
+Unit tests for services/hospital_table.py
+
+Tests cover:
+1. Ranking order: alias hits, then accreditation, emergency, counts, beds, name
+2. Full ties keeping row order, and top-k over more rows than k
+3. Aliases outside the prebuilt set
+4. Per-city counts
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.hospital_table import HospitalTable
+
+
+def _hospital(name, **fields):
+    row = {
+        "hospital_name": name,
+        "district": "Mysuru",
+        "medicine": "Allopathic",
+        "specialties": "",
+        "facilities": "",
+        "accreditation": "",
+        "emergency_services": "",
+        "state_norm": "karnataka",
+        "district_norm": "mysuru",
+        "town": "",
+        "subtown": "",
+        "location": "",
+        "total_beds": 0,
+    }
+    row.update(fields)
+    return row
+
+
+def _table():
+    return HospitalTable(
+        pd.DataFrame([
+            _hospital("Alpha", total_beds=40),                                      # 0
+            _hospital("Beta", accreditation="NABH"),                                # 1
+            _hospital("Gamma", emergency_services="Yes", medicine="Ayurveda"),      # 2
+            _hospital("Delta", specialties="cardio, neuro", total_beds=10),         # 3
+            _hospital("Epsilon", town="mysore city"),                               # 4
+            _hospital("Alpha", total_beds=40),                                      # 5, ties with 0
+            _hospital("Zeta", specialties="0", facilities="ICU; Lab"),              # 6
+            _hospital("Eta", state_norm="kerala", district_norm="ernakulam"),      # 7
+        ]),
+        aliases=["mysore"],
+    )
+
+
+def test_ranking_order():
+    table = _table()
+    ids = table.match("karnataka", ["mysuru"], ["mysore"])
+    assert list(ids) == [0, 1, 2, 3, 4, 5, 6]
+
+    assert list(table.top(ids, ["mysore"], k=7)) == [4, 1, 2, 3, 6, 0, 5]
+    assert list(table.top(ids, [], k=3)) == [1, 2, 3]
+
+
+def test_ties_and_small_inputs():
+    table = _table()
+    ids = table.match("karnataka", ["mysuru"], [])
+
+    assert list(table.top(ids[[0, 5, 6]], [], k=2)) == [6, 0]
+    assert list(table.top(ids[[0, 5]], [], k=3)) == [0, 5]
+    assert list(table.top(ids[:0], [])) == []
+
+
+def test_unknown_alias():
+    table = _table()
+    ids = table.match("karnataka", ["mysuru"], [])
+
+    # not prebuilt: scanned in the ranking text (which includes specialties)
+    assert list(table.top(ids, ["neuro"], k=2)) == [3, 1]
+    assert list(table.match("karnataka", [], ["mysore city"])) == [4]
+
+
+def test_stats():
+    table = _table()
+    stats = table.stats(table.match("karnataka", ["mysuru"], []))
+
+    assert stats.total == 7
+    assert stats.allopathic == 6
+    assert stats.emergency == 1
+    assert stats.accredited == 1
+    assert (stats.known_beds_rows, stats.known_beds_total) == (3, 90)
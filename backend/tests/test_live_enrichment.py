@@ -0,0 +1,174 @@
+"""
+Unit tests for services/live_enrichment.py
+
+Tests cover:
+1. Fan-out to every source, with failing/empty sources left out
+2. Fresh hits served without calling the sources again
+3. Single-flight: concurrent misses for one key share one fetch
+4. Stale-while-revalidate and request timeouts that still fill the cache
+5. Results missing a failed source kept only for the negative TTL
+6. Streaming sections in completion order
+7. Language-independent sources cached once per city
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.live_enrichment import LiveEnrichment
+from app.services.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Source:
+    def __init__(self, value, delay=0.0, gate=None):
+        self.value = value
+        self.delay = delay
+        self.gate = gate
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, city_name, state, language):
+        with self._lock:
+            self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        time.sleep(self.delay)
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self.value and {**self.value, "language": language}
+
+
+def _cache(clock):
+    return TTLCache(maxsize=8, ttl=60, negative_ttl=10, stale_ttl=120, clock=clock)
+
+
+def test_fan_out_and_fresh_hits():
+    hospitals = Source({"score": 7})
+    broken = Source(RuntimeError("down"))
+    empty = Source(None)
+    live = LiveEnrichment(
+        {"hospitals": hospitals, "geography": broken, "connectivity": empty},
+        cache=_cache(FakeClock()),
+    )
+
+    sections = live.get("Pune", "Maharashtra", language="hi")
+    assert sections == {"hospitals": {"score": 7, "language": "hi"}}
+
+    assert live.get("pune ", "Maharashtra", language="hi") == sections
+    assert hospitals.calls == 1
+    live.get("Pune", "Maharashtra", language="en")
+    assert hospitals.calls == 2
+
+
+def test_concurrent_misses_share_one_fetch():
+    gate = threading.Event()
+    source = Source({"score": 5}, gate=gate)
+    live = LiveEnrichment({"hospitals": source}, cache=_cache(FakeClock()))
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(live.get("Indore", "Madhya Pradesh")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert source.calls == 1
+    assert results == [{"hospitals": {"score": 5, "language": "en"}}] * 5
+
+
+def test_stale_served_while_refreshing():
+    clock = FakeClock()
+    source = Source({"score": 1})
+    live = LiveEnrichment({"hospitals": source}, cache=_cache(clock))
+    live.get("Kochi", "Kerala")
+
+    clock.now += 90  # past ttl, inside the stale window
+    source.value = {"score": 2}
+    source.delay = 0.2
+    assert live.get("Kochi", "Kerala")["hospitals"]["score"] == 1
+    assert live.get("Kochi", "Kerala")["hospitals"]["score"] == 1
+
+    time.sleep(0.5)
+    assert source.calls == 2
+    assert live.get("Kochi", "Kerala")["hospitals"]["score"] == 2
+
+
+def test_timed_out_request_still_fills_cache():
+    slow = Source({"terrain": "Hills"}, delay=0.3)
+    fast = Source({"score": 4})
+    live = LiveEnrichment({"geography": slow, "hospitals": fast}, cache=_cache(FakeClock()))
+
+    assert live.get("Shimla", "Himachal Pradesh", timeout=0.1) == {
+        "hospitals": {"score": 4, "language": "en"},
+    }
+    time.sleep(0.4)
+    assert set(live.get("Shimla", "Himachal Pradesh")) == {"geography", "hospitals"}
+    assert slow.calls == 1
+
+
+def test_partial_result_is_refreshed_after_negative_ttl():
+    clock = FakeClock()
+    hospitals = Source({"score": 3})
+    geography = Source(RuntimeError("timeout"))
+    live = LiveEnrichment({"hospitals": hospitals, "geography": geography}, cache=_cache(clock))
+
+    assert set(live.get("Nagpur", "Maharashtra")) == {"hospitals"}
+    clock.now += 5
+    live.get("Nagpur", "Maharashtra")
+    assert geography.calls == 1  # fresh inside the negative TTL
+
+    clock.now += 6  # past the negative TTL, far inside the full one
+    geography.value = {"terrain": "Plateau"}
+    assert set(live.get("Nagpur", "Maharashtra")) == {"hospitals"}  # served stale while refreshing
+    time.sleep(0.2)
+    assert geography.calls == 2
+    assert set(live.get("Nagpur", "Maharashtra")) == {"hospitals", "geography"}
+
+
+def test_stream_yields_sections_as_they_finish():
+    slow = Source({"terrain": "Coastal"}, delay=0.3)
+    fast = Source({"score": 8})
+    live = LiveEnrichment({"geography": slow, "hospitals": fast}, cache=_cache(FakeClock()))
+
+    started = time.monotonic()
+    arrivals = [(name, time.monotonic() - started) for name, _ in live.stream("Goa", "Goa")]
+
+    assert [name for name, _ in arrivals] == ["hospitals", "geography"]
+    assert arrivals[0][1] < 0.2 <= arrivals[1][1]
+    # second stream is a cache hit, everything at once
+    assert dict(live.stream("Goa", "Goa")).keys() == {"hospitals", "geography"}
+    assert slow.calls == 1
+
+
+def test_language_independent_sources_are_shared():
+    hospitals = Source({"score": 6})
+    connectivity = Source({"summary": "Metro"})
+    live = LiveEnrichment(
+        {"hospitals": hospitals, "connectivity": connectivity},
+        cache=_cache(FakeClock()),
+        language_independent=["hospitals"],
+    )
+
+    assert live.get("Pune", "Maharashtra", language="en")["hospitals"]["language"] == "en"
+    sections = live.get("Pune", "Maharashtra", language="hi")
+    assert sections["connectivity"]["language"] == "hi"
+    assert sections["hospitals"]["language"] == "en"  # the per-city entry
+    assert hospitals.calls == 1
+    assert connectivity.calls == 2
+    assert len(live.cache) == 3
@@ -0,0 +1,98 @@
+"""
+Unit tests for services/living_cost_service.py
+
+Tests cover:
+1. Exact matches via name variants and aliases, city rows beating state rows
+2. Fuzzy trigram/edit-distance matches and rejection of near-miss city names
+3. Registry resolution with unmatched cities reported
+4. Lookups against the bundled CSV
+5. Non-registry names are matched against the current resolver after a reload
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services import living_cost_service as lcs
+from app.services.living_cost_service import (
+    LivingCostIndex,
+    LivingCostRow,
+    build_resolver,
+    resolve_city,
+)
+
+
+def _row(key, level="city", months=1.0):
+    return LivingCostRow(key, level, {"months_covered": months})
+
+
+ROWS = [
+    _row("goa", "state", 1.1),
+    _row("goa velha", "city", 2.0),
+    _row("bangalore", "city", 1.4),
+    _row("visakhapatnam", "city", 1.2),
+    _row("puducherry", "state", 0.9),
+    _row("karnataka", "state", 1.0),
+]
+
+
+def test_exact_variants_and_aliases():
+    index = LivingCostIndex(ROWS)
+
+    match = resolve_city(index, "Goa (Panaji)")
+    assert match.row.key == "goa"
+    assert match.confidence == 1.0
+
+    assert resolve_city(index, "Pondicherry") is None
+    match = resolve_city(index, "Pondicherry", aliases=["puducherry", "pondicherry"])
+    assert match.row.key == "puducherry"
+    assert match.matched_name == "puducherry"
+
+
+def test_city_row_wins_over_state_with_same_name():
+    index = LivingCostIndex([_row("delhi", "state", 0.5), _row("delhi", "city", 1.5)])
+    assert index.match("delhi")[0].level == "city"
+
+
+def test_fuzzy_matches_spelling_variants_only():
+    index = LivingCostIndex(ROWS)
+
+    row, confidence = index.match("vishakhapatnam")
+    assert row.key == "visakhapatnam"
+    assert lcs.MIN_CONFIDENCE <= confidence < 1.0
+
+    # one letter off, but a different city
+    assert index.match("mangalore") is None
+    # no substring matching
+    assert index.match("goa panaji tourism") is None
+
+
+def test_build_resolver_reports_unmatched():
+    resolver = build_resolver(
+        ROWS,
+        {"Bangalore": ["bangalore", "bengaluru"], "Goa (Panaji)": ["panaji", "goa"], "Shimla": ["shimla"]},
+    )
+    assert resolver.unmatched == ["Shimla"]
+    assert resolver.matches["goa panaji"].row.key == "goa"
+    assert resolver.matches["goa"].row.key == "goa"
+    assert resolver.matches["bangalore"].row.key == "bangalore"
+
+
+def test_bundled_dataset_lookups():
+    assert lcs.get_living_cost("Delhi") is not None
+    # "Hyderabad, Telangana" in the CSV
+    assert lcs.get_living_cost("Hyderabad") is not None
+    assert lcs.get_living_cost("Mangalore") is None
+    assert lcs.get_affordability_score("Mangalore") == 50.0
+    assert 0.0 <= lcs.get_affordability_score("Mumbai", 2) <= 100.0
+
+
+def test_other_names_follow_reloaded_resolver(monkeypatch):
+    resolvers = iter([build_resolver(ROWS, {}), build_resolver([_row("vizag", "city", 3.0)], {})])
+    monkeypatch.setattr(lcs, "_get_resolver", lambda: current)
+
+    current = next(resolvers)
+    assert lcs.get_living_cost("Vishakhapatnam") == {"months_covered": 1.2}
+    current = next(resolvers)  # e.g. after _get_resolver.cache_clear()
+    assert lcs.get_living_cost("Vishakhapatnam") is None
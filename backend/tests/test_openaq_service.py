@@ -5,9 +5,16 @@ Tests cover:
 1. Successful city AQI query with mocked OpenAQ API
 2. Missing measurement (empty results) - graceful None return
 3. API failure (network error) - graceful None return
+4. Concurrent sensor probing, negative caching and stale-while-revalidate
+5. Bulk bounding-box mode with IDW aggregation, and the India-wide grid
+   refresh in per-city mode
+6. Cache snapshot checkpoint and restore
 """
 
 import asyncio
+import json
+import time
+from datetime import datetime, timezone
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -17,10 +24,19 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from app.services import aqi_history, openaq_service
+from app.services.aqi_grid import get_grid
+from app.services.aqi_history import AQIHistoryStore
+from app.services.ttl_cache import MISS
 from app.services.openaq_service import (
     get_current_aqi,
+    get_current_aqi_batch,
+    get_cache_stats,
+    load_snapshot,
+    save_snapshot,
     pm25_to_aqi,
     clear_cache,
+    refresh_grid,
 )
 
 
@@ -28,6 +44,16 @@ from app.services.openaq_service import (
 # Helpers / fixtures
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def _isolated_history_store(tmp_path, monkeypatch):
+    """Keep live readings and grids built during tests out of dataset_cache/."""
+    store = AQIHistoryStore(tmp_path / "aqi_history.sqlite3")
+    monkeypatch.setenv("AQI_GRID_PATH", str(tmp_path / "aqi_grid.f32"))
+    monkeypatch.setattr(aqi_history, "_STORE", store)
+    yield store
+    store.close()
+
+
 def _make_mock_response(status_code: int, json_data: dict):
     """Build a minimal mock httpx Response."""
     mock = MagicMock()
@@ -37,15 +63,21 @@ def _make_mock_response(status_code: int, json_data: dict):
 
 
 LOCATIONS_SUCCESS = {
-    "results": [{"id": 123, "city": "Mumbai", "lastUpdated": "2024-01-01T00:00:00Z"}]
+    "results": [
+        {
+            "id": 123,
+            "name": "Bandra, Mumbai",
+            "sensors": [{"id": 456, "parameter": {"id": 2, "name": "pm25"}}],
+        }
+    ]
 }
 
 MEASUREMENTS_SUCCESS = {
     "results": [
         {
             "value": 45.0,
-            "date": {"utc": "2024-01-01T12:00:00Z"},
-            "parameter": "pm25",
+            "period": {"datetimeTo": {"utc": "2024-01-01T12:00:00Z"}},
+            "parameter": {"id": 2, "name": "pm25"},
         }
     ]
 }
@@ -85,6 +117,8 @@ async def test_get_current_aqi_success():
     assert result["city"] == "Mumbai"
     assert result["pm25"] == 45.0
     assert result["data_source"] == "openaq_live"
+    assert result["station_id"] == 456
+    assert result["timestamp"] == "2024-01-01T12:00:00Z"
     # PM2.5 = 45 µg/m³ → AQI should be 128 (Unhealthy for Sensitive)
     assert result["aqi_estimate"] == pm25_to_aqi(45.0)
     assert isinstance(result["aqi_estimate"], int)
@@ -193,6 +227,249 @@ async def test_get_current_aqi_no_api_key():
     assert result is None
 
 
+# ---------------------------------------------------------------------------
+# Test: Concurrent sensor probing
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_get_current_aqi_probes_sensors_concurrently():
+    """
+    A stale first station must not delay the result: sensors are probed
+    concurrently, the first valid reading wins and slower probes are cancelled.
+    """
+    clear_cache()
+
+    locations = {
+        "results": [
+            {"id": 1, "sensors": [{"id": 11, "parameter": {"id": 2, "name": "pm25"}}]},
+            {"id": 2, "sensors": [{"id": 22, "parameter": {"id": 2, "name": "pm25"}}]},
+            {"id": 3, "sensors": [{"id": 33, "parameter": {"id": 2, "name": "pm25"}}]},
+        ]
+    }
+    cancelled = []
+
+    async def fake_get(url, params=None, headers=None):
+        if url.endswith("/locations"):
+            return _make_mock_response(200, locations)
+        if "/sensors/11/" in url:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(11)
+                raise
+            return _make_mock_response(200, MEASUREMENTS_SUCCESS)
+        if "/sensors/22/" in url:
+            await asyncio.sleep(0.01)
+            return _make_mock_response(200, EMPTY_RESULTS)
+        await asyncio.sleep(0.02)
+        return _make_mock_response(200, MEASUREMENTS_SUCCESS)
+
+    with patch.dict(os.environ, {"OPENAQ_API_KEY": "test-key-123"}):
+        mock_client = AsyncMock()
+        mock_client.get = fake_get
+
+        with patch("app.services.openaq_service.httpx.AsyncClient") as mock_cls:
+            mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+
+            result = await asyncio.wait_for(get_current_aqi("Delhi"), timeout=1.0)
+
+    assert result is not None
+    assert result["pm25"] == 45.0
+    assert cancelled == [11]
+
+
+# ---------------------------------------------------------------------------
+# Test: Negative caching and stale-while-revalidate
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_get_current_aqi_caches_missing_data():
+    """A city with no nearby station is not re-queried on the next request."""
+    clear_cache()
+
+    with patch.dict(os.environ, {"OPENAQ_API_KEY": "test-key-123"}):
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(
+            return_value=_make_mock_response(200, EMPTY_RESULTS)
+        )
+
+        with patch("app.services.openaq_service.httpx.AsyncClient") as mock_cls:
+            mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+
+            assert await get_current_aqi("Shimla") is None
+            assert await get_current_aqi("Shimla") is None
+
+    assert mock_client.get.await_count == 1
+    assert get_cache_stats()["negative_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_current_aqi_serves_stale_while_refreshing():
+    """An expired entry is served immediately while one refresh runs in the background."""
+    clear_cache()
+    stale = {"city": "Pune", "pm25": 20.0, "aqi_estimate": 68,
+             "timestamp": "old", "data_source": "openaq_live"}
+    fresh = dict(stale, pm25=45.0, aqi_estimate=pm25_to_aqi(45.0), timestamp="new")
+
+    expired_at = time.monotonic() - openaq_service._CACHE_TTL_SECONDS - 1
+    with patch.object(openaq_service._CACHE, "_clock", return_value=expired_at):
+        openaq_service._CACHE.set("pune", stale)
+
+    refresh = AsyncMock(return_value=fresh)
+    with patch.dict(os.environ, {"OPENAQ_API_KEY": "test-key-123"}), \
+            patch("app.services.openaq_service._fetch_current_aqi", refresh):
+        first = await get_current_aqi("Pune")
+        second = await get_current_aqi("Pune")
+        await asyncio.gather(*openaq_service._REFRESH_TASKS)
+        third = await get_current_aqi("Pune")
+
+    assert first == stale
+    assert second == stale
+    assert refresh.await_count == 1
+    assert third == {**fresh, "quality": third["quality"], "providers": ["openaq"]}
+
+
+# ---------------------------------------------------------------------------
+# Test: Bulk bounding-box mode
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_get_current_aqi_batch_bulk_mode():
+    """
+    In bulk mode a batch is served from one paged bounding-box request:
+    Delhi gets the IDW mean of its two stations, and cities without a
+    station in range fall back to the per-city search.
+    """
+    clear_cache()
+    now = datetime.now(timezone.utc).isoformat()
+
+    def _station(sensor_id, lat, lon, value):
+        return {
+            "sensorsId": sensor_id,
+            "value": value,
+            "datetime": {"utc": now},
+            "coordinates": {"latitude": lat, "longitude": lon},
+        }
+
+    latest = {
+        "results": [
+            _station(1, 28.6139, 77.2090, 100.0),  # at the city centre
+            _station(2, 28.6139, 77.3090, 40.0),   # ~9.8 km east
+            _station(3, 19.0760, 72.8777, -1.0),   # invalid value
+            _station(4, 28.6139, 77.2190, float("nan")),  # non-finite value
+        ]
+    }
+
+    with patch.dict(os.environ, {"OPENAQ_API_KEY": "test-key-123", "OPENAQ_FETCH_MODE": "bulk"}):
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value=_make_mock_response(200, latest))
+
+        with patch("app.services.openaq_service.httpx.AsyncClient") as mock_cls:
+            mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+
+            results = await get_current_aqi_batch(["Delhi", "Mumbai", "Pune"])
+
+    urls = [call.args[0] for call in mock_client.get.await_args_list]
+    assert urls[0].endswith("/parameters/2/latest")
+    assert sum(url.endswith("/parameters/2/latest") for url in urls) == 1
+    # Mumbai and Pune were missed by the bulk pass and searched per city
+    searched = [call.kwargs["params"]["coordinates"] for call in mock_client.get.await_args_list
+                if call.args[0].endswith("/locations")]
+    assert len(searched) == 2
+    delhi = results["Delhi"]
+    assert delhi["stations_used"] == 2
+    assert delhi["station_id"] is None
+    assert 40.0 < delhi["pm25"] < 100.0
+    assert delhi["pm25"] > 90.0  # the closer station dominates
+    assert delhi["aqi_estimate"] == pm25_to_aqi(delhi["pm25"])
+    assert results["Mumbai"] is None
+    assert results["Pune"] is None
+
+    # The same stations rebuilt the interpolation grid
+    grid = get_grid()
+    assert grid is not None
+    assert grid.meta["stations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_grid_in_per_city_mode():
+    """
+    The grid is rebuilt from an India-wide fetch without the bulk city
+    refresh, including stations far from every registered city.
+    """
+    clear_cache()
+    now = datetime.now(timezone.utc).isoformat()
+    latest = {
+        "results": [
+            {"sensorsId": sensor_id, "value": value, "datetime": {"utc": now},
+             "coordinates": {"latitude": lat, "longitude": lon}}
+            for sensor_id, lat, lon, value in [
+                (1, 28.6139, 77.2090, 80.0),  # Delhi
+                (2, 34.1526, 77.5771, 15.0),  # Leh: no registered city nearby
+            ]
+        ]
+    }
+
+    with patch.dict(os.environ, {"OPENAQ_API_KEY": "test-key-123", "OPENAQ_FETCH_MODE": "per_city"}):
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value=_make_mock_response(200, latest))
+        with patch("app.services.openaq_service.httpx.AsyncClient") as mock_cls:
+            mock_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+
+            await refresh_grid()
+
+    assert mock_client.get.await_count == 1
+    params = mock_client.get.await_args.kwargs["params"]
+    assert params["bbox"] == "68.0000,6.0000,97.5000,37.5000"
+    grid = get_grid()
+    assert grid is not None
+    assert grid.meta["stations"] == 2
+    assert grid.value_at(34.1526, 77.5771) == pytest.approx(15.0)
+    assert openaq_service._CACHE.peek("delhi") == MISS  # city cache left to per-city lookups
+
+
+# ---------------------------------------------------------------------------
+# Test: Snapshot checkpointing
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip_serves_without_fetching(tmp_path):
+    """A restored snapshot answers lookups on a cold cache without any HTTP call."""
+    clear_cache()
+    cached = {"city": "Chennai", "pm25": 22.0, "aqi_estimate": pm25_to_aqi(22.0),
+              "timestamp": "t", "data_source": "openaq_live"}
+    openaq_service._CACHE.set("chennai", cached)
+    openaq_service._CACHE.set("shimla", None)
+    path = tmp_path / "aqi_snapshot.json"
+
+    assert save_snapshot(path) == 1
+    clear_cache()
+    assert load_snapshot(path) == 1
+
+    with patch.dict(os.environ, {"OPENAQ_API_KEY": "test-key-123"}), \
+            patch("app.services.openaq_service.httpx.AsyncClient") as mock_cls:
+        assert await get_current_aqi("Chennai") == cached
+    mock_cls.assert_not_called()
+
+
+def test_load_snapshot_skips_expired_entries(tmp_path):
+    clear_cache()
+    path = tmp_path / "aqi_snapshot.json"
+    openaq_service._CACHE.set("delhi", {"city": "Delhi", "aqi_estimate": 150})
+    save_snapshot(path)
+    payload = json.loads(path.read_text())
+    payload["saved_at"] -= openaq_service._CACHE_TTL_SECONDS + openaq_service._STALE_TTL_SECONDS
+    path.write_text(json.dumps(payload))
+    clear_cache()
+
+    assert load_snapshot(path) == 0
+    assert load_snapshot(tmp_path / "missing.json") == 0
+
+
 # ---------------------------------------------------------------------------
 # Test: pm25_to_aqi conversion
 # ---------------------------------------------------------------------------
@@ -0,0 +1,134 @@
+"""
+Unit tests for services/single_flight.py
+
+Tests cover:
+1. Concurrent misses for one key share a single load; waiters are counted
+2. A slow load does not block other keys
+3. Failed loads reach every waiter and are retried on the next call
+4. Generation swaps are not overwritten by loads already in flight
+5. The decorator form and its cache_clear()
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from app.services.single_flight import SingleFlightLoader, loader_stats, single_flight
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _run(threads):
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_concurrent_misses_share_one_load():
+    loader = SingleFlightLoader("test-shared")
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return object()
+
+    results = []
+    threads = _run([threading.Thread(target=lambda: results.append(loader.get("census", load))) for _ in range(6)])
+    _wait_for(lambda: loader.stats().get("census", {}).get("waiting") == 5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 6 and all(result is results[0] for result in results)
+    assert loader.get("census", load) is results[0]
+    stats = loader.stats()["census"]
+    assert stats["loads"] == 1
+    assert stats["waits"] == 5
+    assert stats["max_waiters"] == 5
+    assert stats["hits"] == 1
+    assert stats["last_load_seconds"] is not None
+    assert loader_stats()["test-shared"] == loader.stats()
+
+
+def test_other_keys_are_not_blocked():
+    loader = SingleFlightLoader("test-keys")
+    release = threading.Event()
+    slow = _run([threading.Thread(target=lambda: loader.get("udise", lambda: release.wait(5)))])[0]
+    _wait_for(lambda: loader.stats().get("udise", {}).get("in_flight"))
+
+    assert loader.get("census", lambda: "rows") == "rows"
+    release.set()
+    slow.join(5)
+    assert loader.peek("udise") is True
+
+
+def test_failed_load_reaches_waiters_and_is_retried():
+    loader = SingleFlightLoader("test-errors")
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("bad CSV")
+
+    errors = []
+
+    def call():
+        try:
+            loader.get("hospitals", fail)
+        except ValueError as exc:
+            errors.append(exc)
+
+    threads = _run([threading.Thread(target=call) for _ in range(3)])
+    _wait_for(lambda: loader.stats().get("hospitals", {}).get("waiting") == 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 3
+    assert loader.stats()["hospitals"]["errors"] == 1
+    assert loader.get("hospitals", lambda: "table") == "table"
+
+
+def test_replace_wins_over_loads_in_flight():
+    loader = SingleFlightLoader("test-generations")
+    release = threading.Event()
+    old = _run([threading.Thread(target=lambda: loader.get("census", lambda: release.wait(5) and "old"))])[0]
+    _wait_for(lambda: loader.stats().get("census", {}).get("in_flight"))
+
+    loader.replace({"census": "new"})
+    release.set()
+    old.join(5)
+    assert loader.get("census", lambda: "reloaded") == "new"
+
+
+def test_decorator():
+    calls = []
+
+    @single_flight
+    def load(name):
+        calls.append(name)
+        return name.upper()
+
+    assert load("a") == load("a") == "A"
+    assert load("b") == "B"
+    assert calls == ["a", "b"]
+    assert load.__name__ == "load"
+    assert load.loader.stats()["('a',)"]["hits"] == 1
+    load.cache_clear()
+    assert load("a") == "A"
+    assert calls == ["a", "b", "a"]
+    with pytest.raises(TypeError):
+        load(["unhashable"])
@@ -0,0 +1,99 @@
+"""
+Unit tests for services/ttl_cache.py
+
+Tests cover:
+1. LRU eviction once maxsize is reached
+2. Separate TTLs for positive and negative (None) entries
+3. Stale-while-revalidate window and single refresh claim
+4. Snapshot/restore preserving entry ages and per-entry TTLs
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.ttl_cache import FRESH, MISS, STALE, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60, negative_ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.lookup("a").value == 1  # "a" becomes most recently used
+    cache.set("c", 3)
+
+    assert cache.lookup("b").status == MISS
+    assert cache.lookup("a").value == 1
+    assert cache.lookup("c").value == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_negative_entries_use_shorter_ttl():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=60, negative_ttl=10, stale_ttl=100, clock=clock)
+    cache.set("nodata", None)
+    cache.set("ok", {"aqi": 80})
+
+    assert cache.lookup("nodata") == (FRESH, None)
+    clock.now += 11
+    assert cache.lookup("nodata").status == MISS
+    assert cache.lookup("ok") == (FRESH, {"aqi": 80})
+    assert cache.stats()["negative_hits"] == 1
+
+
+def test_stale_window_and_single_refresh():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=60, negative_ttl=10, stale_ttl=30, clock=clock)
+    cache.set("delhi", {"aqi": 200})
+
+    clock.now += 70
+    assert cache.peek("delhi") == STALE
+    assert cache.stats()["stale_hits"] == 0  # peek leaves counters alone
+    assert cache.lookup("delhi") == (STALE, {"aqi": 200})
+    assert cache.try_begin_refresh("delhi") is True
+    assert cache.try_begin_refresh("delhi") is False
+    cache.end_refresh("delhi")
+    assert cache.try_begin_refresh("delhi") is True
+
+    clock.now += 30
+    assert cache.lookup("delhi").status == MISS
+    stats = cache.stats()
+    assert stats["stale_hits"] == 1
+    assert stats["expirations"] == 1
+
+
+def test_snapshot_restore_preserves_age():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=60, negative_ttl=10, stale_ttl=30, clock=clock)
+    cache.set("delhi", {"aqi": 200})
+    cache.set("shimla", None)  # negative entries are not persisted
+    clock.now += 20
+    cache.set("pune", {"aqi": 80})
+    cache.set("goa", {"aqi": 40}, ttl=10)  # e.g. a partial result
+
+    items = cache.snapshot()
+    assert sorted((key, age, ttl) for key, _, age, ttl in items) == [
+        ("delhi", 20.0, None), ("goa", 0.0, 10), ("pune", 0.0, None),
+    ]
+
+    other_clock = FakeClock()
+    other = TTLCache(maxsize=10, ttl=60, negative_ttl=10, stale_ttl=30, clock=other_clock)
+    # 50 s on disk: delhi is now stale, pune still fresh, goa past its own
+    # ttl + stale window and a 95 s entry are dropped
+    loaded = other.restore(
+        [(key, value, age + 50, ttl) for key, value, age, ttl in items] + [("kochi", {}, 95, None)]
+    )
+    assert loaded == 2
+    assert other.lookup("delhi").status == STALE
+    assert other.lookup("pune") == (FRESH, {"aqi": 80})
+    assert other.lookup("goa").status == MISS
+    assert other.lookup("kochi").status == MISS
@@ -0,0 +1,130 @@
+"""
+Unit tests for services/udise_artifacts.py
+
+Tests cover:
+1. Per-area aggregation of profile, teacher and enrolment rows, across
+   chunk boundaries and with messy numeric cells
+2. Artifact round trip and serving without the raw CSVs
+3. Rebuild when the raw CSVs change
+"""
+
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from app.services import udise_artifacts as ua
+
+
+def _write_csv(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def _write_dataset(dataset_dir, extra_teachers=0):
+    _write_csv(
+        dataset_dir / "100_prof1.csv",
+        ["pseudocode", "state", "district", "block", "lgd_urban_local_body_name",
+         "rural_urban", "minority_school", "pre_primary", "approachable_road"],
+        [
+            ["1", "Karnataka", "Bengaluru Urban", "South", "BBMP", "2", "0", "1", "1"],
+            ["2", "Karnataka", "Bengaluru Urban", "South", "BBMP", "1", "1", "0", "1"],
+            ["3", "Karnataka", "Mysuru", "Mysuru", "", "2", "0", "0", "0"],
+            ["4", "Nagaland", "Kohima", "Kohima", "", "2", "0", "1", "1"],  # not a registry state
+        ],
+    )
+    _write_csv(
+        dataset_dir / "100_tch.csv",
+        ["pseudocode", "total_tch", "female", "trained_comp", "post_graduate_and_above"],
+        [
+            ["1", "1", "1", "1", "1"],  # superseded by the later row for the same school
+            ["1", str(10 + extra_teachers), "6", "8", "3"],
+            ["2", "5", "2", "5.9", "1"],
+            ["4", "99", "9", "9", "9"],
+        ],
+    )
+    _write_csv(
+        dataset_dir / "100_enr1.csv",
+        ["pseudocode", "item_group", "item_id", "c1_b", "c1_g"],
+        [
+            ["1", "1", "1", "20", "22"],
+            ["1", "5", "1", "3", "4"],
+            ["3", "1", "2", "7", ""],
+            ["3", "1", "3", "2.7", "n/a"],
+            ["4", "1", "1", "500", "500"],
+            ["2", "2", "1", "9", "9"],  # item group not used
+        ],
+    )
+
+
+@pytest.fixture
+def udise_dirs(tmp_path, monkeypatch):
+    dataset_dir = tmp_path / "dataset"
+    dataset_dir.mkdir()
+    artifact = tmp_path / "cache" / "udise_areas.npz"
+    monkeypatch.setattr(ua, "DATASET_DIR", dataset_dir)
+    monkeypatch.setattr(ua, "ARTIFACT_FILE", artifact)
+    ua.get_udise_areas.cache_clear()
+    yield dataset_dir, artifact
+    ua.get_udise_areas.cache_clear()
+
+
+def _by_district(areas):
+    return {row["district_norm"]: row for row in areas.records()}
+
+
+@pytest.mark.parametrize("chunk_rows", [2, ua.CHUNK_ROWS])
+def test_build_aggregates_per_area(udise_dirs, chunk_rows):
+    dataset_dir, artifact = udise_dirs
+    _write_dataset(dataset_dir)
+
+    areas = ua.build_artifact(dataset_dir, artifact, chunk_rows=chunk_rows)
+
+    rows = _by_district(areas)
+    assert set(rows) == {"bengaluru urban", "mysuru"}
+    blr = rows["bengaluru urban"]
+    assert blr["ulb_norm"] == "bbmp"
+    assert blr["district"] == "Bengaluru Urban"
+    assert (blr["schools"], blr["urban_schools"], blr["minority_schools"]) == (2, 1, 1)
+    assert (blr["pre_primary_schools"], blr["approachable_schools"]) == (1, 2)
+    assert (blr["total_teachers"], blr["female_teachers"], blr["trained_teachers"]) == (15, 8, 13)
+    assert blr["social_enrollment_estimate"] == 42
+    assert blr["minority_enrollment_estimate"] == 7
+    assert rows["mysuru"]["social_enrollment_estimate"] == 9
+    assert areas.sources == ua.raw_signature(dataset_dir)
+
+
+def test_artifact_served_without_raw_csvs(udise_dirs):
+    dataset_dir, artifact = udise_dirs
+    _write_dataset(dataset_dir)
+    built = ua.build_artifact(dataset_dir, artifact)
+    for path in dataset_dir.iterdir():
+        path.unlink()
+
+    areas = ua.get_udise_areas()
+
+    assert areas is not None
+    assert areas.records() == built.records()
+    assert ua.udise_source_signature() == built.sources
+
+
+def test_stale_artifact_rebuilt_from_changed_csvs(udise_dirs):
+    dataset_dir, artifact = udise_dirs
+    _write_dataset(dataset_dir)
+    ua.build_artifact(dataset_dir, artifact)
+    _write_dataset(dataset_dir, extra_teachers=100)
+
+    areas = ua.get_udise_areas()
+
+    assert _by_district(areas)["bengaluru urban"]["total_teachers"] == 115
+    assert ua.load_artifact(artifact).sources == ua.raw_signature(dataset_dir)
+
+
+def test_no_artifact_and_no_csvs(udise_dirs):
+    assert ua.get_udise_areas() is None
+    assert ua.udise_source_signature() == {}
@@ -0,0 +1,91 @@
+"""
+Local WAQI-style feed stand-in for multi-provider AQI tests.
+
+Serves `GET /feed/geo:{lat};{lon}/?token=...` from tests/fixtures/waqi/,
+answering with the nearest fixture station like the real feed does. Shares
+fault injection (latency, 503s, 429s) with tests/openaq_standin.py.
+
+Usage (from backend/):
+    python -m tests.waqi_standin --port 8098 --latency-ms 120
+    WAQI_BASE_URL=http://127.0.0.1:8098 WAQI_API_TOKEN=dummy uvicorn app.main:app
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.aqi_spatial import haversine_matrix
+from tests.openaq_standin import StandinConfig, install_fault_injection
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "waqi"
+
+
+def create_app(
+    config: Optional[StandinConfig] = None,
+    fixtures_dir: Path = FIXTURES_DIR,
+    rebase_timestamps: bool = True,
+) -> FastAPI:
+    """Build the WAQI stand-in over the stations in *fixtures_dir*."""
+    config = config or StandinConfig()
+    stations: List[dict] = json.loads(
+        (fixtures_dir / "stations.json").read_text(encoding="utf-8")
+    )["stations"]
+    if rebase_timestamps:
+        now = datetime.now(timezone(timedelta(hours=5, minutes=30))).replace(microsecond=0)
+        for station in stations:
+            station["time"]["iso"] = now.isoformat()
+    lats = np.array([station["city"]["geo"][0] for station in stations])
+    lons = np.array([station["city"]["geo"][1] for station in stations])
+
+    app = FastAPI(title="WAQI feed stand-in")
+    install_fault_injection(app, config)
+
+    @app.get("/feed/geo:{lat};{lon}/")
+    async def get_geo_feed(lat: float, lon: float, token: str = ""):
+        if not token:
+            return {"status": "error", "data": "Invalid key"}
+        if not stations:
+            return {"status": "error", "data": "Unknown station"}
+        nearest = int(np.argmin(haversine_matrix([lat], [lon], lats, lons)[0]))
+        return {"status": "ok", "data": stations[nearest]}
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8098)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config, args.fixtures), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()